@@ -1,9 +1,20 @@
-import barcode
+import argparse
+import functools
+import json
+import multiprocessing
 import os
-import pandas as pd
-import hashlib
-import zipfile
-import datetime
+import sys
+from serial_batch import SEQ_WIDTH, serial_prefix
+from serial_range import SerialRange
+from serial_check import add_check
+from excel_append import monthly_filename
+from label_printer import PRINTER_OPTIONS, label_extension
+from model_registry import get_registry
+from order_job import run_order
+from run_journal import find_pending, journal_key, pending_outputs
+from run_metrics import ProfileCapture, RunMetrics, artifact_base, summary_lines, write_run_report
+from serial_ledger import DuplicateSerialError, get_ledger
+from seq_counter import get_counter
 
 # 회사의 최종 알파벳 치환 기준 적용
 alpha_dict = {
@@ -37,37 +48,14 @@ category_dict = {
     "블렌더": "MB"
 }
 
-# 중복 방지를 위한 모델 코드 저장소
-used_codes = set()
-model_code_cache = {}
+# 모델 코드 매핑 파일 (GUI/Streamlit 과 공유)
+model_map_file = "model_map.csv"
 
 def num_to_alpha(num):
     return ''.join(alpha_dict[digit] for digit in str(num))
 
-def model_to_number(model_name):
-    model_name = model_name.upper()
-    h = hashlib.sha256(model_name.encode()).hexdigest()
-    return int(h, 16)
-
-def number_to_code(num):
-    num = num % 676
-    first = chr(ord('A') + num // 26)
-    second = chr(ord('A') + num % 26)
-    return first + second
-
 def get_unique_code(model_name):
-    model_name = model_name.upper()
-    if model_name in model_code_cache:
-        return model_code_cache[model_name]
-
-    base_num = model_to_number(model_name)
-    for offset in range(676):
-        code = number_to_code(base_num + offset)
-        if code not in used_codes:
-            used_codes.add(code)
-            model_code_cache[model_name] = code
-            return code
-    raise Exception("모든 코드가 소진되었습니다! (676개 제한)")
+    return get_registry(model_map_file).allocate(model_name)
 
 def choose_from_list(title, options):
     print(f"\n[{title}]")
@@ -83,102 +71,361 @@ def choose_from_list(title, options):
             pass
         print("유효한 번호를 입력해주세요.")
 
-def generate_serial(maker, category, model_code, year, month, order, seq):
+def generate_serial(maker, category, model_code, year, month, order, seq, check=False):
     year_alpha = num_to_alpha(year[-1])
     month_alpha = alpha_dict[month]
     order_number = str(order).zfill(2)
-    return f"{maker}{category}{model_code}{year_alpha}{month_alpha}{order_number}{seq}"
-
-def generate_barcode(serial):
-    CODE128 = barcode.get_barcode_class('code128')
-    writer = barcode.writer.SVGWriter()
-    writer.set_options({
-        "module_width": 0.3,
-        "module_height": 20.0,
-        "font_size": 12,
-        "text_distance": 3.0,
-        "quiet_zone": 5.0
-    })
-    barcode_img = CODE128(serial, writer=writer)
-    filename = barcode_img.save(f'barcode_{serial}')
-    print(f"[생성완료] 바코드 저장: {filename}.svg")
-
-def zip_barcode_files(serial_list):
-    date_str = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-    zip_filename = f"barcodes_{date_str}.zip"
-    with zipfile.ZipFile(zip_filename, 'w') as zipf:
-        for serial in serial_list:
-            file = f"barcode_{serial}.svg"
-            if os.path.exists(file):
-                zipf.write(file)
-    print(f"[ZIP 생성 완료] {zip_filename}")
-
-def get_next_seq():
-    if os.path.exists("latest_serial.txt"):
-        with open("latest_serial.txt", "r") as f:
-            latest = int(f.read().strip())
+    serial = f"{maker}{category}{model_code}{year_alpha}{month_alpha}{order_number}{seq}"
+    return add_check(serial) if check else serial
+
+# CLI 라벨 옵션
+barcode_options = {
+    "module_width": 0.3,
+    "module_height": 20.0,
+    "font_size": 12,
+    "text_distance": 3.0,
+    "quiet_zone": 5.0
+}
+
+# 바코드 렌더링 프로세스 수 (None 이면 CPU 수에 맞춤, 1 이면 단일 코어)
+render_workers = None
+# ZIP 압축 방식 ("stored", "deflate", "bzip2", "lzma") 과 레벨
+zip_compression = "deflate"
+zip_level = 6
+# zpl/epl 출력 프린터 해상도 (203 또는 300dpi)
+printer_dpi = PRINTER_OPTIONS["dpi"]
+# 엑셀을 월별 파일로 나눠서 저장 (한 파일이 계속 커지지 않게).
+# 켜면 기존 누적 파일 대신 "이름_YYYY-MM.xlsx" 에 저장되므로 기본은 꺼 둔다
+excel_rolling = False
+# 시리얼 끝에 체크 문자(mod 23)를 붙여서 잘못 입력/스캔된 시리얼을 바로 걸러낸다.
+# 체크 문자가 없는 기존 15자리 시리얼도 계속 해석된다
+serial_check = False
+
+# 종료 코드
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_INVALID = 3
+EXIT_DUPLICATE = 4
+EXIT_EXCEL = 5
+
+# 출력 형식 (auto 는 30개 미만이면 svg, 이상이면 zip)
+OUTPUT_FORMATS = ["auto", "zip", "svg", "sheet", "zpl", "epl", "none"]
+
+def excel_filename(filename="serial_numbers.xlsx"):
+    if excel_rolling:
+        filename = monthly_filename(filename)
+    return filename
+
+def resolve_choice(title, value, options):
+    # 이름("리앤텍") 또는 코드("LA") 둘 다 받는다
+    if value in options:
+        return value, options[value]
+    for name, code in options.items():
+        if code == str(value).upper():
+            return name, code
+    raise ValueError(f"알 수 없는 {title}입니다: {value}")
+
+def output_paths(formats, output_dir, serial_list):
+    # 파일 이름에 접두어와 구간을 넣는다 (같은 초에 여러 주문을 처리해도 서로 덮어쓰지 않게)
+    name = journal_key(serial_list)
+    paths = []
+    for fmt in formats:
+        if fmt == "auto":
+            fmt = "svg" if len(serial_list) < 30 else "zip"
+        if fmt == "zip":
+            paths.append(("zip", os.path.join(output_dir, f"barcodes_{name}.zip")))
+        elif fmt == "svg":
+            paths.append(("svg", output_dir))
+        elif fmt == "sheet":
+            paths.append(("sheet", os.path.join(output_dir, f"sheet_{name}.svg")))
+        elif fmt in ("zpl", "epl"):
+            # 열전사 프린터로 바로 보내는 명령 파일 하나 (구간 전체)
+            paths.append((fmt, os.path.join(output_dir, f"labels_{name}{label_extension(fmt)}")))
+    return paths
+
+def existing_output(outputs):
+    # 이미 있는 결과 파일 (없으면 None). sheet 는 여러 페이지면 .zip 이 된다
+    for fmt, path in outputs:
+        if fmt == "svg":
+            continue
+        candidates = [path]
+        if fmt == "sheet":
+            candidates.append(os.path.splitext(path)[0] + ".zip")
+        for candidate in candidates:
+            if os.path.exists(candidate):
+                return candidate
+    return None
+
+def same_outputs(previous, outputs):
+    # 형식과 폴더가 같으면 같은 출력으로 본다 (svg 는 경로가 폴더)
+    def place(fmt, path):
+        return fmt, os.path.abspath(path if fmt == "svg" else os.path.dirname(path) or ".")
+    return [place(*pair) for pair in previous] == [place(*pair) for pair in outputs]
+
+def order_records(fields, serial_list):
+    # 엑셀/장부에 넣을 행. functools.partial 로 넘기면 다른 프로세스로도 보낼 수 있다
+    return (dict(fields, **{"생산순서": serial_list.seq_of(serial), "시리얼넘버": serial}) for serial in serial_list)
+
+def plan_order(params):
+    # 입력을 확인하고 모델 코드와 생산순서 구간을 정한다 (파일은 아직 만들지 않는다).
+    # params: maker, category, model, year, month, order, start/end 또는 quantity, check, resume
+    maker_name, maker = resolve_choice("제조사", params["maker"], maker_dict)
+    category_name, category = resolve_choice("제품 카테고리", params["category"], category_dict)
+    model_name = str(params["model"]).strip()
+    year = str(params["year"]).strip()
+    month = str(params["month"]).strip().lstrip("0")
+    order = str(params["order"]).strip()
+    if not model_name:
+        raise ValueError("모델명을 입력해주세요.")
+    if not (len(year) == 4 and year.isdigit()):
+        raise ValueError("제조년도는 4자리 숫자여야 합니다.")
+    if month not in alpha_dict or not 1 <= int(month) <= 12:
+        raise ValueError("제조월은 1~12 사이의 숫자여야 합니다.")
+    if not order.isdigit():
+        raise ValueError("주문차수는 숫자여야 합니다.")
+
+    if params.get("start") not in (None, ""):
+        first_seq, last_seq = int(params["start"]), int(params.get("end") or params["start"])
+        if not (1 <= first_seq <= last_seq <= 10 ** SEQ_WIDTH - 1):
+            raise ValueError(f"시작/끝 번호는 1~{10 ** SEQ_WIDTH - 1} 사이이며 시작이 끝보다 작거나 같아야 합니다.")
+        mark_used = (first_seq, last_seq)
     else:
-        latest = 0
-    return latest + 1
+        quantity = int(params.get("quantity") or 0)
+        if quantity < 1:
+            raise ValueError("생성할 개수(--quantity) 또는 범위(--start/--end)를 입력해주세요.")
+        first_seq = last_seq = None
+        mark_used = None
+
+    model_code = get_unique_code(model_name)
+    get_registry(model_map_file).save(model_name, model_code)
+    check = params.get("check", serial_check)
+    pending = None
+    if first_seq is None and params.get("resume"):
+        # 중단된 같은 주문(같은 개수)이 있으면 그 구간을 다시 써서 만든 파일을 이어 쓴다
+        pending = find_pending(serial_prefix(maker, category, model_code, year, month, order), quantity, check)
+    if pending:
+        first_seq, last_seq = pending["first"], pending["last"]
+    elif first_seq is None:
+        # 여러 대에서 동시에 실행해도 겹치지 않도록 잠금 카운터에서 연속 구간을 받아온다
+        first_seq, last_seq = get_counter(serial_prefix(maker, category, model_code, year, month, order)).take(quantity)
+    serial_list = SerialRange(maker, category, model_code, year, month, order, first_seq, last_seq, check=check)
+    fields = {
+        "제조사": maker_name,
+        "제조사 코드": maker,
+        "제품 카테고리": category_name,
+        "카테고리 코드": category,
+        "모델명": model_name,
+        "모델 코드": model_code,
+        "제조년도": year,
+        "제조월": month,
+        "주문차수": order,
+    }
+    return fields, serial_list, mark_used
+
+def release_order(serial_list, mark_used):
+    # 카운터에서 받은 구간으로 만들지 못한 주문이면 번호를 돌려준다 (빈 번호로 남지 않게).
+    # 직접 정한 범위(mark_used)나 장부에 하나라도 들어간 번호(중복 등)는 쓴 번호로 둔다
+    if mark_used or get_ledger().first_existing(serial_list):
+        return False
+    get_counter(serial_list.prefix).release_range(serial_list.seqs[0], serial_list.seqs[-1])
+    return True
+
+def build_job(params, fields, serial_list, mark_used):
+    # params: formats, output_dir, excel, workers, dpi, source
+    output_dir = params.get("output_dir") or "."
+    os.makedirs(output_dir, exist_ok=True)
+    excel = params.get("excel", "serial_numbers.xlsx")
+    outputs = output_paths(params.get("formats") or ["auto"], output_dir, serial_list)
+    previous = None
+    if params.get("resume") or mark_used:
+        # --resume 이나 직접 정한 범위(--start/--end)는 같은 구간을 다시 실행하는 것이므로,
+        # 중단된 작업이 같은 형식/폴더로 쓰던 파일이 있으면 그 이름을 다시 써서 이어 쓴다
+        previous = pending_outputs(serial_list)
+        if previous and same_outputs(previous, outputs):
+            outputs = previous
+    existing = None if previous == outputs else existing_output(outputs)
+    if existing:
+        raise ValueError(f"같은 이름의 결과 파일이 이미 있습니다 (덮어쓰지 않습니다): {existing}")
+    return {
+        "serials": serial_list,
+        "records": functools.partial(order_records, fields, serial_list),
+        "source": params.get("source", "cli"),
+        "excel_file": excel_filename(excel) if excel else None,
+        "outputs": outputs,
+        "label_options": barcode_options,
+        "printer_options": dict(PRINTER_OPTIONS, dpi=params.get("dpi", printer_dpi)),
+        "render_workers": params.get("workers", render_workers),
+        "zip_compression": zip_compression,
+        "zip_level": zip_level,
+        "mark_used": mark_used,
+    }
+
+def order_result(result, fields, serial_list):
+    # run_order 결과를 JSON 으로 내보낼 dict 로
+    metrics = result.get("metrics") or {"total": 0.0, "stages": {}}
+    return {
+        "ok": result["excel_error"] is None,
+        "exit_code": EXIT_OK if result["excel_error"] is None else EXIT_EXCEL,
+        "count": result["count"],
+        "first_serial": serial_list[0],
+        "last_serial": serial_list[-1],
+        "model_code": fields["모델 코드"],
+        "seq_range": [serial_list.seqs[0], serial_list.seqs[-1]],
+        "outputs": result["outputs"],
+        "excel_path": result["excel_path"],
+        "resumed": result.get("resumed", False),
+        "error": result["excel_error"],
+        "timings": dict(metrics["stages"], total=metrics["total"]),
+        "metrics": metrics,
+        "serials": serial_list,
+    }
+
+def run_cli_order(params, progress=None):
+    # 주문 하나를 처리하고 JSON 으로 내보낼 결과 dict 를 돌려준다.
+    # params 의 profile/trace_memory 를 켜면 결과 ZIP 옆에 .prof/.mem.txt, report 를 주면 실행 보고서 JSON 을 쓴다
+    metrics = RunMetrics()
+    with metrics.stage("allocate"):
+        fields, serial_list, mark_used = plan_order(params)
+    try:
+        job = build_job(params, fields, serial_list, mark_used)
+        job["metrics"] = metrics
+        capture = ProfileCapture(params.get("profile"), params.get("trace_memory"))
+        with capture:
+            result = run_order(job, progress)
+    except Exception:
+        release_order(serial_list, mark_used)
+        raise
+    output = order_result(result, fields, serial_list)
+    base = artifact_base(result["outputs"], os.path.join(params.get("output_dir") or ".", "run"))
+    output["artifacts"] = capture.save(base) if capture.enabled else []
+    if params.get("report"):
+        output["artifacts"].append(write_run_report(params["report"], result["metrics"], first_serial=output["first_serial"],
+                                                    last_serial=output["last_serial"], outputs=result["outputs"]))
+    return output
+
+def run_safely(params, progress=None):
+    # 예외를 종료 코드가 있는 결과 dict 로 바꾼다
+    try:
+        return run_cli_order(params, progress)
+    except DuplicateSerialError as e:
+        return {"ok": False, "exit_code": EXIT_DUPLICATE, "error": str(e), "serial": e.serial}
+    except (ValueError, KeyError) as e:
+        return {"ok": False, "exit_code": EXIT_INVALID, "error": str(e)}
+    except Exception as e:
+        return {"ok": False, "exit_code": EXIT_ERROR, "error": f"{type(e).__name__}: {e}"}
+
+def print_json(result):
+    result = {k: v for k, v in result.items() if k != "serials"}
+    print(json.dumps(result, ensure_ascii=False), flush=True)
 
-def update_latest_seq(seq):
-    with open("latest_serial.txt", "w") as f:
-        f.write(str(seq))
+def build_parser():
+    parser = argparse.ArgumentParser(description="시리얼넘버/바코드 자동생성기 (인자 없이 실행하면 대화형)")
+    parser.add_argument("--maker", help="제조사 이름 또는 코드")
+    parser.add_argument("--category", help="제품 카테고리 이름 또는 코드")
+    parser.add_argument("--model", help="모델명")
+    parser.add_argument("--year", help="제조년도 (4자리)")
+    parser.add_argument("--month", help="제조월 (1~12)")
+    parser.add_argument("--order", help="주문차수")
+    parser.add_argument("--quantity", type=int, help="생성할 개수 (생산순서는 공유 카운터에서 받음)")
+    parser.add_argument("--start", type=int, help="시작 번호 (직접 범위를 정할 때)")
+    parser.add_argument("--end", type=int, help="끝 번호")
+    parser.add_argument("--output-dir", default=".", help="바코드 파일을 둘 폴더")
+    parser.add_argument("--format", dest="formats", action="append", choices=OUTPUT_FORMATS,
+                        help="출력 형식 (여러 번 지정 가능, 기본 auto)")
+    parser.add_argument("--excel", default="serial_numbers.xlsx", help="엑셀 파일 이름 (--no-excel 로 끔)")
+    parser.add_argument("--no-excel", dest="excel", action="store_const", const=None)
+    parser.add_argument("--workers", type=int, default=render_workers, help="바코드 렌더링 프로세스 수")
+    parser.add_argument("--dpi", type=int, default=printer_dpi, help="zpl/epl 출력 프린터 해상도")
+    parser.add_argument("--check", action="store_true", default=serial_check, help="시리얼 끝에 체크 문자를 붙임")
+    parser.add_argument("--resume", action="store_true",
+                        help="--quantity 로 실행하다 중단된 같은 주문이 있으면 새 번호를 받지 않고 이어서 만듦")
+    parser.add_argument("--profile", action="store_true", help="cProfile 결과(.prof)를 결과 ZIP 옆에 저장")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc 메모리 요약(.mem.txt)을 결과 ZIP 옆에 저장")
+    parser.add_argument("--report", metavar="FILE", help="단계별 시간/개수/바이트 실행 보고서(JSON)를 저장")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="한 줄에 주문 하나씩 JSON 으로 읽어서 같은 프로세스에서 차례로 처리 (- 이면 표준입력)")
+    return parser
 
-def save_to_excel(data):
-    filename = "serial_numbers.xlsx"
+def run_batch(source, defaults):
+    # 주문을 줄 단위 JSON 으로 받아서 처리하고, 결과도 줄 단위 JSON 으로 내보낸다
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    exit_code = EXIT_OK
     try:
-        if os.path.exists(filename):
-            df_existing = pd.read_excel(filename)
-            df_new = pd.concat([df_existing, pd.DataFrame(data)], ignore_index=True)
-        else:
-            df_new = pd.DataFrame(data)
-        df_new.to_excel(filename, index=False)
-        print(f"[엑셀 저장 완료] 파일명: {filename}")
-    except PermissionError:
-        print(f"[오류] 엑셀 파일이 열려 있어서 저장할 수 없습니다. '{filename}' 파일을 닫고 다시 실행해주세요.")
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                spec = json.loads(line)
+                if isinstance(spec.get("format"), str):
+                    spec["formats"] = [spec.pop("format")]
+                params = dict(defaults, **spec)
+            except json.JSONDecodeError as e:
+                result = {"ok": False, "exit_code": EXIT_INVALID, "error": f"JSON 오류: {e}"}
+            else:
+                result = run_safely(params)
+            print_json(result)
+            exit_code = exit_code or result["exit_code"]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return exit_code
+
+def main_headless(argv):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    defaults = {
+        "output_dir": args.output_dir,
+        "formats": args.formats,
+        "excel": args.excel,
+        "workers": args.workers,
+        "dpi": args.dpi,
+        "check": args.check,
+        "resume": args.resume,
+        "profile": args.profile,
+        "trace_memory": args.trace_memory,
+    }
+    if args.batch:
+        return run_batch(args.batch, defaults)
+    missing = [name for name in ("maker", "category", "model", "year", "month", "order") if getattr(args, name) is None]
+    if missing or (args.quantity is None and args.start is None):
+        parser.print_usage(sys.stderr)
+        print(f"필수 인자가 없습니다: {', '.join('--' + m for m in missing) or '--quantity 또는 --start'}", file=sys.stderr)
+        return EXIT_USAGE
+    params = dict(defaults, report=args.report, maker=args.maker, category=args.category, model=args.model, year=args.year,
+                  month=args.month, order=args.order, quantity=args.quantity, start=args.start, end=args.end)
+    result = run_safely(params)
+    print_json(result)
+    return result["exit_code"]
 
 def main():
     print("=== 시리얼넘버 자동생성기 (제조사/제품 카테고리 코드 선택형) ===")
     maker_input, maker = choose_from_list("제조사", maker_dict)
     category_input, category = choose_from_list("제품 카테고리", category_dict)
     model_name = input("모델명 입력 (예: AMH-9000): ")
-    model_code = get_unique_code(model_name)
     year = input("제조년도 입력 (4자리 숫자, 예: 2025): ")
     month = input("제조월 입력 (숫자 1~12): ").lstrip("0")
     order = input("주문차수 입력 (숫자): ")
     quantity = int(input("생성할 시리얼 개수 입력: "))
 
-    next_seq = get_next_seq()
-    records = []
-    serial_list = []
-
-    for i in range(quantity):
-        seq_num = str(next_seq + i).zfill(5)
-        serial = generate_serial(maker, category, model_code, year, month, order, seq_num)
-        print(f"[시리얼 생성] {serial}")
-        generate_barcode(serial)
-        serial_list.append(serial)
-
-        records.append({
-            "제조사": maker_input,
-            "제조사 코드": maker,
-            "제품 카테고리": category_input,
-            "카테고리 코드": category,
-            "모델명": model_name,
-            "모델 코드": model_code,
-            "제조년도": year,
-            "제조월": month,
-            "주문차수": order,
-            "생산순서": seq_num,
-            "시리얼넘버": serial
-        })
-
-    save_to_excel(records)
-    update_latest_seq(next_seq + quantity - 1)
-
-    if quantity >= 30:
-        zip_barcode_files(serial_list)
+    result = run_safely({
+        "maker": maker_input, "category": category_input, "model": model_name,
+        "year": year, "month": month, "order": order, "quantity": quantity,
+    })
+    if result["exit_code"] in (EXIT_OK, EXIT_EXCEL):
+        for serial in result["serials"]:
+            print(f"[시리얼 생성] {serial}")
+        if result["excel_path"]:
+            print(f"[엑셀 저장 완료] 파일명: {result['excel_path']}")
+        for path in result["outputs"]:
+            print(f"[생성완료] {path}")
+        for line in summary_lines(result["metrics"]):
+            print(line)
+    if result["error"]:
+        print(f"[오류] {result['error']}")
+    return result["exit_code"]
 
 if __name__ == "__main__":
-    main()
+    multiprocessing.freeze_support()
+    sys.exit(main_headless(sys.argv[1:]) if len(sys.argv) > 1 else main())
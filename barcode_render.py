@@ -0,0 +1,105 @@
+import itertools
+import os
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from code128_svg import render_svg
+
+# GUI/Streamlit 라벨 기본 옵션
+LABEL_OPTIONS = {
+    "module_width": 0.6,
+    "module_height": 80.0,
+    "font_size": 20,
+    "text_distance": 5.0,
+    "quiet_zone": 2.0,
+    "write_text": True
+}
+
+# True 면 위 LABEL_OPTIONS (CLI 는 barcode_options) 크기로 그린다.
+# 이전 버전은 set_options() 한 값이 save() 의 기본값에 덮여서 python-barcode 기본 크기
+# (바 0.2mm, 높이 15mm) 로 인쇄됐다. 라벨 크기가 바뀌지 않도록 기본은 그 크기를 유지한다
+apply_label_options = False
+
+# 워커 하나에 한 번에 넘기는 시리얼 개수
+SHARD_SIZE = 256
+# 이 개수 이하이면 프로세스를 띄우지 않고 현재 프로세스에서 그린다.
+# 프로세스 풀을 띄우는 비용(Windows 는 spawn 이라 모듈을 다시 읽는다)이 라벨 수백 장을 그리는 시간과 비슷하다
+IN_PROCESS_LIMIT = 1000
+
+def default_workers():
+    return max(1, (os.cpu_count() or 1) - 1)
+
+def label_render_options(options=None):
+    # 실제로 그릴 때 쓰는 옵션. apply_label_options 가 꺼져 있으면 빈 dict (= python-barcode 기본 크기)
+    if not apply_label_options:
+        return {}
+    return LABEL_OPTIONS if options is None else options
+
+def render_barcode_svg(serial, options=None):
+    # Code128 SVG 한 장을 bytes 로 만든다 (파일 저장 없음)
+    return render_svg(serial, label_render_options(options))
+
+def _render_shard(serials, options):
+    # options 는 부모 프로세스에서 이미 정한 값 (워커의 apply_label_options 는 보지 않는다)
+    return [render_svg(serial, options) for serial in serials]
+
+def _shards(serials, size):
+    if isinstance(serials, Sequence):
+        for i in range(0, len(serials), size):
+            yield serials[i:i + size]
+        return
+    it = iter(serials)
+    while True:
+        shard = list(itertools.islice(it, size))
+        if not shard:
+            return
+        yield shard
+
+def render_barcodes(serials, options=None, workers=None, shard_size=SHARD_SIZE):
+    # (시리얼, SVG bytes) 를 입력 순서대로 돌려준다.
+    # workers 가 1 이하이거나 IN_PROCESS_LIMIT 개 이하이면 현재 프로세스에서 하나씩 그린다.
+    options = label_render_options(options)
+    if workers is None:
+        workers = default_workers()
+    shards = _shards(serials, shard_size)
+    head = []
+    if workers > 1:
+        # 길이를 모르는 입력도 앞부분만 모아서 작은 주문인지 본다
+        count = 0
+        for shard in shards:
+            head.append(shard)
+            count += len(shard)
+            if count > IN_PROCESS_LIMIT:
+                break
+        else:
+            workers = 1
+    if workers <= 1:
+        for serial in (itertools.chain.from_iterable(head) if head else serials):
+            yield serial, render_svg(serial, options)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for shard in itertools.chain(head, shards):
+            pending.append((shard, pool.submit(_render_shard, shard, options)))
+            # 앞쪽 결과부터 내보내서 메모리는 워커 수에 비례하게만 쓴다
+            if len(pending) >= workers * 2:
+                done_shard, future = pending.popleft()
+                yield from zip(done_shard, future.result())
+        while pending:
+            done_shard, future = pending.popleft()
+            yield from zip(done_shard, future.result())
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def barcode_filename(serial):
+    return f"barcode_{serial}.svg"
+
+def write_barcodes_zip(zipf, rendered):
+    # 렌더링된 SVG 를 임시 파일 없이 바로 ZIP 항목으로 쓴다
+    count = 0
+    for serial, svg in rendered:
+        zipf.writestr(barcode_filename(serial), svg)
+        count += 1
+    return count
@@ -0,0 +1,252 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from barcode_render import LABEL_OPTIONS, barcode_filename, render_barcode_svg, render_barcodes
+from decode_bulk import decode_many
+from excel_append import append_rows
+from label_printer import render_labels
+from memory_sheet import InMemoryWorksheet
+from model_registry import ModelRegistry
+from order_job import run_order
+from serial_ledger import SerialLedger
+from serial_range import SerialRange
+from sheets_writer import SHEET_COLUMNS, BufferedSheetWriter
+from zip_stream import ParallelZipWriter
+
+BENCH_SIZES = [1, 1000, 99999]
+# 이전 결과보다 이 비율 이상 느려지거나 (메모리는 많이 쓰면) 실패
+TIME_THRESHOLD = 0.25
+MEMORY_THRESHOLD = 0.5
+# 이보다 짧은 단계는 측정 오차가 커서 비교하지 않는다
+MIN_SECONDS = 0.02
+BASELINE_FILE = "bench_baseline.json"
+
+ORDER = ("LA", "MH", "BN", "2025", "7", "1")
+
+def _records(serials, model_name="BENCH-1"):
+    return ({
+        "시리얼넘버": serial,
+        "제조사": "리앤텍",
+        "제품 카테고리": "가습기",
+        "모델명": model_name,
+        "제조년도": "2025",
+        "제조월": "7",
+        "주문차수": "1",
+        "생산순서": serials.seq_of(serial),
+    } for serial in serials)
+
+# 각 단계는 (준비는 시간에서 빼고) 측정할 함수를 돌려준다. ctx 는 임시 폴더 안에서 공유하는 상태
+def bench_generate_serial(ctx, n):
+    serials = SerialRange(*ORDER, 1, n)
+    return lambda: list(serials)
+
+def bench_get_unique_code(ctx, n):
+    # 모델 코드는 676개뿐이라 600개 이름을 돌려 쓰고 나머지는 이미 있는 코드 조회가 된다
+    registry = ModelRegistry(f"model_map_{ctx['run']}.csv")
+    names = [f"BENCH-{i % 600}" for i in range(n)]
+    return lambda: [registry.allocate(name) for name in names]
+
+def bench_save_model_mapping(ctx, n):
+    registry = ModelRegistry(f"model_map_{ctx['run']}.csv")
+    pairs = [(f"BENCH-{i % 600}", registry.allocate(f"BENCH-{i % 600}")) for i in range(n)]
+    return lambda: [registry.save(name, code) for name, code in pairs]
+
+def bench_generate_barcode(ctx, n):
+    serials = SerialRange(*ORDER, 1, n)
+    return lambda: sum(len(svg) for _, svg in render_barcodes(serials, LABEL_OPTIONS, workers=ctx["workers"]))
+
+def bench_generate_label(ctx, n):
+    # SVG 대신 프린터 명령(ZPL)으로 만드는 경우
+    serials = SerialRange(*ORDER, 1, n)
+    return lambda: sum(len(label) for _, label in render_labels(serials, LABEL_OPTIONS))
+
+def bench_zip(ctx, n):
+    # 렌더링 시간은 빼고 압축/쓰기만 잰다 (렌더링한 SVG 몇 개를 돌려 쓴다)
+    serials = SerialRange(*ORDER, 1, n)
+    svgs = [render_barcode_svg(serial, LABEL_OPTIONS) for serial in serials[:min(n, 50)]]
+
+    def run():
+        with ParallelZipWriter(f"bench_{ctx['run']}.zip") as zipf:
+            for i, serial in enumerate(serials):
+                zipf.writestr(barcode_filename(serial), svgs[i % len(svgs)])
+        return os.path.getsize(f"bench_{ctx['run']}.zip")
+    return run
+
+def bench_save_to_excel(ctx, n):
+    serials = SerialRange(*ORDER, 1, n)
+    # 기존 파일에 붙이는 경우를 잰다 (공장에서는 월별 파일이 이미 있는 경우가 대부분)
+    filename = f"bench_{ctx['run']}.xlsx"
+    append_rows(filename, _records(SerialRange(*ORDER, 100000, 100009)))
+    return lambda: append_rows(filename, _records(serials))
+
+def bench_ledger(ctx, n):
+    serials = SerialRange(*ORDER, 1, n)
+    ledger = SerialLedger(f"ledger_{ctx['run']}.db")
+    return lambda: ledger.insert_order(_records(serials), source="bench")
+
+def bench_sheets(ctx, n):
+    # Google Sheets 대신 메모리 시트에 쓴다 (속도 제한은 끄고 묶음/호출 수만 잰다)
+    serials = SerialRange(*ORDER, 1, n)
+    sheet = InMemoryWorksheet(SHEET_COLUMNS)
+    writer = BufferedSheetWriter(sheet, {"rate": 1e9, "burst": 1e9}, sleep=lambda s: None)
+    return lambda: (writer.extend(_records(serials)), writer.close())
+
+def bench_decode_serial(ctx, n):
+    serials = list(SerialRange(*ORDER, 1, n))
+    names = {"BN": "BENCH-1"}
+    return lambda: decode_many(serials, names)
+
+def bench_end_to_end(ctx, n):
+    # 주문 하나 전체: 중복 확인 -> 바코드 ZIP -> 장부 -> 엑셀. 실행마다 주문차수를 바꿔서 중복을 피한다
+    order = str(ctx["run"] % 100)
+    serials = SerialRange(*ORDER[:5], order, 1, n)
+    job = {
+        "serials": serials,
+        "records": lambda: _records(serials),
+        "source": "bench",
+        "excel_file": f"bench_order_{ctx['run']}.xlsx",
+        "output": "zip",
+        "output_path": f"bench_order_{ctx['run']}.zip",
+        "render_workers": ctx["workers"],
+        "journal": ctx["journal"],
+    }
+    return lambda: run_order(job)
+
+STAGES = {
+    "generate_serial": bench_generate_serial,
+    "get_unique_code": bench_get_unique_code,
+    "save_model_mapping": bench_save_model_mapping,
+    "generate_barcode": bench_generate_barcode,
+    "generate_label": bench_generate_label,
+    "zip": bench_zip,
+    "save_to_excel": bench_save_to_excel,
+    "ledger": bench_ledger,
+    "sheets": bench_sheets,
+    "decode_serial": bench_decode_serial,
+    "end_to_end": bench_end_to_end,
+}
+
+def measure(stage, n, ctx, repeat=1, memory=True):
+    # 시간은 tracemalloc 없이 repeat 번 중 가장 빠른 값, 메모리는 따로 한 번 더 돌려서 최대 사용량을 잰다
+    # (렌더링 프로세스 안의 메모리는 tracemalloc 에 잡히지 않는다)
+    best = None
+    for _ in range(repeat):
+        ctx["run"] += 1
+        run = STAGES[stage](ctx, n)
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    result = {"seconds": round(best, 6), "per_sec": round(n / best, 1) if best else None}
+    if memory:
+        ctx["run"] += 1
+        run = STAGES[stage](ctx, n)
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_mb"] = round(peak / 2**20, 3)
+    return result
+
+def run_benchmarks(stages, sizes, repeat=1, memory=True, workers=1, journal=None, log=None):
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="serial_bench_", ignore_cleanup_errors=True) as tmp:
+        # 장부/카운터/엑셀 등 상대 경로로 만드는 파일이 모두 임시 폴더에 생기게 한다
+        os.chdir(tmp)
+        try:
+            ctx = {"run": 0, "workers": workers, "journal": journal}
+            for stage in stages:
+                for n in sizes:
+                    result = measure(stage, n, ctx, repeat, memory)
+                    results[f"{stage}@{n}"] = result
+                    if log:
+                        log(stage, n, result)
+        finally:
+            os.chdir(cwd)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": workers,
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+def compare(report, baseline, threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD):
+    # (단계@개수, 설명) 목록. 기준에 없는 단계는 건너뛴다
+    regressions = []
+    for key, result in report["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if not base:
+            continue
+        if max(result["seconds"], base["seconds"]) >= MIN_SECONDS and result["seconds"] > base["seconds"] * (1 + threshold):
+            regressions.append((key, f"시간 {base['seconds']:.4f}초 -> {result['seconds']:.4f}초 "
+                                     f"(+{result['seconds'] / base['seconds'] - 1:.0%})"))
+        if "peak_mb" in result and base.get("peak_mb") and result["peak_mb"] > base["peak_mb"] * (1 + memory_threshold):
+            regressions.append((key, f"메모리 {base['peak_mb']:.2f}MB -> {result['peak_mb']:.2f}MB"))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시리얼 파이프라인 단계별 벤치마크")
+    parser.add_argument("--stage", dest="stages", action="append", choices=list(STAGES), help="측정할 단계 (기본 전부)")
+    parser.add_argument("--sizes", default=",".join(map(str, BENCH_SIZES)), help="개수 목록 (쉼표로 구분)")
+    parser.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--workers", type=int, default=1, help="바코드 렌더링 프로세스 수 (기준값과 같아야 비교 가능)")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="tracemalloc 메모리 측정을 끔")
+    parser.add_argument("--journal", action="store_true", help="end_to_end 에서 진행 기록(run_journal)을 켬")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준으로 저장")
+    parser.add_argument("--threshold", type=float, default=TIME_THRESHOLD, help="허용하는 시간 증가 비율")
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD, help="허용하는 메모리 증가 비율")
+    parser.add_argument("--output", help="결과 JSON 을 저장할 파일")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    stages = args.stages or list(STAGES)
+    baseline_path = os.path.abspath(args.baseline)
+    output_path = os.path.abspath(args.output) if args.output else None
+
+    def log(stage, n, result):
+        memory = f", 최대 {result['peak_mb']:.2f}MB" if "peak_mb" in result else ""
+        print(f"{stage:>20} @ {n:>6}: {result['seconds']:.4f}초 ({result['per_sec']:,.0f}개/초{memory})", file=sys.stderr)
+
+    report = run_benchmarks(stages, sizes, args.repeat, args.memory, args.workers,
+                            ".serial_journal" if args.journal else None, log)
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        baseline = {"meta": report["meta"], "results": {}}
+        if os.path.exists(baseline_path):
+            with open(baseline_path, encoding="utf-8") as f:
+                baseline = json.load(f)
+        # 이번에 잰 단계만 바꾸고 나머지 기준값은 그대로 둔다
+        baseline["meta"] = report["meta"]
+        baseline["results"].update(report["results"])
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"[기준 저장] {baseline_path}", file=sys.stderr)
+        return 0
+    if not os.path.exists(baseline_path):
+        print(f"[기준 없음] {baseline_path} (--save-baseline 으로 만드세요)", file=sys.stderr)
+        return 0
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.threshold, args.memory_threshold)
+    for key, message in regressions:
+        print(f"[성능 저하] {key}: {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
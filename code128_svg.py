@@ -0,0 +1,267 @@
+import os
+
+# Code128 심볼 패턴 (값 0~105, 1 = 바, 0 = 공백)
+CODES = (
+    '11011001100', '11001101100', '11001100110', '10010011000', '10010001100',
+    '10001001100', '10011001000', '10011000100', '10001100100', '11001001000',
+    '11001000100', '11000100100', '10110011100', '10011011100', '10011001110',
+    '10111001100', '10011101100', '10011100110', '11001110010', '11001011100',
+    '11001001110', '11011100100', '11001110100', '11101101110', '11101001100',
+    '11100101100', '11100100110', '11101100100', '11100110100', '11100110010',
+    '11011011000', '11011000110', '11000110110', '10100011000', '10001011000',
+    '10001000110', '10110001000', '10001101000', '10001100010', '11010001000',
+    '11000101000', '11000100010', '10110111000', '10110001110', '10001101110',
+    '10111011000', '10111000110', '10001110110', '11101110110', '11010001110',
+    '11000101110', '11011101000', '11011100010', '11011101110', '11101011000',
+    '11101000110', '11100010110', '11101101000', '11101100010', '11100011010',
+    '11101111010', '11001000010', '11110001010', '10100110000', '10100001100',
+    '10010110000', '10010000110', '10000101100', '10000100110', '10110010000',
+    '10110000100', '10011010000', '10011000010', '10000110100', '10000110010',
+    '11000010010', '11001010000', '11110111010', '11000010100', '10001111010',
+    '10100111100', '10010111100', '10010011110', '10111100100', '10011110100',
+    '10011110010', '11110100100', '11110010100', '11110010010', '11011011110',
+    '11011110110', '11110110110', '10101111000', '10100011110', '10001011110',
+    '10111101000', '10111100010', '11110101000', '11110100010', '10111011110',
+    '10111101110', '11101011110', '11110101110', '11010000100', '11010010000',
+    '11010011100',
+)
+# STOP 패턴 + 마지막 종료 바
+STOP = '11000111010' + '11'
+
+TO_C, TO_B, TO_A = 99, 100, 101
+START_CODES = {'A': 103, 'B': 104, 'C': 105}
+SWITCH_CODES = {'A': TO_A, 'B': TO_B, 'C': TO_C}
+# START_C 바로 뒤 전환 코드는 해당 START 코드로 합친다
+OPTIMIZE = {TO_A: 103, TO_B: 104, TO_C: 105}
+
+FNC_CHARS = {'ó': 96, 'ò': 97, 'ñ': 102}
+CHARSET_B = {chr(i): i - 32 for i in range(32, 128)}
+CHARSET_B.update(FNC_CHARS)
+CHARSET_B['ô'] = 100
+CHARSET_A = {chr(i): i - 32 for i in range(32, 96)}
+CHARSET_A.update({chr(i): i + 64 for i in range(32)})
+CHARSET_A.update(FNC_CHARS)
+CHARSET_A['ô'] = 101
+
+def _runs(pattern):
+    # '11011001100' -> [2, -1, 2, -2, 1, -1, 2, -2] (양수 = 바, 음수 = 공백)
+    runs = []
+    count = 1
+    for a, b in zip(pattern, pattern[1:] + ' '):
+        if a == b:
+            count += 1
+        else:
+            runs.append(count if a == '1' else -count)
+            count = 1
+    return tuple(runs)
+
+# 모든 심볼이 바로 시작해서 공백으로 끝나므로 심볼 단위로 미리 나눠둔다
+CODE_RUNS = tuple(_runs(code) for code in CODES)
+STOP_RUNS = _runs(STOP)
+
+def _leading_digits(code, pos):
+    digits = 0
+    for c in code[pos:pos + 10]:
+        if c.isdigit():
+            digits += 1
+        else:
+            break
+    return digits
+
+def encode(code):
+    # python-barcode 의 Code128 과 같은 규칙으로 문자셋을 고르고 체크섬까지 붙인 값 목록
+    if not code:
+        raise ValueError("빈 문자열은 Code128 로 만들 수 없습니다.")
+    charset = 'C'
+    buffer = ''
+    encoded = [START_CODES['C']]
+
+    def convert(char):
+        nonlocal buffer
+        if charset == 'A':
+            return CHARSET_A[char]
+        if charset == 'B':
+            return CHARSET_B[char]
+        if char == 'ñ':
+            return FNC_CHARS[char]
+        if char.isdigit():
+            buffer += char
+            if len(buffer) == 2:
+                value = int(buffer)
+                buffer = ''
+                return value
+            return None
+        raise ValueError(f"Code128 로 변환할 수 없는 문자입니다: {char!r}")
+
+    for i, char in enumerate(code):
+        if char not in CHARSET_A and char not in CHARSET_B:
+            raise ValueError(f"Code128 로 변환할 수 없는 문자입니다: {char!r}")
+        if charset == 'C' and not char.isdigit():
+            new = 'B' if char in CHARSET_B else 'A'
+            encoded.append(SWITCH_CODES[new])
+            charset = new
+            if len(buffer) == 1:
+                encoded.append(convert(buffer))
+                buffer = ''
+        elif charset in ('A', 'B'):
+            if _leading_digits(code, i) > 3:
+                encoded.append(TO_C)
+                charset = 'C'
+            elif charset == 'B' and char not in CHARSET_B:
+                encoded.append(TO_A)
+                charset = 'A'
+            elif charset == 'A' and char not in CHARSET_A:
+                encoded.append(TO_B)
+                charset = 'B'
+        value = convert(char)
+        if value is not None:
+            encoded.append(value)
+    if len(buffer) == 1:
+        encoded.append(TO_B)
+        charset = 'B'
+        encoded.append(convert(buffer))
+    if len(encoded) > 1 and encoded[1] in OPTIMIZE:
+        encoded[:2] = [OPTIMIZE[encoded[1]]]
+    checksum = (encoded[0] + sum(i * v for i, v in enumerate(encoded[1:], start=1))) % 103
+    encoded.append(checksum)
+    return encoded
+
+def modules(code):
+    # 바/공백 패턴 문자열 (python-barcode Code128.build() 와 같은 값)
+    return ''.join(CODES[v] for v in encode(code)) + STOP
+
+# python-barcode 의 Barcode/Code128/SVGWriter 기본값
+DEFAULT_OPTIONS = {
+    "module_width": 0.2,
+    "module_height": 15.0,
+    "quiet_zone": 2.54,
+    "font_size": 10,
+    "text_distance": 5.0,
+    "background": "white",
+    "foreground": "black",
+    "write_text": True,
+    "text": "",
+    "center_text": True,
+    "margin_top": 1,
+    "margin_bottom": 1,
+    "text_line_distance": 1,
+}
+
+def _barcode_version():
+    try:
+        from importlib.metadata import version
+        return version("python-barcode")
+    except Exception:
+        return ""
+
+def _escape(value):
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;").replace(">", "&gt;")
+
+def _size(value):
+    return f"{value:.3f}mm"
+
+class Code128SVGRenderer:
+    # 옵션별로 한 번만 만들어 두고 render() 를 반복 호출한다.
+    # 출력은 python-barcode SVGWriter 의 결과와 같은 바 배치/크기를 가진다.
+    def __init__(self, options=None, newline=os.linesep, comment=None):
+        opts = dict(DEFAULT_OPTIONS)
+        opts.update(options or {})
+        self.options = opts
+        self.module_width = opts["module_width"]
+        self.module_height = opts["module_height"]
+        self.quiet_zone = opts["quiet_zone"]
+        self.font_size = opts["font_size"]
+        self.text_distance = opts["text_distance"]
+        self.margin_top = opts["margin_top"]
+        self.write_text = opts["write_text"]
+        self.fixed_text = opts["text"]
+        self.center_text = opts["center_text"]
+        self.nl = newline
+        background = opts["background"]
+        foreground = opts["foreground"]
+        self._font_mm = self.font_size * 0.352777778
+        self._base_height = opts["margin_bottom"] + opts["margin_top"] + self.module_height
+
+        if comment is None:
+            version = _barcode_version()
+            comment = f"Autogenerated with python-barcode {version}" if version else ""
+        nl = newline
+        self._head = (
+            f'<?xml version="1.0" encoding="UTF-8"?>{nl}'
+            f"<!DOCTYPE svg{nl}  PUBLIC '-//W3C//DTD SVG 1.1//EN'{nl}"
+            f"  'http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd'>{nl}"
+            '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" width="'
+        )
+        body = f'">{nl}'
+        if comment:
+            body += f"    <!--{comment}-->{nl}"
+        body += f'    <g id="barcode_group">{nl}'
+        if background is not None:
+            body += f'        <rect width="100%" height="100%" style="{_escape(f"fill:{background}")}"/>{nl}'
+        self._body = body
+        # 모든 바의 y, height, style 은 같으므로 한 번만 만든다
+        self._bar_tail = (
+            f'" y="{_size(self.margin_top)}" width="{{}}" height="{_size(self.module_height)}" '
+            f'style="{_escape(f"fill:{foreground};")}"/>{nl}'
+        )
+        self._text_style = _escape(f"fill:{foreground};font-size:{self.font_size}pt;text-anchor:middle;")
+        self._foot = f"    </g>{nl}</svg>{nl}"
+        self._widths = {}
+
+    def _bar_width(self, run):
+        # 같은 폭 문자열은 재사용한다
+        width = self._widths.get(run)
+        if width is None:
+            width = self._widths[run] = _size(self.module_width * run)
+        return width
+
+    def render(self, code, text=None):
+        if text is None:
+            text = code if self.write_text else self.fixed_text
+        encoded = encode(code)
+        module_width = self.module_width
+        bar_tail = self._bar_tail
+        bar_width = self._bar_width
+
+        parts = []
+        xpos = self.quiet_zone
+        n_modules = len(STOP)
+        for value in encoded:
+            n_modules += len(CODES[value])
+        for runs in [CODE_RUNS[v] for v in encoded] + [STOP_RUNS]:
+            for run in runs:
+                if run > 0:
+                    parts.append('        <rect x="' + _size(xpos) + bar_tail.format(bar_width(run)))
+                    xpos += module_width * run
+                else:
+                    xpos += module_width * -run
+
+        width = 2 * self.quiet_zone + n_modules * module_width
+        height = self._base_height
+        if self.font_size and text:
+            height += self._font_mm / 2 + self.text_distance
+        if text:
+            tx = self.quiet_zone + (xpos - self.quiet_zone) / 2.0 if self.center_text else self.quiet_zone
+            ty = self.margin_top + self.module_height + self.text_distance
+            parts.append(
+                f'        <text x="{_size(tx)}" y="{_size(ty)}" style="{self._text_style}">'
+                f'{_escape(text)}</text>{self.nl}'
+            )
+
+        return (
+            self._head + _size(width) + '" height="' + _size(height) + self._body
+            + ''.join(parts) + self._foot
+        ).encode("utf-8")
+
+_renderers = {}
+
+def get_renderer(options=None):
+    # 같은 옵션이면 같은 렌더러를 재사용한다
+    key = tuple(sorted((options or {}).items()))
+    renderer = _renderers.get(key)
+    if renderer is None:
+        renderer = _renderers[key] = Code128SVGRenderer(options)
+    return renderer
+
+def render_svg(code, options=None):
+    return get_renderer(options).render(code)
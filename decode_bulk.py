@@ -0,0 +1,169 @@
+import argparse
+import datetime
+import sys
+import numpy as np
+import pandas as pd
+from serial_batch import alpha_dict
+from serial_check import SERIAL_LENGTH, check_bytes
+from model_registry import get_registry
+
+# 체크 문자 한 자리 + 너무 긴 입력을 알아보기 위한 한 자리
+BUFFER_LENGTH = SERIAL_LENGTH + 2
+
+# GUI/Streamlit 과 CLI(auto_serial_barcode) 의 제조사 코드를 모두 받아들인다
+MAKER_CODES = {
+    "NB": "닝보 타이웨이", "HL": "리앤텍", "LA": "리앤텍", "MT": "마라타", "VS": "웨이슬라", "SV": "웨이슬라",
+    "KE": "킹크린", "DC": "푸산 데코", "HX": "헝쉰전자", "HU": "화유", "ZK": "중산 커리신", "KR": "중산 커리신",
+}
+
+CATEGORY_CODES = {
+    "MC": "무선 진공 청소기", "AC": "무선 물걸레 청소기", "MH": "가습기", "AP": "공기청정기", "DH": "제습기",
+    "MF": "선풍기", "AF": "에어프라이어", "MB": "블렌더", "MS": "헤어 드라이기", "FP": "음식물 처리기",
+}
+
+# 연도 자리는 한 자리 숫자, 월 자리는 1~12 (10월은 0 과 같은 M)
+YEAR_DIGITS = {v: k for k, v in alpha_dict.items() if len(k) == 1}
+MONTHS = {v: k.zfill(2) for k, v in alpha_dict.items() if k != "0"}
+
+UNKNOWN = "알 수 없음"
+
+COLUMNS = ["시리얼넘버", "제조사", "카테고리", "모델 코드", "모델명", "제조년도", "제조월", "주문차수", "생산순서", "오류"]
+
+def _pair_table(codes):
+    # 두 글자 코드 -> 이름을 (첫 글자, 둘째 글자) 유니코드 값으로 바로 찾는 128x128 표
+    table = np.full((128, 128), UNKNOWN, dtype=object)
+    for code, name in codes.items():
+        table[ord(code[0]), ord(code[1])] = name
+    return table
+
+def _char_table(mapping, default):
+    table = np.full(128, default, dtype=object)
+    for char, value in mapping.items():
+        table[ord(char)] = value
+    return table
+
+MAKER_TABLE = _pair_table(MAKER_CODES)
+CATEGORY_TABLE = _pair_table(CATEGORY_CODES)
+MONTH_TABLE = _char_table(MONTHS, "Unknown")
+
+def year_table(now=None):
+    # guess_full_year 와 같은 규칙: 올해+1 보다 크면 10년 전으로 본다
+    current = (now or datetime.datetime.now()).year
+    years = {}
+    for letter, digit in YEAR_DIGITS.items():
+        year = current // 10 * 10 + int(digit)
+        years[letter] = str(year - 10 if year > current + 1 else year)
+    return _char_table(years, "Unknown")
+
+def _codes(mapping):
+    return np.array([ord(c) for c in mapping], dtype=np.uint32)
+
+YEAR_CODES = _codes(YEAR_DIGITS)
+MONTH_CODES = _codes(MONTHS)
+DIGIT_CODES = _codes("0123456789")
+
+def _errors(problems, n):
+    # [(해당 행 표시, 메시지), ...] -> 행마다 "메시지, 메시지" (없으면 "").
+    # 문제 조합을 비트로 묶어서 조합마다 한 번만 문자열을 만든다
+    bits = np.zeros(n, dtype=np.int64)
+    for i, (mask, _) in enumerate(problems):
+        bits |= mask.astype(np.int64) << i
+    combos, inverse = np.unique(bits, return_inverse=True)
+    texts = np.array([", ".join(message for i, (_, message) in enumerate(problems) if combo >> i & 1)
+                      for combo in combos], dtype=object)
+    return texts[inverse.ravel()] if n else np.zeros(0, dtype=object)
+
+def _column(chars, start, stop):
+    # (n, 폭) uint32 코드 배열의 일부 열을 다시 문자열 배열로
+    part = np.ascontiguousarray(chars[:, start:stop])
+    return part.view(f"U{stop - start}").ravel()
+
+def decode_many(serials, model_names=None, now=None):
+    # 시리얼 여러 개를 한 번에 풀어서 DataFrame 으로 돌려준다.
+    # 문자열을 (n, 17) 정수 배열로 보고 열 단위로 잘라서 미리 만든 표에서 찾는다.
+    if model_names is None:
+        model_names = get_registry().names
+    raw = np.asarray([str(s).strip().upper() for s in serials], dtype=f"U{BUFFER_LENGTH}")
+    n = len(raw)
+    lengths = np.char.str_len(raw) if n else np.zeros(0, dtype=int)
+    chars = raw.view(np.uint32).reshape(n, BUFFER_LENGTH)
+    # 표 범위를 벗어나는 문자(한글 등)는 0 으로 바꿔서 "알 수 없음" 이 되게 한다
+    chars = np.where(chars < 128, chars, 0)
+
+    # 16자리면 마지막 자리를 체크 문자로 보고 앞 15자리로 다시 계산해서 맞춰 본다
+    last = chars[:, SERIAL_LENGTH]
+    with_check = lengths == SERIAL_LENGTH + 1
+    check_ok = check_bytes(chars[:, :SERIAL_LENGTH].astype(np.uint8)) == last
+    length_ok = (lengths == SERIAL_LENGTH) | with_check
+
+    maker = MAKER_TABLE[chars[:, 0], chars[:, 1]]
+    category = CATEGORY_TABLE[chars[:, 2], chars[:, 3]]
+    # 길이가 틀리면 자리가 밀렸으므로 길이 오류만 알린다
+    error = _errors([
+        (~length_ok, "길이 오류"),
+        (length_ok & (maker == UNKNOWN), "제조사 코드 오류"),
+        (length_ok & (category == UNKNOWN), "카테고리 코드 오류"),
+        (length_ok & ~np.isin(chars[:, 6], YEAR_CODES), "제조년도 오류"),
+        (length_ok & ~np.isin(chars[:, 7], MONTH_CODES), "제조월 오류"),
+        (length_ok & ~np.isin(chars[:, 8:10], DIGIT_CODES).all(axis=1), "주문차수 오류"),
+        (length_ok & ~np.isin(chars[:, 10:SERIAL_LENGTH], DIGIT_CODES).all(axis=1), "생산순서 오류"),
+        (with_check & ~check_ok, "체크 문자 오류"),
+    ], n)
+    model_code = _column(chars, 4, 6)
+    full_year = year_table(now)[chars[:, 6]]
+    month = MONTH_TABLE[chars[:, 7]]
+    order = _column(chars, 8, 10)
+    sequence = _column(chars, 10, SERIAL_LENGTH)
+
+    df = pd.DataFrame({
+        "시리얼넘버": raw,
+        "제조사": maker,
+        "카테고리": category,
+        "모델 코드": model_code,
+        "모델명": pd.Series(model_code).map(model_names).fillna("(매핑 없음)").to_numpy(),
+        "제조년도": full_year,
+        "제조월": month,
+        "주문차수": order,
+        "생산순서": sequence,
+        "오류": error,
+    }, columns=COLUMNS)
+    return df
+
+def read_serials(path=None, column=None):
+    # 한 줄에 하나씩 (빈 줄 무시). CSV/엑셀은 column 으로 열 이름을 정한다
+    if path and path.endswith((".csv", ".xlsx")) and column:
+        reader = pd.read_csv if path.endswith(".csv") else pd.read_excel
+        return reader(path, usecols=[column], dtype=str)[column].dropna().tolist()
+    if path and path != "-":
+        with open(path, "r", encoding="utf-8-sig") as f:
+            return f.read().split()
+    return sys.stdin.read().split()
+
+def write_decoded(df, path):
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        # 엑셀에서 한글이 깨지지 않도록 BOM 을 붙인다
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스캐너에서 받은 시리얼 넘버 목록을 한 번에 해석합니다.")
+    parser.add_argument("input", nargs="?", default="-", help="시리얼 목록 파일 (생략하거나 - 이면 표준입력)")
+    parser.add_argument("-o", "--output", default="decoded_serials.csv", help="결과 파일 (.csv 또는 .parquet)")
+    parser.add_argument("--column", help="입력이 CSV/엑셀일 때 시리얼넘버 열 이름")
+    parser.add_argument("--model-map", default="model_map.csv", help="모델 매핑 CSV")
+    args = parser.parse_args(argv)
+
+    serials = read_serials(args.input, args.column)
+    df = decode_many(serials, get_registry(args.model_map).names)
+    try:
+        write_decoded(df, args.output)
+    except ImportError as e:
+        print(f"[오류] Parquet 저장에는 pyarrow 가 필요합니다: {e}", file=sys.stderr)
+        return 1
+    bad = int((df["오류"] != "").sum())
+    print(f"[해석 완료] {len(df)}개 (오류 {bad}개) -> {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,20 @@
 import customtkinter as ctk
 import tkinter.messagebox
-import hashlib
 import os
-import barcode
-import pandas as pd
-import zipfile
 import datetime
 import subprocess
+import multiprocessing
+import queue
+import threading
+import time
+from serial_range import SerialRange
+from serial_check import add_check, strip_check
+from excel_append import monthly_filename
+from barcode_render import LABEL_OPTIONS
+from order_job import JobCancelled, run_order
+from run_metrics import ProfileCapture, artifact_base, report_path, summary_lines, write_run_report
+from serial_list_view import SerialListView
+from model_registry import get_registry
 from xml.etree import ElementTree as ET
 
 # 시리얼 생성 관련 설정
@@ -16,104 +24,61 @@ alpha_dict = {
     '10': 'M', '11': 'N', '12': 'P'
 }
 
-used_codes = set()
-model_code_cache = {}
 model_map_file = "model_map.csv"
 
 last_saved_file = ""
+# 바코드 렌더링 프로세스 수 (None 이면 CPU 수에 맞춤, 1 이면 단일 코어)
+render_workers = None
+# ZIP 압축 방식 ("stored", "deflate", "bzip2", "lzma") 과 레벨
+zip_compression = "deflate"
+zip_level = 6
+# 엑셀을 월별 파일로 나눠서 저장 (한 파일이 계속 커지지 않게).
+# 켜면 기존 누적 파일 대신 "이름_YYYY-MM.xlsx" 에 저장되므로 기본은 꺼 둔다
+excel_rolling = False
+# 시리얼 끝에 체크 문자(mod 23)를 붙여서 잘못 입력/스캔된 시리얼을 바로 걸러낸다.
+# 체크 문자가 없는 기존 15자리 시리얼도 계속 해석된다
+serial_check = False
+# "zpl" / "epl" 이면 SVG 를 그리지 않고 열전사 프린터 명령 파일 하나로 저장한다 (None 이면 SVG/ZIP)
+printer_output = None
+printer_dpi = 203
+# 느린 주문을 분석할 때만 켠다: 결과 ZIP 옆에 실행 보고서(.run.json), cProfile(.prof), 메모리(.mem.txt) 를 남긴다
+run_report = False
+profile_run = False
+trace_memory = False
 
 def num_to_alpha(num):
     return ''.join(alpha_dict[digit] for digit in str(num))
 
-def model_to_number(model_name):
-    model_name = model_name.upper()
-    h = hashlib.sha256(model_name.encode()).hexdigest()
-    return int(h, 16)
-
-def number_to_code(num):
-    num = num % 676
-    first = chr(ord('A') + num // 26)
-    second = chr(ord('A') + num % 26)
-    return first + second
-
 def get_unique_code(model_name):
-    model_name = model_name.upper()
-    if model_name in model_code_cache:
-        return model_code_cache[model_name]
-    base_num = model_to_number(model_name)
-    for offset in range(676):
-        code = number_to_code(base_num + offset)
-        if code not in used_codes:
-            used_codes.add(code)
-            model_code_cache[model_name] = code
-            return code
-    raise Exception("모든 코드가 소진되었습니다! (676개 제한)")
-
-def generate_serial(maker, category, model_code, year, month, order, seq):
+    return get_registry(model_map_file).allocate(model_name)
+
+def generate_serial(maker, category, model_code, year, month, order, seq, check=False):
     year_alpha = num_to_alpha(year[-1])
     month_alpha = alpha_dict[month]
     order_number = str(order).zfill(2)
-    return f"{maker}{category}{model_code}{year_alpha}{month_alpha}{order_number}{seq}"
-
-def generate_barcode(serial):
-    CODE128 = barcode.get_barcode_class('code128')
-    writer = barcode.writer.SVGWriter()
-    writer.set_options({
-        "module_width": 0.6,
-        "module_height": 80.0,
-        "font_size": 20,
-        "text_distance": 5.0,
-        "quiet_zone": 2.0,
-        "write_text": True
-    })
-    barcode_img = CODE128(serial, writer=writer)
-    filename = barcode_img.save(f'barcode_{serial}')
-    return filename
+    serial = f"{maker}{category}{model_code}{year_alpha}{month_alpha}{order_number}{seq}"
+    return add_check(serial) if check else serial
 
-def save_to_excel(data):
+def excel_filename():
     filename = "serial_numbers_gui.xlsx"
-    if os.path.exists(filename):
-        df_existing = pd.read_excel(filename)
-        df_new = pd.concat([df_existing, pd.DataFrame(data)], ignore_index=True)
-    else:
-        df_new = pd.DataFrame(data)
-    df_new.to_excel(filename, index=False)
-    return os.path.abspath(filename)
-
-def zip_svg_files(serial_list, model_name, year, month, order):
+    if excel_rolling:
+        filename = monthly_filename(filename)
+    return filename
+
+def order_filename(model_name, year, month, order, suffix=""):
     short_date = datetime.datetime.now().strftime('%y%m%d')
-    zip_filename = f"serial-number_{short_date}_{model_name}_{year}년_{month}월_{order}차.zip"
-    with zipfile.ZipFile(zip_filename, 'w') as zipf:
-        for serial in serial_list:
-            file = f"barcode_{serial}.svg"
-            if os.path.exists(file):
-                zipf.write(file)
-                os.remove(file)
-    return os.path.abspath(zip_filename)
+    return f"serial-number_{short_date}_{model_name}_{year}년_{month}월_{order}차{suffix}"
 
 def save_model_mapping(model_name, model_code):
     try:
-        if os.path.exists(model_map_file):
-            df = pd.read_csv(model_map_file)
-            if not ((df['모델코드'] == model_code) & (df['모델명'] == model_name)).any():
-                df = pd.concat([df, pd.DataFrame([{"모델코드": model_code, "모델명": model_name}])], ignore_index=True)
-                df.to_csv(model_map_file, index=False)
-        else:
-            df = pd.DataFrame([{"모델코드": model_code, "모델명": model_name}])
-            df.to_csv(model_map_file, index=False)
+        get_registry(model_map_file).save(model_name, model_code)
     except Exception as e:
         print(f"[모델 매핑 저장 오류] {e}")
 
 def lookup_model_name(code):
-    if not os.path.exists(model_map_file):
-        return "(매핑 없음)"
+    # 메모리 사전에서 찾고, model_map.csv 가 바뀐 경우에만 다시 읽는다
     try:
-        df = pd.read_csv(model_map_file)
-        row = df[df['모델코드'] == code]
-        if not row.empty:
-            return row.iloc[0]['모델명']
-        else:
-            return "(매핑 없음)"
+        return get_registry(model_map_file).name_of(code) or "(매핑 없음)"
     except Exception as e:
         return f"(에러: {e})"
 
@@ -132,6 +97,8 @@ def guess_full_year(last_digit):
 
 def decode_serial(serial):
     try:
+        # 체크 문자부터 확인해서 잘못된 시리얼은 모델 조회 전에 걸러낸다
+        serial = strip_check(serial)
         maker_code = serial[0:2]
         category_code = serial[2:4]
         model_code = serial[4:6]
@@ -140,15 +107,9 @@ def decode_serial(serial):
         order = serial[8:10]
         sequence = serial[10:]
 
-        rev_maker = {v: k for k, v in maker_dict.items()}
-        rev_category = {v: k for k, v in category_dict.items()}
-        rev_alpha = {v: k for k, v in alpha_dict.items() if len(k) == 1}
-
         year_digit = rev_alpha.get(year_alpha, None)
         full_year = guess_full_year(year_digit) if year_digit else 'Unknown'
-        month = rev_alpha.get(month_alpha, 'Unknown')
-        if isinstance(month, str) and month.isdigit():
-            month = month.zfill(2)
+        month = rev_month.get(month_alpha, 'Unknown')
 
         model_name = lookup_model_name(model_code)
 
@@ -190,12 +151,18 @@ category_dict = {
     "헤어 드라이기": "MS"
 }
 
+# 시리얼 해석용 역방향 사전 (호출마다 만들지 않고 한 번만 만든다)
+rev_maker = {v: k for k, v in maker_dict.items()}
+rev_category = {v: k for k, v in category_dict.items()}
+rev_alpha = {v: k for k, v in alpha_dict.items() if len(k) == 1}
+rev_month = {v: k.zfill(2) for k, v in alpha_dict.items() if k != '0'}
+
 # 전체 GUI 앱 클래스 및 실행
 class SerialApp(ctk.CTk):
     def __init__(self):
         super().__init__()
         self.title("시리얼넘버 생성기")
-        self.geometry("600x800")
+        self.geometry("600x900")
         self.build_ui()
 
     def build_ui(self):
@@ -226,11 +193,24 @@ class SerialApp(ctk.CTk):
         self.generate_btn = ctk.CTkButton(button_frame, text="시리얼 넘버 생성", command=self.generate_serials)
         self.generate_btn.pack(side="left", padx=(0, 10))
 
+        self.cancel_btn = ctk.CTkButton(button_frame, text="취소", command=self.cancel_job, state="disabled", width=80)
+        self.cancel_btn.pack(side="left", padx=(0, 10))
+
         self.open_folder_btn = ctk.CTkButton(button_frame, text="저장 위치 열기", command=self.open_saved_folder, state="disabled")
         self.open_folder_btn.pack(side="left")
 
-        self.output_box = ctk.CTkTextbox(container, height=200)
-        self.output_box.pack(fill="both", pady=(10,10))
+        self.progress_bar = ctk.CTkProgressBar(container)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x", pady=(0, 5))
+        self.status_label = ctk.CTkLabel(container, text="")
+        self.status_label.pack(anchor="w")
+
+        # 생성된 시리얼은 보이는 줄만 그리는 목록에, 저장 결과/해석 결과는 아래 텍스트 상자에 표시한다
+        self.serial_view = SerialListView(container, rows=8)
+        self.serial_view.pack(fill="both", pady=(10, 5))
+
+        self.output_box = ctk.CTkTextbox(container, height=100)
+        self.output_box.pack(fill="both", pady=(5,10))
 
         decode_frame = ctk.CTkFrame(container)
         decode_frame.pack(anchor="w", pady=(5, 10), fill="x")
@@ -264,8 +244,6 @@ class SerialApp(ctk.CTk):
         self.output_box.insert("end", result + "\n")
 
     def generate_serials(self):
-        global last_saved_file
-
         maker_name = self.maker_menu.get()
         category_name = self.category_menu.get()
         model = self.entry_model.get().strip()
@@ -299,15 +277,10 @@ class SerialApp(ctk.CTk):
             maker_code = maker_dict[maker_name]
             category_code = category_dict[category_name]
 
-            self.output_box.delete("1.0", "end")
-            records = []
-            serial_list = []
-            for i in range(start_num, end_num + 1):
-                seq = str(i).zfill(5)
-                serial = generate_serial(maker_code, category_code, model_code, year, month, order, seq)
-                generate_barcode(serial)
-                self.output_box.insert("end", serial + "\n")
-                records.append({
+            serial_list = SerialRange(maker_code, category_code, model_code, year, month, order, start_num, end_num, check=serial_check)
+
+            def order_records():
+                return ({
                     "시리얼넘버": serial,
                     "제조사": maker_name,
                     "제품 카테고리": category_name,
@@ -315,27 +288,149 @@ class SerialApp(ctk.CTk):
                     "제조년도": year,
                     "제조월": month,
                     "주문차수": order,
-                    "생산순서": seq
-                })
-                serial_list.append(serial)
-
-            excel_path = save_to_excel(records)
-            last_saved_file = excel_path
-            self.output_box.insert("end", f"\n[엑셀 저장 완료] {excel_path}\n")
-
-            if len(serial_list) >= 3:
-                zip_path = zip_svg_files(serial_list, model, year, month, order)
-                self.output_box.insert("end", f"[압축 완료] {zip_path}\n")
-                last_saved_file = zip_path
-
-            self.open_folder_btn.configure(state="normal", fg_color="#009b77")
-            tkinter.messagebox.showinfo("생성 완료", f"총 {len(serial_list)}개의 시리얼 넘버가 생성되었습니다.")
+                    "생산순서": serial_list.seq_of(serial)
+                } for serial in serial_list)
+
+            # 라벨지 한 장 / 3개 이상이면 ZIP / 그보다 적으면 SVG 파일
+            if printer_output:
+                output, output_path = printer_output, order_filename(model, year, month, order, "." + printer_output)
+            elif merge_svgs_checked:
+                output, output_path = "sheet", order_filename(model, year, month, order, "_sheet.svg")
+            elif len(serial_list) >= 3:
+                output, output_path = "zip", order_filename(model, year, month, order, ".zip")
+            else:
+                output, output_path = "svg", None
+            job = {
+                "serials": serial_list,
+                "records": order_records,
+                "source": "gui",
+                "excel_file": excel_filename(),
+                "output": output,
+                "output_path": output_path,
+                "label_options": LABEL_OPTIONS,
+                "printer_options": {"dpi": printer_dpi},
+                "render_workers": render_workers,
+                "zip_compression": zip_compression,
+                "zip_level": zip_level,
+                # CLI 카운터가 이 구간을 다시 나눠주지 않도록 기록한다
+                "mark_used": (start_num, end_num),
+            }
 
         except ValueError as ve:
             tkinter.messagebox.showerror("입력 오류", str(ve))
+            return
         except Exception as e:
             tkinter.messagebox.showerror("에러", str(e))
+            return
+
+        self.start_job(job, serial_list)
+
+    def start_job(self, job, serial_list):
+        # 무거운 작업은 작업 스레드에서 돌리고, 화면은 큐를 after() 로 읽어서 갱신한다
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.job_serials = serial_list
+        self.job_output = job["output"]
+        self.job_started = time.perf_counter()
+        self.output_box.delete("1.0", "end")
+        self.serial_view.clear()
+        self.progress_bar.set(0)
+        self.status_label.configure(text="준비 중...")
+        self.generate_btn.configure(state="disabled")
+        self.cancel_btn.configure(state="normal")
+        threading.Thread(target=self.run_job, args=(job,), daemon=True).start()
+        self.after(100, self.poll_job)
+
+    def run_job(self, job):
+        # 작업 스레드. Tk 위젯은 건드리지 않고 큐로만 알린다
+        def progress(stage, done, total):
+            self.events.put(("progress", stage, done, total))
+
+        try:
+            capture = ProfileCapture(profile_run, trace_memory)
+            with capture:
+                result = run_order(job, progress, self.cancel_event)
+            base = artifact_base(result["outputs"], excel_filename())
+            result["artifacts"] = capture.save(base) if capture.enabled else []
+            if run_report:
+                result["artifacts"].append(write_run_report(report_path(base), result["metrics"]))
+            self.events.put(("done", result))
+        except JobCancelled as e:
+            self.events.put(("cancelled", str(e)))
+        except ValueError as e:
+            self.events.put(("invalid", str(e)))
+        except Exception as e:
+            self.events.put(("error", str(e)))
+
+    def poll_job(self):
+        latest = None
+        finished = None
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress":
+                latest = event
+            else:
+                finished = event
+        if latest:
+            _, stage, done, total = latest
+            elapsed = time.perf_counter() - self.job_started
+            rate = done / elapsed if elapsed > 0 else 0
+            self.progress_bar.set(done / total if total else 1)
+            self.status_label.configure(text=f"{stage} {done}/{total} ({rate:,.0f}개/초)")
+        if finished:
+            self.finish_job(finished)
+        else:
+            self.after(100, self.poll_job)
+
+    def cancel_job(self):
+        self.cancel_event.set()
+        self.cancel_btn.configure(state="disabled")
+        self.status_label.configure(text="취소 중...")
+
+    def finish_job(self, event):
+        global last_saved_file
+
+        self.generate_btn.configure(state="normal")
+        self.cancel_btn.configure(state="disabled")
+        kind = event[0]
+        if kind == "cancelled":
+            self.progress_bar.set(0)
+            self.status_label.configure(text="취소됨 (만들던 파일은 지웠습니다)")
+            tkinter.messagebox.showinfo("취소", event[1])
+            return
+        if kind != "done":
+            self.status_label.configure(text="")
+            tkinter.messagebox.showerror("입력 오류" if kind == "invalid" else "에러", event[1])
+            return
+
+        result = event[1]
+        self.status_label.configure(
+            text=f"완료: {result['count']}개, {result['elapsed']:.1f}초 ({result['count'] / max(result['elapsed'], 1e-9):,.0f}개/초)")
+        self.serial_view.set_items(self.job_serials)
+        for line in summary_lines(result["metrics"]):
+            self.output_box.insert("end", line + "\n")
+        for path in result["artifacts"]:
+            self.output_box.insert("end", f"[분석 파일] {path}\n")
+        if result["resumed"]:
+            self.output_box.insert("end", "[이어서 완료] 지난번에 중단된 작업에서 만든 파일을 이어서 썼습니다.\n")
+        if result["excel_path"]:
+            last_saved_file = result["excel_path"]
+            self.output_box.insert("end", f"[엑셀 저장 완료] {result['excel_path']}\n")
+        done_label = {"zip": "[압축 완료]", "sheet": "[시트 저장 완료]", "zpl": "[프린터 파일 완료]", "epl": "[프린터 파일 완료]"}.get(self.job_output)
+        for path in result["outputs"]:
+            last_saved_file = path
+            if done_label:
+                self.output_box.insert("end", f"{done_label} {path}\n")
+
+        self.open_folder_btn.configure(state="normal", fg_color="#009b77")
+        if result["excel_error"]:
+            tkinter.messagebox.showerror("엑셀 저장 오류", result["excel_error"])
+        tkinter.messagebox.showinfo("생성 완료", f"총 {result['count']}개의 시리얼 넘버가 생성되었습니다.")
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     app = SerialApp()
     app.mainloop()
\ No newline at end of file
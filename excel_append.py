@@ -0,0 +1,319 @@
+import datetime
+import os
+import re
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import get_column_letter
+
+# 시트 XML 을 이만큼씩 읽어서 옮긴다
+READ_SIZE = 1 << 20
+# 머리(첫 행까지)가 이보다 길면 직접 붙이지 않고 openpyxl 로 처리한다
+HEAD_LIMIT = 1 << 20
+# 시트 XML 을 다시 압축할 때의 레벨 (기존 행은 그대로 옮기기만 하므로 빠른 쪽으로)
+SHEET_LEVEL = 1
+
+NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "pkg": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+class _Unsupported(Exception):
+    # 직접 붙일 수 없는 모양의 파일 (openpyxl 로 처리한다)
+    pass
+
+def monthly_filename(filename, when=None):
+    # serial_numbers_gui.xlsx -> serial_numbers_gui_2025-04.xlsx
+    when = when or datetime.datetime.now()
+    base, ext = os.path.splitext(filename)
+    return f"{base}_{when:%Y-%m}{ext}"
+
+def _tmp_name(filename):
+    base, ext = os.path.splitext(filename)
+    return f"{base}.part{ext}"
+
+def _save_atomic(wb, filename):
+    # 임시 파일에 다 쓴 뒤 바꿔치기해서, 중간에 멈춰도 반쯤 저장된 엑셀이 남지 않게 한다
+    tmp = _tmp_name(filename)
+    try:
+        wb.save(tmp)
+        os.replace(tmp, filename)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def append_rows(filename, rows, unique=None):
+    # 새 행만 기존 시트 끝에 붙인다 (pandas 로 전체를 읽고 다시 쓰지 않는다).
+    # 파일이 없으면 write-only 모드로 스트리밍해서 새로 만든다.
+    # 있으면 xlsx 안의 시트 XML 끝(</sheetData> 앞)에 새 행을 바로 끼워 넣는다. 기존 행은 읽어서 해석하지 않고
+    # 압축만 풀었다가 다시 묶으므로, 누적 행이 많아도 openpyxl 로 전체를 읽고 쓰는 것보다 수십 배 빠르다.
+    # unique 에 열 이름을 주면 그 값이 이미 시트에 있는 행은 건너뛴다 (중단된 작업을 이어서 할 때, openpyxl 로 처리).
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+
+    if not os.path.exists(filename):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        header = list(first.keys())
+        ws.append(header)
+        count = 0
+        for row in _chain(first, rows):
+            ws.append([row.get(col) for col in header])
+            count += 1
+        _save_atomic(wb, filename)
+        return count
+
+    if unique is None:
+        try:
+            return _append_xml(filename, first, rows)
+        except _Unsupported:
+            pass
+    return _append_openpyxl(filename, first, rows, unique)
+
+def _append_openpyxl(filename, first, rows, unique):
+    wb = load_workbook(filename)
+    ws = wb.active
+    header = [cell.value for cell in next(ws.iter_rows(min_row=1, max_row=1))]
+    while header and header[-1] is None:
+        header.pop()
+    # 기존 시트에 없는 열은 헤더 끝에 추가한다
+    for key in first.keys():
+        if key not in header:
+            ws.cell(row=1, column=len(header) + 1, value=key)
+            header.append(key)
+    rows = _chain(first, rows)
+    if unique in header:
+        col = header.index(unique) + 1
+        existing = {value for (value,) in ws.iter_rows(min_row=2, min_col=col, max_col=col, values_only=True)}
+        rows = (row for row in rows if row.get(unique) not in existing)
+    count = 0
+    for row in rows:
+        ws.append([row.get(col) for col in header])
+        count += 1
+    if count:
+        _save_atomic(wb, filename)
+    return count
+
+def _active_sheet(zf):
+    # 활성 시트 XML 과 공유 문자열 XML 의 ZIP 안 경로
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    shared = None
+    for rel in rels.findall("pkg:Relationship", NS):
+        target = rel.get("Target")
+        target = target.lstrip("/") if target.startswith("/") else "xl/" + target
+        targets[rel.get("Id")] = target
+        if rel.get("Type", "").endswith("/sharedStrings"):
+            shared = target
+    view = workbook.find("main:bookViews/main:workbookView", NS)
+    active = int(view.get("activeTab", 0)) if view is not None else 0
+    sheets = workbook.findall("main:sheets/main:sheet", NS)
+    if active >= len(sheets):
+        raise _Unsupported()
+    return targets[sheets[active].get(f"{{{NS['rel']}}}id")], shared
+
+def _shared_strings(zf, path, wanted):
+    # 공유 문자열 중 wanted 번호만 (헤더는 보통 앞쪽이므로 필요한 번호까지만 읽는다)
+    found = {}
+    if not wanted:
+        return found
+    if path is None:
+        raise _Unsupported()
+    last = max(wanted)
+    index = 0
+    with zf.open(path) as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag != f"{{{NS['main']}}}si":
+                continue
+            if index in wanted:
+                found[index] = "".join(t.text or "" for t in elem.iter(f"{{{NS['main']}}}t"))
+            elem.clear()
+            if index == last:
+                break
+            index += 1
+    return found
+
+def _header(zf, shared_path, row_xml):
+    # 첫 행 XML 에서 (열 번호 -> 이름)
+    # 엑셀이 붙이는 x14ac:dyDescent 같은 접두어 속성은 선언 없이 따로 읽을 수 없으므로 빼고 읽는다
+    row_xml = re.sub(rb'\s[A-Za-z][\w.-]*:[\w.-]+="[^"]*"', b"", row_xml)
+    row = ElementTree.fromstring(row_xml.decode("utf-8").replace("<row ", f'<row xmlns="{NS["main"]}" ', 1))
+    cells = []
+    wanted = set()
+    for c in row.findall("main:c", NS):
+        ref = re.match(r"([A-Z]+)\d+$", c.get("r", ""))
+        if ref is None:
+            raise _Unsupported()
+        kind = c.get("t")
+        v = c.find("main:v", NS)
+        if kind == "inlineStr":
+            value = "".join(t.text or "" for t in c.iter(f"{{{NS['main']}}}t"))
+        elif kind == "s":
+            value = int(v.text)
+            wanted.add(value)
+        elif v is not None:
+            value = v.text
+        else:
+            continue
+        cells.append((_column_index(ref.group(1)), kind, value))
+    strings = _shared_strings(zf, shared_path, wanted)
+    header = {}
+    for col, kind, value in cells:
+        header[col] = strings[value] if kind == "s" else value
+    return header
+
+def _column_index(letters):
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - 64
+    return index
+
+def _cell_xml(ref, value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}" t="n"><v>{value}</v></c>'
+    text = escape(str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c r="{ref}" t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+def _row_xml(r, values):
+    cells = "".join(_cell_xml(f"{get_column_letter(i)}{r}", value) for i, value in enumerate(values, start=1))
+    return f'<row r="{r}">{cells}</row>'
+
+def _last_row(zf, sheet):
+    # 시트 끝 부분에서 마지막 행 번호를 찾는다 (행은 </sheetData> 바로 앞에 있다)
+    tail = b""
+    with zf.open(sheet) as f:
+        while True:
+            chunk = f.read(READ_SIZE)
+            if not chunk:
+                break
+            tail = tail[-READ_SIZE:] + chunk
+    end = tail.rfind(b"</sheetData>")
+    if end < 0 or b"<tableParts" in tail[end:]:
+        # 표(table) 가 있으면 표 범위도 고쳐야 하므로 직접 붙이지 않는다
+        raise _Unsupported()
+    start = tail.rfind(b"<row ", 0, end)
+    match = re.match(rb'<row [^>]*?\br="(\d+)"', tail[start:end]) if start >= 0 else None
+    if match is None:
+        raise _Unsupported()
+    return int(match.group(1))
+
+def _read_head(src):
+    # 첫 행이 끝날 때까지 읽는다 -> (머리, 첫 행의 시작/끝 위치)
+    head = b""
+    while len(head) < HEAD_LIMIT:
+        chunk = src.read(READ_SIZE)
+        if not chunk:
+            break
+        head += chunk
+        data = head.find(b"<sheetData>")
+        if data >= 0:
+            start = data + len(b"<sheetData>")
+            end = head.find(b"</row>", start)
+            if end >= 0:
+                if not head.startswith(b'<row r="1"', start):
+                    raise _Unsupported()
+                return head, start, end + len(b"</row>")
+    raise _Unsupported()
+
+def _append_xml(filename, first, rows):
+    tmp = _tmp_name(filename)
+    with zipfile.ZipFile(filename) as zf, tempfile.TemporaryFile() as spool:
+        try:
+            sheet, shared = _active_sheet(zf)
+            last = _last_row(zf, sheet)
+            with zf.open(sheet) as src:
+                head, row_start, row_end = _read_head(src)
+            header = _header(zf, shared, head[row_start:row_end])
+        except (KeyError, ValueError, ElementTree.ParseError):
+            raise _Unsupported() from None
+        width = max(header, default=0)
+        names = [header.get(col) for col in range(1, width + 1)]
+        while names and names[-1] is None:
+            names.pop()
+        # 기존 시트에 없는 열은 헤더 끝에 추가한다
+        added = [key for key in first.keys() if key not in names]
+        columns = names + added
+
+        head_size = len(head)
+        # 새 행은 먼저 임시 파일에 써 두고 개수를 센다 (dimension 을 맞추려면 앞에서 알아야 한다)
+        count = 0
+        for row in _chain(first, rows):
+            count += 1
+            spool.write(_row_xml(last + count, [row.get(col) for col in columns]).encode("utf-8"))
+        spool.seek(0)
+
+        if added:
+            cells = "".join(_cell_xml(f"{get_column_letter(len(names) + i)}1", key) for i, key in enumerate(added, start=1))
+            head = head[:row_end - len(b"</row>")] + cells.encode("utf-8") + head[row_end - len(b"</row>"):]
+        head = re.sub(rb'<dimension ref="[^"]*"\s*/>',
+                      f'<dimension ref="A1:{get_column_letter(max(len(columns), 1))}{last + count}"/>'.encode(), head, count=1)
+
+        try:
+            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=SHEET_LEVEL) as out:
+                for info in zf.infolist():
+                    if info.filename == sheet:
+                        with zf.open(info) as src, out.open(sheet, "w", force_zip64=True) as dst:
+                            _copy_sheet(src, dst, head, head_size, spool)
+                        continue
+                    # 나머지 항목(스타일, 공유 문자열 등)은 내용 그대로 옮긴다
+                    target = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                    target.compress_type = info.compress_type
+                    target.external_attr = info.external_attr
+                    out.writestr(target, zf.read(info))
+            os.replace(tmp, filename)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return count
+
+def _copy_sheet(src, dst, head, head_size, spool):
+    # 머리(고친 것)를 쓰고, 원래 머리 다음부터 옮기다가 </sheetData> 앞에 새 행을 넣는다
+    _skip(src, head_size)
+    marker = b"</sheetData>"
+    buffer = head
+    while True:
+        at = buffer.find(marker)
+        if at >= 0:
+            dst.write(buffer[:at])
+            while True:
+                chunk = spool.read(READ_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+            dst.write(buffer[at:])
+            break
+        chunk = src.read(READ_SIZE)
+        if not chunk:
+            # _last_row 에서 확인했으므로 여기까지 오면 파일이 그 사이에 바뀐 것이다
+            raise ValueError(f"엑셀 시트 XML 의 끝을 찾을 수 없습니다: {getattr(src, 'name', '')}")
+        # 표시가 두 조각에 걸칠 수 있으므로 끝부분은 남겨 둔다
+        keep = len(marker) - 1
+        dst.write(buffer[:-keep])
+        buffer = buffer[-keep:] + chunk
+    while True:
+        chunk = src.read(READ_SIZE)
+        if not chunk:
+            break
+        dst.write(chunk)
+
+def _skip(src, size):
+    while size > 0:
+        chunk = src.read(min(size, READ_SIZE))
+        if not chunk:
+            break
+        size -= len(chunk)
+
+def _chain(first, rest):
+    yield first
+    yield from rest
@@ -0,0 +1,106 @@
+from barcode_render import label_render_options
+from code128_svg import DEFAULT_OPTIONS, STOP, encode
+
+# 열전사(Zebra 계열) 프린터로 바로 보내는 출력 설정.
+# 바 폭/높이/여백은 SVG 와 같은 라벨 옵션(mm, label_render_options)을 dpi 에 맞춰 도트로 바꿔서 쓴다
+PRINTER_OPTIONS = {
+    "language": "zpl",   # "zpl" / "epl" (구형 Eltron/Zebra LP 계열)
+    "dpi": 203,          # 8 dots/mm. 300dpi 프린터면 300
+    "copies": 1,         # 라벨 하나당 인쇄 매수
+}
+
+PRINTER_LANGUAGES = ("zpl", "epl")
+PT_TO_MM = 0.352777778
+MM_PER_INCH = 25.4
+
+# ZPL ^BC 에 직접 넣는 Code128 문자셋 지정/전환 코드 (SVG 와 같은 심볼이 나오도록 자동 선택을 쓰지 않는다)
+ZPL_START = {103: ">9", 104: ">:", 105: ">;"}
+ZPL_SWITCH = {99: ">5", 100: ">6", 101: ">7"}
+SWITCH_SETS = {99: "C", 100: "B", 101: "A", 103: "A", 104: "B", 105: "C"}
+
+def mm_to_dots(mm, dpi):
+    return round(mm * dpi / MM_PER_INCH)
+
+def label_extension(language):
+    return "." + language
+
+def _zpl_data(code):
+    # encode() 결과를 ZPL ^BC 데이터로 되돌린다 (마지막 체크섬은 프린터가 붙인다)
+    encoded = encode(code)
+    charset = SWITCH_SETS[encoded[0]]
+    parts = [ZPL_START[encoded[0]]]
+    for value in encoded[1:-1]:
+        if value in ZPL_SWITCH:
+            charset = SWITCH_SETS[value]
+            parts.append(ZPL_SWITCH[value])
+        elif charset == "C":
+            parts.append(f"{value:02d}")
+        else:
+            char = chr(value + 32) if value < 64 or charset == "B" else chr(value - 64)
+            # ">" 는 ZPL 에서 전환 코드 시작이라 "><" 로 쓴다
+            parts.append("><" if char == ">" else char)
+    return "".join(parts), len(encoded)
+
+class LabelPrinterRenderer:
+    # 옵션별로 한 번만 만들어 두고 render() 를 반복 호출한다. 라벨 하나가 수백 바이트의 명령 텍스트다.
+    def __init__(self, options=None, printer=None):
+        opts = dict(DEFAULT_OPTIONS)
+        opts.update(options or {})
+        printer = dict(PRINTER_OPTIONS, **(printer or {}))
+        if printer["language"] not in PRINTER_LANGUAGES:
+            raise ValueError(f"지원하지 않는 프린터 언어입니다: {printer['language']}")
+        dpi = printer["dpi"]
+        self.language = printer["language"]
+        self.copies = printer["copies"]
+        # 프린터의 바 폭은 1~10 도트
+        self.module = min(10, max(1, mm_to_dots(opts["module_width"], dpi)))
+        self.bar_height = max(1, mm_to_dots(opts["module_height"], dpi))
+        self.quiet = mm_to_dots(opts["quiet_zone"], dpi)
+        self.margin_top = mm_to_dots(opts["margin_top"], dpi)
+        self.margin_bottom = mm_to_dots(opts["margin_bottom"], dpi)
+        self.write_text = opts["write_text"]
+        self.font = max(1, mm_to_dots(opts["font_size"] * PT_TO_MM, dpi)) if opts["font_size"] else 0
+        self.text_gap = mm_to_dots(opts["text_distance"], dpi)
+        self.height = self.margin_top + self.bar_height + self.margin_bottom
+        if self.write_text and self.font:
+            self.height += self.text_gap + self.font
+
+    def width(self, symbols):
+        # 심볼 하나는 11 모듈, STOP 은 13 모듈
+        return (symbols * 11 + len(STOP)) * self.module
+
+    def render(self, code):
+        return self.render_zpl(code) if self.language == "zpl" else self.render_epl(code)
+
+    def render_zpl(self, code):
+        data, symbols = _zpl_data(code)
+        bars = self.width(symbols)
+        parts = [
+            f"^XA^PW{bars + 2 * self.quiet}^LL{self.height}^LH0,0",
+            f"^FO{self.quiet},{self.margin_top}^BY{self.module}^BCN,{self.bar_height},N,N,N,N^FD{data}^FS",
+        ]
+        if self.write_text and self.font:
+            # ^BC 의 글자 줄은 위치를 못 정하므로 text_distance 를 맞추려고 따로 가운데 정렬해서 쓴다
+            parts.append(f"^FO{self.quiet},{self.margin_top + self.bar_height + self.text_gap}"
+                         f"^A0N,{self.font},{self.font}^FB{bars},1,0,C^FD{code}^FS")
+        if self.copies > 1:
+            parts.append(f"^PQ{self.copies}")
+        parts.append("^XZ\n")
+        return "".join(parts).encode("ascii")
+
+    def render_epl(self, code):
+        # EPL 은 Code128 문자셋을 프린터가 고르고 (B 명령 종류 1), 글자는 바코드 아래 기본 글꼴로 찍는다
+        symbols = len(encode(code))
+        text = "B" if self.write_text else "N"
+        data = code.replace("\\", "\\\\").replace('"', '\\"')
+        return (
+            f"\nN\nq{self.width(symbols) + 2 * self.quiet}\nQ{self.height},24\n"
+            f'B{self.quiet},{self.margin_top},0,1,{self.module},{self.module},{self.bar_height},{text},"{data}"\n'
+            f"P{self.copies}\n"
+        ).encode("ascii")
+
+def render_labels(serials, options=None, printer=None):
+    # (시리얼, 프린터 명령 bytes) 를 입력 순서대로 돌려준다. 렌더링이 가벼워서 워커 프로세스를 쓰지 않는다
+    renderer = LabelPrinterRenderer(label_render_options(options), printer)
+    for serial in serials:
+        yield serial, renderer.render(serial)
@@ -0,0 +1,57 @@
+class InMemoryWorksheet:
+    # gspread Worksheet 중 이 프로젝트에서 쓰는 메서드만 흉내 낸 메모리 시트 (로컬 시험/벤치마크용).
+    # errors 에 예외를 넣어두면 다음 쓰기 호출부터 하나씩 꺼내서 던진다.
+    # 예외 대신 (예외, True) 를 넣으면 쓰기를 반영한 뒤에 던진다 (응답만 잃어버린 5xx/연결 끊김 흉내).
+    def __init__(self, header=None, rows=None):
+        self.rows = []
+        if header:
+            self.rows.append(list(header))
+        self.rows.extend(list(row) for row in rows or [])
+        self.errors = []
+        self.calls = 0
+
+    def _maybe_fail(self, write):
+        self.calls += 1
+        error = self.errors.pop(0) if self.errors else None
+        applied = isinstance(error, tuple) and error[1]
+        if isinstance(error, tuple):
+            error = error[0]
+        if error is not None and not applied:
+            raise error
+        write()
+        if error is not None:
+            raise error
+
+    @property
+    def row_count(self):
+        return len(self.rows)
+
+    def append_row(self, values, **kwargs):
+        self._maybe_fail(lambda: self.rows.append(list(values)))
+
+    def append_rows(self, values, **kwargs):
+        self._maybe_fail(lambda: self.rows.extend(list(row) for row in values))
+
+    def row_values(self, row):
+        # gspread 와 같이 1부터 센다
+        if 1 <= row <= len(self.rows):
+            return list(self.rows[row - 1])
+        return []
+
+    def get_values(self, range_name=None, **kwargs):
+        # "A5:H" 처럼 시작 행만 의미 있게 처리한다 (열 범위는 무시)
+        start = 1
+        if range_name:
+            first = range_name.split(":")[0].split("!")[-1]
+            digits = "".join(c for c in first if c.isdigit())
+            start = int(digits) if digits else 1
+        return [list(row) for row in self.rows[start - 1:]]
+
+    def get_all_values(self, **kwargs):
+        return self.get_values()
+
+    def get_all_records(self, **kwargs):
+        if not self.rows:
+            return []
+        header = self.rows[0]
+        return [dict(zip(header, row + [""] * (len(header) - len(row)))) for row in self.rows[1:]]
@@ -0,0 +1,116 @@
+import csv
+import hashlib
+import os
+
+# 모델 코드는 AA~ZZ 두 글자 (26 * 26 = 676개)
+CODE_SPACE = 676
+MODEL_MAP_FILE = "model_map.csv"
+MODEL_MAP_HEADER = ["모델코드", "모델명"]
+
+def model_to_number(model_name):
+    model_name = model_name.upper()
+    h = hashlib.sha256(model_name.encode()).hexdigest()
+    return int(h, 16)
+
+def number_to_code(num):
+    num = num % CODE_SPACE
+    first = chr(ord('A') + num // 26)
+    second = chr(ord('A') + num % 26)
+    return first + second
+
+def code_to_number(code):
+    return (ord(code[0]) - ord('A')) * 26 + (ord(code[1]) - ord('A'))
+
+def is_model_code(code):
+    return len(code) == 2 and all('A' <= c <= 'Z' for c in code)
+
+class ModelCodeAllocator:
+    # model_map.csv 를 한 번 읽어서 676칸 비트맵 + 모델명→코드 사전을 유지한다.
+    # 빈 칸 찾기는 "다음 빈 칸" 포인터(경로 압축)로 해서 사실상 O(1) 이다.
+    def __init__(self, path=MODEL_MAP_FILE):
+        self.path = path
+        self.used = bytearray(CODE_SPACE)
+        self._next = list(range(CODE_SPACE))
+        self._free = CODE_SPACE
+        self.codes = {}
+        self._saved = set()
+        self.load()
+
+    def load(self):
+        # 읽지 않고 건너뛴 줄 [(줄 번호, 모델코드, 모델명), ...] (편집기에서 저장 전에 알려준다)
+        self.invalid = []
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                code = (row.get("모델코드") or "").strip().upper()
+                name = (row.get("모델명") or "").strip()
+                if not is_model_code(code) or not name:
+                    self.invalid.append((reader.line_num, row.get("모델코드") or "", row.get("모델명") or ""))
+                    continue
+                self._add(code, name)
+
+    def _add(self, code, name):
+        self._mark(code_to_number(code))
+        self.codes.setdefault(name.upper(), code)
+        self._saved.add((code, name))
+
+    def _mark(self, slot):
+        if not self.used[slot]:
+            self.used[slot] = 1
+            self._next[slot] = (slot + 1) % CODE_SPACE
+            self._free -= 1
+
+    def _find_free(self, slot):
+        root = slot
+        while self.used[root]:
+            root = self._next[root]
+        while slot != root:
+            self._next[slot], slot = root, self._next[slot]
+        return root
+
+    def lookup(self, model_name):
+        return self.codes.get(model_name.upper())
+
+    def allocate(self, model_name):
+        key = model_name.upper()
+        if key in self.codes:
+            return self.codes[key]
+        if self._free == 0:
+            raise Exception("모든 코드가 소진되었습니다! (676개 제한)")
+        slot = self._find_free(model_to_number(key) % CODE_SPACE)
+        self._mark(slot)
+        code = number_to_code(slot)
+        self.codes[key] = code
+        return code
+
+    def save(self, model_name, model_code):
+        # 새 매핑만 파일 끝에 한 줄 추가한다 (전체 재작성 없음)
+        if (model_code, model_name) in self._saved:
+            return
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        if not new_file:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) not in (b"\n", b"\r")
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            if new_file:
+                writer.writerow(MODEL_MAP_HEADER)
+            elif needs_newline:
+                f.write("\n")
+            writer.writerow([model_code, model_name])
+        if is_model_code(model_code):
+            self._add(model_code, model_name)
+        else:
+            self._saved.add((model_code, model_name))
+
+_allocators = {}
+
+def get_allocator(path=MODEL_MAP_FILE):
+    # 프로세스당 한 번만 CSV 를 읽는다
+    key = os.path.abspath(path)
+    if key not in _allocators:
+        _allocators[key] = ModelCodeAllocator(path)
+    return _allocators[key]
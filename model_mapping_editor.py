@@ -1,9 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import pandas as pd
-import os
+from model_code_allocator import is_model_code
+from model_registry import get_registry
 
 CSV_FILE = "model_map.csv"
+# 경고 창에 보여줄 최대 줄 수
+DROPPED_PREVIEW = 20
 
 class ModelMapEditor:
     def __init__(self, root):
@@ -38,10 +40,26 @@ class ModelMapEditor:
 
     def load_data(self):
         self.tree.delete(*self.tree.get_children())
-        if os.path.exists(CSV_FILE):
-            df = pd.read_csv(CSV_FILE)
-            for _, row in df.iterrows():
-                self.tree.insert("", "end", values=(row["모델코드"], row["모델명"]))
+        # 모델코드 -> 트리 항목. 중복 확인을 트리를 훑지 않고 사전으로 한다
+        self.items = {}
+        registry = get_registry(CSV_FILE)
+        registry.refresh()
+        # 트리에 보이지 않는 행 (저장하면 파일에서 없어진다)
+        self.dropped = [f"{line}번째 줄: '{code}' '{name}' (잘못된 행)" for line, code, name in registry.invalid]
+        for code, name in registry.rows:
+            if code in self.items:
+                self.dropped.append(f"'{code}' '{name}' (중복 코드, 첫 줄의 모델명만 씀)")
+                continue
+            self.items[code] = self.tree.insert("", "end", values=(code, name))
+        if self.dropped:
+            messagebox.showwarning("읽지 않은 행", "다음 행은 목록에 표시되지 않습니다. 저장하면 파일에서 삭제됩니다.\n\n"
+                                   + self.dropped_text())
+
+    def dropped_text(self):
+        lines = self.dropped[:DROPPED_PREVIEW]
+        if len(self.dropped) > DROPPED_PREVIEW:
+            lines.append(f"... 외 {len(self.dropped) - DROPPED_PREVIEW}개")
+        return "\n".join(lines)
 
     def add_entry(self):
         code = self.code_entry.get().strip().upper()
@@ -49,11 +67,13 @@ class ModelMapEditor:
         if not code or not name:
             messagebox.showwarning("입력 오류", "모델코드와 모델명을 모두 입력해주세요.")
             return
-        for item in self.tree.get_children():
-            if self.tree.item(item, "values")[0] == code:
-                messagebox.showwarning("중복 코드", "이미 존재하는 모델코드입니다.")
-                return
-        self.tree.insert("", "end", values=(code, name))
+        if not is_model_code(code):
+            messagebox.showwarning("입력 오류", "모델코드는 영문 대문자 두 글자(AA~ZZ)여야 합니다.")
+            return
+        if code in self.items:
+            messagebox.showwarning("중복 코드", "이미 존재하는 모델코드입니다.")
+            return
+        self.items[code] = self.tree.insert("", "end", values=(code, name))
         self.code_entry.delete(0, "end")
         self.name_entry.delete(0, "end")
 
@@ -63,15 +83,19 @@ class ModelMapEditor:
             messagebox.showwarning("선택 없음", "삭제할 항목을 선택해주세요.")
             return
         for item in selected:
+            code = self.tree.item(item, "values")[0]
+            if self.items.get(code) == item:
+                del self.items[code]
             self.tree.delete(item)
 
     def save_data(self):
-        data = []
-        for item in self.tree.get_children():
-            code, name = self.tree.item(item, "values")
-            data.append({"모델코드": code, "모델명": name})
-        df = pd.DataFrame(data)
-        df.to_csv(CSV_FILE, index=False)
+        if self.dropped and not messagebox.askyesno(
+                "저장 확인", f"저장하면 목록에 없는 다음 {len(self.dropped)}개 행이 CSV 파일에서 삭제됩니다. 계속할까요?\n\n"
+                + self.dropped_text()):
+            return
+        rows = [self.tree.item(item, "values") for item in self.tree.get_children()]
+        get_registry(CSV_FILE).replace_all(rows)
+        self.dropped = []
         messagebox.showinfo("저장 완료", "CSV 파일이 저장되었습니다.")
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+import csv
+import os
+from model_code_allocator import CODE_SPACE, MODEL_MAP_FILE, MODEL_MAP_HEADER, ModelCodeAllocator
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+class ModelRegistry(ModelCodeAllocator):
+    # model_map.csv 의 메모리 사본. 모델명→코드(codes)와 코드→모델명(names)을 모두 들고,
+    # 파일의 수정 시각/크기가 바뀐 경우에만 다시 읽는다 (다른 프로그램이나 편집기가 고친 경우).
+    def __init__(self, path=MODEL_MAP_FILE):
+        self.names = {}
+        self.rows = []
+        self.stamp = None
+        super().__init__(path)
+
+    def load(self):
+        self.used = bytearray(CODE_SPACE)
+        self._next = list(range(CODE_SPACE))
+        self._free = CODE_SPACE
+        self.codes = {}
+        self._saved = set()
+        self.names = {}
+        self.rows = []
+        self.stamp = _stamp(self.path)
+        super().load()
+
+    def _add(self, code, name):
+        super()._add(code, name)
+        # 같은 코드가 여러 줄이면 예전처럼 첫 줄의 모델명을 쓴다
+        self.names.setdefault(code, name)
+        self.rows.append((code, name))
+
+    def refresh(self):
+        if _stamp(self.path) != self.stamp:
+            self.load()
+
+    def name_of(self, code):
+        self.refresh()
+        return self.names.get(code)
+
+    def lookup(self, model_name):
+        self.refresh()
+        return super().lookup(model_name)
+
+    def allocate(self, model_name):
+        self.refresh()
+        return super().allocate(model_name)
+
+    def save(self, model_name, model_code):
+        self.refresh()
+        super().save(model_name, model_code)
+        self.stamp = _stamp(self.path)
+
+    def has_code(self, code):
+        self.refresh()
+        return code in self.names
+
+    def replace_all(self, rows):
+        # 편집기에서 삭제/수정까지 반영할 때만 전체를 다시 쓴다 (임시 파일에 쓴 뒤 교체)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(MODEL_MAP_HEADER)
+            writer.writerows(rows)
+        os.replace(tmp, self.path)
+        self.load()
+
+_registries = {}
+
+def get_registry(path=MODEL_MAP_FILE):
+    key = os.path.abspath(path)
+    if key not in _registries:
+        _registries[key] = ModelRegistry(path)
+    return _registries[key]
@@ -0,0 +1,411 @@
+import os
+import shutil
+import time
+from barcode_render import LABEL_OPTIONS, barcode_filename, label_render_options, render_barcodes
+from excel_append import append_rows
+from label_printer import PRINTER_OPTIONS, render_labels
+from run_journal import CHUNK_SIZE, JOURNAL_DIR, open_journal
+from run_metrics import RunMetrics
+from serial_ledger import DuplicateSerialError, get_ledger
+from seq_counter import get_counter
+from svg_sheet import labels_per_page, render_sheets
+from zip_stream import DEFAULT_COMPRESSION, DEFAULT_LEVEL, ParallelZipWriter
+
+# run_order 에 넘기는 작업 설정 기본값
+JOB_DEFAULTS = {
+    "serials": None,          # SerialRange
+    "records": None,          # 엑셀/장부에 넣을 행 dict 를 만드는 함수 (호출할 때마다 새 이터레이터)
+    "source": "",
+    "excel_file": None,       # None 이면 엑셀 저장 안 함
+    "output": "zip",          # "zip" / "svg" (시리얼마다 SVG 파일) / "sheet" (라벨지) / "zpl" / "epl" (프린터 명령 파일) / None
+    "output_path": None,      # zip/sheet/zpl/epl 파일 경로 (sheet 는 여러 페이지면 .zip 으로 바뀐다), svg 는 폴더
+    "outputs": None,          # 여러 형식을 한 번에 만들 때 [(형식, 경로), ...] (output/output_path 대신)
+    "label_options": LABEL_OPTIONS,
+    "printer_options": PRINTER_OPTIONS,  # zpl/epl 출력의 dpi, 매수 (언어는 출력 형식을 따른다)
+    "render_workers": None,
+    "zip_compression": DEFAULT_COMPRESSION,
+    "zip_level": DEFAULT_LEVEL,
+    "mark_used": None,        # (시작, 끝) 을 주면 이 주문(접두어)의 카운터에 사용한 구간으로 기록
+    "journal": JOURNAL_DIR,   # 진행 기록 폴더 (None 이면 기록하지 않음). 중단된 같은 주문을 다시 실행하면 이어서 한다
+    "chunk_size": CHUNK_SIZE, # 진행 기록 단위 (시리얼 개수)
+    "metrics": None,          # RunMetrics (None 이면 새로 만든다). 결과의 "metrics" 로 보고서를 돌려준다
+}
+
+# 진행 상황을 알릴 개수 간격
+PROGRESS_EVERY = 100
+
+class JobCancelled(Exception):
+    pass
+
+class RecoveredOrderError(ValueError):
+    # 지난 실행이 장부 기록까지 마치고 파일을 확정하기 전에 멈춘 주문. 그 파일을 확정했으니 새로 만들지 않는다
+    def __init__(self, paths):
+        self.paths = paths
+        names = ", ".join(paths) or "(없음)"
+        super().__init__(f"이 구간은 지난 실행에서 이미 장부에 기록되었습니다. 그때 만든 파일을 확정했습니다: {names}")
+
+def _part(path):
+    return path + ".part"
+
+class _Staging:
+    # 결과 파일은 모두 ".part" 이름으로 먼저 쓰고, 끝까지 성공했을 때만 제 이름으로 바꾼다.
+    # journal 이 있으면 작업이 중단돼도 ".part" 와 묶음 파일을 남겨서 다음 실행이 이어 쓴다.
+    def __init__(self, journal=None):
+        self.files = []
+        self.journal = journal
+        self.scratch = []
+
+    def add(self, path):
+        self.files.append(path)
+        return _part(path)
+
+    def commit(self):
+        for path in self.files:
+            # 이어서 하는 작업이면 지난번에 이미 바꾼 파일도 있다
+            if os.path.exists(_part(path)) or not os.path.exists(path):
+                os.replace(_part(path), path)
+        self.cleanup()
+        return [os.path.abspath(path) for path in self.files]
+
+    def discard(self):
+        for path in self.files:
+            try:
+                os.remove(_part(path))
+            except FileNotFoundError:
+                pass
+        self.cleanup()
+
+    def cleanup(self):
+        for folder in self.scratch:
+            shutil.rmtree(folder, ignore_errors=True)
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise JobCancelled("작업이 취소되었습니다.")
+
+def _rendered(job, progress, cancel, start=0):
+    # 렌더링 결과를 넘기면서 진행 상황을 알리고 취소 여부를 확인한다 (start 번째 시리얼부터).
+    # 렌더링을 기다린 시간만 "render" 로 재서, 압축/쓰기 시간과 나눠 볼 수 있게 한다
+    serials = job["serials"]
+    metrics = job["metrics"]
+    total = len(serials)
+    done = start
+    if progress:
+        progress("바코드", done, total)
+    rendered = iter(render_barcodes(serials[start:], job["label_options"], workers=job["render_workers"]))
+    while True:
+        waited = metrics.clock()
+        item = next(rendered, None)
+        metrics.add_time("render", metrics.clock() - waited)
+        if item is None:
+            break
+        _check_cancel(cancel)
+        metrics.count("barcodes")
+        metrics.add_bytes("svg", len(item[1]))
+        yield item
+        done += 1
+        if progress and (done % PROGRESS_EVERY == 0 or done == total):
+            progress("바코드", done, total)
+
+def _write_zip(job, path, staging, progress, cancel):
+    if staging.journal is not None:
+        return _write_zip_chunks(job, path, staging, progress, cancel)
+    with ParallelZipWriter(staging.add(path), job["zip_compression"], job["zip_level"]) as zipf:
+        for serial, svg in _rendered(job, progress, cancel):
+            zipf.writestr(barcode_filename(serial), svg)
+
+def _write_zip_chunks(job, path, staging, progress, cancel):
+    # chunk_size 개마다 따로 ZIP 을 만들고 진행 기록에 남긴다. 다 되면 압축을 다시 하지 않고 하나로 합친다
+    journal = staging.journal
+    serials = job["serials"]
+    total = len(serials)
+    chunk_size = journal.header["chunk_size"]
+    folder = path + ".chunks"
+    os.makedirs(folder, exist_ok=True)
+    staging.scratch.append(folder)
+
+    def chunk_path(index):
+        return os.path.join(folder, f"{index:05d}.zip")
+
+    count = (total + chunk_size - 1) // chunk_size
+    index = journal.resume_index(path, total, lambda i: os.path.exists(chunk_path(i)))
+    if index < count:
+        rendered = _rendered(job, progress, cancel, start=index * chunk_size)
+        for index in range(index, count):
+            size = min(chunk_size, total - index * chunk_size)
+            with ParallelZipWriter(_part(chunk_path(index)), job["zip_compression"], job["zip_level"]) as zipf:
+                for _ in range(size):
+                    serial, svg = next(rendered)
+                    zipf.writestr(barcode_filename(serial), svg)
+            os.replace(_part(chunk_path(index)), chunk_path(index))
+            journal.record("chunk", output=path, index=index)
+        rendered.close()
+    elif progress:
+        progress("바코드", total, total)
+    with ParallelZipWriter(staging.add(path), job["zip_compression"], job["zip_level"]) as zipf:
+        for index in range(count):
+            zipf.copy_members(chunk_path(index))
+
+def _write_svgs(job, path, staging, progress, cancel):
+    folder = path or "."
+    os.makedirs(folder, exist_ok=True)
+    journal = staging.journal
+    serials = job["serials"]
+    start = 0
+    if journal is not None:
+        # 기록된 묶음의 파일은 다시 그리지 않고 이름만 올려 둔다 (.part 이거나 이미 바뀐 파일)
+        chunk_size = journal.header["chunk_size"]
+        start = min(journal.resume_index(path, len(serials)) * chunk_size, len(serials))
+        for serial in serials[:start]:
+            staging.add(os.path.join(folder, barcode_filename(serial)))
+    done = start
+    for serial, svg in _rendered(job, progress, cancel, start=start):
+        with open(staging.add(os.path.join(folder, barcode_filename(serial))), "wb") as f:
+            f.write(svg)
+        done += 1
+        if journal is not None and (done % chunk_size == 0 or done == len(serials)):
+            journal.record("chunk", output=path, index=(done - 1) // chunk_size)
+
+def _write_sheets(job, path, staging, progress, cancel):
+    serials = job["serials"]
+    total = len(serials)
+    per_page = labels_per_page()
+    base, _ = os.path.splitext(path)
+    if progress:
+        progress("라벨지", 0, total)
+    pages = render_sheets(serials)
+    if total <= per_page:
+        with open(staging.add(base + ".svg"), "wb") as f:
+            for page in pages:
+                f.write(page)
+    else:
+        with ParallelZipWriter(staging.add(base + ".zip"), job["zip_compression"], job["zip_level"]) as zipf:
+            for i, page in enumerate(pages, start=1):
+                _check_cancel(cancel)
+                zipf.writestr(f"sheet_{i:03d}.svg", page)
+                if progress:
+                    progress("라벨지", min(i * per_page, total), total)
+    if progress:
+        progress("라벨지", total, total)
+
+def _write_labels(job, path, staging, progress, cancel, language):
+    # 바코드를 그리지 않고 프린터의 Code128 명령으로 구간 전체를 파일 하나에 이어 쓴다.
+    # 진행 기록에는 묶음마다 파일 위치를 남겨서, 이어서 할 때는 그 위치까지 자르고 다음 묶음부터 쓴다
+    serials = job["serials"]
+    metrics = job["metrics"]
+    total = len(serials)
+    journal = staging.journal
+    part = staging.add(path)
+    start = 0
+    offset = 0
+    if journal is not None:
+        chunk_size = journal.header["chunk_size"]
+        offsets = {e["index"]: e["offset"] for e in journal.entries if e.get("step") == "chunk" and e.get("output") == path}
+        size = os.path.getsize(part) if os.path.exists(part) else -1
+        index = journal.resume_index(path, total, lambda i: size >= offsets[i])
+        if index:
+            start = min(index * chunk_size, total)
+            offset = offsets[index - 1]
+    printer = dict(job["printer_options"], language=language)
+    done = start
+    if progress:
+        progress("라벨", done, total)
+    with open(part, "r+b" if offset else "wb") as f:
+        f.seek(offset)
+        f.truncate()
+        for serial, label in render_labels(serials[start:], job["label_options"], printer):
+            _check_cancel(cancel)
+            f.write(label)
+            metrics.count("labels")
+            metrics.add_bytes(language, len(label))
+            done += 1
+            if journal is not None and (done % chunk_size == 0 or done == total):
+                f.flush()
+                os.fsync(f.fileno())
+                journal.record("chunk", output=path, index=(done - 1) // chunk_size, offset=f.tell())
+            if progress and (done % PROGRESS_EVERY == 0 or done == total):
+                progress("라벨", done, total)
+
+def _write_zpl(job, path, staging, progress, cancel):
+    _write_labels(job, path, staging, progress, cancel, "zpl")
+
+def _write_epl(job, path, staging, progress, cancel):
+    _write_labels(job, path, staging, progress, cancel, "epl")
+
+OUTPUT_WRITERS = {
+    "zip": _write_zip,
+    "svg": _write_svgs,
+    "sheet": _write_sheets,
+    "zpl": _write_zpl,
+    "epl": _write_epl,
+}
+
+def _stale_files(output, path, prefix):
+    # 중단된 작업이 남겼을 수 있는 임시 파일/폴더 (확정된 결과 파일은 건드리지 않는다)
+    if output == "svg":
+        folder = path or "."
+        try:
+            names = os.listdir(folder)
+        except FileNotFoundError:
+            return []
+        head = barcode_filename(prefix)[:-len(".svg")]
+        return [os.path.join(folder, name) for name in names if name.startswith(head) and name.endswith(".svg.part")]
+    if output == "sheet":
+        base, _ = os.path.splitext(path)
+        return [_part(base + ".svg"), _part(base + ".zip")]
+    return [_part(path), path + ".chunks"]
+
+def _commit_stale(header, serials):
+    # 장부까지 들어간 지난 작업의 임시 파일은 모두 다 쓴 것이므로 제 이름으로 바꾼다
+    committed = []
+    for output, path in header.get("outputs", []):
+        if output == "svg":
+            folder = path or "."
+            finals = [os.path.join(folder, barcode_filename(serial)) for serial in serials]
+        elif output == "sheet":
+            base, _ = os.path.splitext(path)
+            finals = [base + ".svg", base + ".zip"]
+        else:
+            finals = [path]
+        for final in finals:
+            if os.path.exists(_part(final)):
+                os.replace(_part(final), final)
+            if os.path.exists(final):
+                committed.append(os.path.abspath(final))
+    _discard_stale(header)
+    return committed
+
+def _discard_stale(header):
+    for output, path in header.get("outputs", []):
+        for stale in _stale_files(output, path, header["prefix"]):
+            if os.path.isdir(stale):
+                shutil.rmtree(stale, ignore_errors=True)
+            else:
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+
+def job_outputs(job):
+    outputs = job["outputs"]
+    if outputs is None:
+        outputs = [(job["output"], job["output_path"])] if job["output"] else []
+    for output, _ in outputs:
+        if output not in OUTPUT_WRITERS:
+            raise ValueError(f"지원하지 않는 출력 방식입니다: {output}")
+    return outputs
+
+def run_order(job, progress=None, cancel=None):
+    # 한 주문을 처리한다: 중복 확인 -> 바코드/라벨지 (임시 파일) -> 장부 기록 -> 임시 파일 확정 -> 엑셀.
+    # progress(단계, 완료 개수, 전체 개수) 로 진행 상황을 알리고, cancel(threading.Event) 이 켜지면
+    # 장부 기록 전까지는 언제든 멈추고 임시 파일을 지운 뒤 JobCancelled 를 던진다.
+    # journal 폴더가 있으면 끝난 단계를 기록해 두고, 프로그램이 죽은 뒤 같은 주문을 다시 실행하면
+    # 이미 만든 묶음은 건너뛰고 장부/엑셀은 두 번 넣지 않는다.
+    job = dict(JOB_DEFAULTS, **job)
+    serials = job["serials"]
+    total = len(serials)
+    started = time.perf_counter()
+    ledger = get_ledger()
+    outputs = job_outputs(job)
+    journal = None
+    if job["journal"]:
+        journal = open_journal(serials, outputs, job["journal"], job["chunk_size"],
+                               label_render_options(job["label_options"]), job["printer_options"])
+        if journal.stale and journal.stale_has("ledger"):
+            # 지난 실행이 장부에 넣은 뒤 멈췄고, 이번에는 다른 파일 이름/옵션으로 실행한 경우:
+            # 지우면 장부에만 있고 파일은 없는 번호가 되므로, 지난번 파일을 확정하고 엑셀까지 마친 뒤 알린다
+            committed = _commit_stale(journal.stale, serials)
+            if job["excel_file"] and not journal.stale_has("excel"):
+                append_rows(job["excel_file"], job["records"](), unique="시리얼넘버")
+            journal.close()
+            raise RecoveredOrderError(committed)
+    staging = _Staging(journal)
+    metrics = job["metrics"] = job["metrics"] or RunMetrics()
+    metrics.count("serials", total)
+    try:
+        if progress:
+            progress("확인", 0, total)
+        if not (journal and journal.has("checked")):
+            with metrics.stage("check"):
+                duplicate = ledger.first_existing(serials)
+            if duplicate:
+                raise DuplicateSerialError(duplicate)
+            if journal:
+                journal.record("checked")
+        if journal and journal.stale:
+            # 같은 구간을 다른 형식/경로/옵션으로 다시 만드는 경우: 지난번 임시 파일은 이어 쓰지 않고 지운다.
+            # 중복 확인을 통과한 뒤에만 지운다 (장부에 있는 번호의 파일일 수 있다)
+            _discard_stale(journal.stale)
+        if job["mark_used"]:
+            # 바코드를 만들기 전에 기록해서, 다른 작업이 빌려 간 번호면 파일을 만들기 전에 멈춘다
+            get_counter(serials.prefix).mark_used(*job["mark_used"])
+
+        for output, path in outputs:
+            # 렌더링은 따로 재므로 출력 단계 시간에서는 뺀다 (zip = 압축/쓰기만)
+            render_before = metrics.stages.get("render", 0.0)
+            started_output = metrics.clock()
+            try:
+                OUTPUT_WRITERS[output](job, path, staging, progress, cancel)
+            finally:
+                rendering = metrics.stages.get("render", 0.0) - render_before
+                metrics.add_time(output, metrics.clock() - started_output - rendering)
+        _check_cancel(cancel)
+
+        # 여기부터는 취소하지 않는다 (장부에 들어간 주문은 엑셀/파일까지 끝까지 남긴다)
+        if progress:
+            progress("저장", 0, total)
+        if not (journal and journal.has("ledger")):
+            with metrics.stage("ledger"):
+                try:
+                    ledger.insert_order(job["records"](), source=job["source"])
+                except DuplicateSerialError:
+                    # 장부는 주문 단위 트랜잭션이라, 이어서 하는 작업에서 처음과 끝이 있으면 지난번에 들어간 것이다
+                    if not (journal and journal.resumed and ledger.exists(serials[0]) and ledger.exists(serials[-1])):
+                        raise
+            if journal:
+                journal.record("ledger")
+    except (JobCancelled, DuplicateSerialError):
+        staging.discard()
+        if journal:
+            journal.close()
+        raise
+    except BaseException:
+        # 진행 기록이 있으면 만든 파일을 남겨 두고 다음 실행에서 이어서 한다
+        if journal is None:
+            staging.discard()
+        raise
+
+    with metrics.stage("commit"):
+        outputs = staging.commit()
+    for path in outputs:
+        metrics.add_file("output", path)
+    excel_path = None
+    excel_error = None
+    if job["excel_file"]:
+        # 엑셀은 장부의 사본이므로 여기서 실패해도 장부와 바코드 파일은 그대로 두고 오류만 알린다
+        try:
+            if not (journal and journal.has("excel")):
+                # 이어서 하는 작업이면 지난번에 이미 붙인 행은 건너뛴다
+                unique = "시리얼넘버" if journal and journal.resumed else None
+                with metrics.stage("excel"):
+                    metrics.count("excel_rows", append_rows(job["excel_file"], job["records"](), unique=unique))
+                if journal:
+                    journal.record("excel")
+                metrics.add_file("excel", job["excel_file"])
+            excel_path = os.path.abspath(job["excel_file"])
+        except OSError as e:
+            excel_error = f"엑셀 파일을 저장할 수 없습니다 ('{job['excel_file']}' 파일이 열려 있으면 닫아주세요): {e}"
+    resumed = bool(journal and journal.resumed)
+    if journal:
+        journal.close()
+    if progress:
+        progress("완료", total, total)
+    return {
+        "count": total,
+        "excel_path": excel_path,
+        "excel_error": excel_error,
+        "outputs": outputs,
+        "resumed": resumed,
+        "elapsed": time.perf_counter() - started,
+        "metrics": metrics.finish().report(),
+    }
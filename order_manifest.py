@@ -0,0 +1,197 @@
+import argparse
+import concurrent.futures
+import csv
+import datetime
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from auto_serial_barcode import (EXIT_DUPLICATE, EXIT_ERROR, EXIT_EXCEL, EXIT_INVALID, EXIT_OK, OUTPUT_FORMATS,
+                                 build_job, plan_order, release_order)
+from excel_append import append_rows
+from order_job import run_order
+from seq_counter import get_counter
+from serial_ledger import DuplicateSerialError
+
+# 매니페스트 한 줄(주문 하나)에 쓸 수 있는 열. start/end 또는 quantity 중 하나는 있어야 한다
+MANIFEST_COLUMNS = ["maker", "category", "model", "year", "month", "order", "quantity", "start", "end", "format", "check"]
+
+SUMMARY_COLUMNS = ["job", "status", "exit_code", "model", "model_code", "count", "first_serial", "last_serial",
+                   "bundle", "elapsed", "error"]
+
+def read_manifest(path):
+    # CSV (머리글 = MANIFEST_COLUMNS), JSON 배열, 또는 한 줄에 하나씩 JSON
+    with open(path, "r", encoding="utf-8-sig") as f:
+        if path.endswith(".csv"):
+            rows = [row for row in csv.DictReader(f) if any((v or "").strip() for v in row.values())]
+        else:
+            text = f.read().strip()
+            if text.startswith("["):
+                rows = json.loads(text)
+            else:
+                rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    specs = []
+    for row in rows:
+        spec = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k and v not in (None, "")}
+        fmt = spec.pop("format", None)
+        if fmt:
+            # CSV 에서는 "zip;sheet" 처럼 여러 형식을 적을 수 있다
+            spec["formats"] = re.split(r"[;|, ]+", fmt) if isinstance(fmt, str) else list(fmt)
+        if isinstance(spec.get("check"), str):
+            spec["check"] = spec["check"].lower() in ("1", "true", "y", "yes")
+        specs.append(spec)
+    return specs
+
+def bundle_name(index, fields):
+    model = re.sub(r'[\\/:*?"<>| ]+', "_", fields["모델명"])
+    return f"{index:03d}_{model}_{fields['제조년도']}{fields['제조월'].zfill(2)}_{fields['주문차수']}"
+
+def _run_job(index, job):
+    # 작업 프로세스에서 실행한다. 예외는 프로세스 사이로 넘기지 않고 상태로 바꿔서 돌려준다
+    started = time.perf_counter()
+    try:
+        result = run_order(job)
+        status = {"status": "ok", "exit_code": EXIT_OK, "result": result}
+    except DuplicateSerialError as e:
+        status = {"status": "duplicate", "exit_code": EXIT_DUPLICATE, "error": str(e)}
+    except (ValueError, KeyError) as e:
+        status = {"status": "invalid", "exit_code": EXIT_INVALID, "error": str(e)}
+    except Exception as e:
+        status = {"status": "error", "exit_code": EXIT_ERROR, "error": f"{type(e).__name__}: {e}"}
+    status["job"] = index
+    status["elapsed"] = time.perf_counter() - started
+    return status
+
+def pool_size(workers, jobs):
+    return max(1, min(workers or os.cpu_count() or 1, os.cpu_count() or 1, jobs))
+
+def run_manifest(specs, output_dir, defaults=None, workers=None, log=None):
+    # 모델 코드/생산순서 할당과 엑셀 기록은 이 프로세스에서 차례로 하고 (공유 파일이라서),
+    # 바코드 렌더링과 묶음 파일 쓰기는 작업 프로세스들에 나눠 맡긴다.
+    defaults = defaults or {}
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    summary = [None] * len(specs)
+    planned = {}
+    for index, spec in enumerate(specs, start=1):
+        params = dict(defaults, **spec)
+        serial_list = None
+        try:
+            fields, serial_list, mark_used = plan_order(params)
+            # 직접 정한 범위는 작업을 나눠주기 전에 주문 카운터에 기록한다 (다른 작업이 빌려 간 번호면 여기서 걸린다)
+            if mark_used:
+                get_counter(serial_list.prefix).mark_used(*mark_used)
+            bundle = os.path.join(output_dir, bundle_name(index, fields))
+            job = build_job(dict(params, output_dir=bundle, source=params.get("source", "manifest")),
+                            fields, serial_list, None)
+        except (ValueError, KeyError) as e:
+            if serial_list is not None:
+                release_order(serial_list, mark_used)
+            summary[index - 1] = {"job": index, "status": "invalid", "exit_code": EXIT_INVALID,
+                                  "model": spec.get("model"), "error": str(e)}
+            continue
+        # 작업 프로세스끼리 엑셀 파일을 동시에 고치지 않도록 엑셀은 여기서 쓴다
+        excel_file = job["excel_file"]
+        job["excel_file"] = None
+        # 주문 하나에 한 프로세스이므로 주문 안에서는 다시 나누지 않는다
+        job["render_workers"] = 1
+        planned[index] = (job, fields, serial_list, mark_used, excel_file, bundle)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=pool_size(workers, len(planned) or 1)) as pool:
+        futures = [pool.submit(_run_job, index, item[0]) for index, item in planned.items()]
+        for future in concurrent.futures.as_completed(futures):
+            status = future.result()
+            index = status["job"]
+            job, fields, serial_list, mark_used, excel_file, bundle = planned[index]
+            row = {"job": index, "status": status["status"], "exit_code": status["exit_code"],
+                   "model": fields["모델명"], "model_code": fields["모델 코드"], "count": len(serial_list),
+                   "first_serial": serial_list[0], "last_serial": serial_list[-1],
+                   "bundle": os.path.abspath(bundle), "elapsed": round(status["elapsed"], 4),
+                   "error": status.get("error")}
+            if status["status"] == "ok":
+                row["outputs"] = status["result"]["outputs"]
+                row["metrics"] = status["result"]["metrics"]
+            else:
+                # 카운터에서 미리 받은 구간은 돌려준다 (다음 주문이 다시 쓴다)
+                row["released"] = release_order(serial_list, mark_used)
+            summary[index - 1] = row
+            if log:
+                log(row)
+
+    # 엑셀은 파일을 통째로 다시 쓰므로 주문마다 쓰지 않고 파일별로 한 번에, 매니페스트 순서대로 붙인다
+    by_file = {}
+    for index, (job, fields, serial_list, mark_used, excel_file, bundle) in planned.items():
+        if excel_file and summary[index - 1]["status"] == "ok":
+            by_file.setdefault(excel_file, []).append(index)
+    for excel_file, indexes in by_file.items():
+        try:
+            append_rows(excel_file, itertools.chain.from_iterable(planned[i][0]["records"]() for i in indexes))
+            excel_error = None
+        except OSError as e:
+            excel_error = f"엑셀 파일을 저장할 수 없습니다 ('{excel_file}' 파일이 열려 있으면 닫아주세요): {e}"
+        for i in indexes:
+            row = summary[i - 1]
+            if excel_error:
+                row.update(status="partial", exit_code=EXIT_EXCEL, error=excel_error)
+            else:
+                row["excel_path"] = os.path.abspath(excel_file)
+    return {
+        "jobs": summary,
+        "ok": sum(1 for row in summary if row["status"] == "ok"),
+        "failed": sum(1 for row in summary if row["status"] != "ok"),
+        "workers": pool_size(workers, len(planned) or 1),
+        "elapsed": round(time.perf_counter() - started, 4),
+    }
+
+def write_summary(report, output_dir):
+    stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    json_path = os.path.join(output_dir, f"summary_{stamp}.json")
+    csv_path = os.path.join(output_dir, f"summary_{stamp}.csv")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, SUMMARY_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(report["jobs"])
+    return json_path, csv_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="주문 매니페스트(CSV/JSON)의 주문들을 한 번에 처리합니다.")
+    parser.add_argument("manifest", help="주문 목록 파일 (.csv, .json, .jsonl)")
+    parser.add_argument("--output-dir", default="orders", help="주문별 묶음 폴더와 요약 보고서를 둘 폴더")
+    parser.add_argument("--workers", type=int, help="동시에 처리할 주문 수 (기본/최대 CPU 수)")
+    parser.add_argument("--format", dest="formats", action="append", choices=OUTPUT_FORMATS,
+                        help="매니페스트에 format 이 없는 주문의 출력 형식 (기본 auto)")
+    parser.add_argument("--excel", default="serial_numbers.xlsx", help="엑셀 파일 이름 (--no-excel 로 끔)")
+    parser.add_argument("--no-excel", dest="excel", action="store_const", const=None)
+    parser.add_argument("--resume", action="store_true", help="중단된 매니페스트를 다시 실행할 때 quantity 주문도 이어서 만듦")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = read_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"[오류] 매니페스트를 읽을 수 없습니다: {e}", file=sys.stderr)
+        return EXIT_INVALID
+
+    def log(row):
+        print(f"[{row['status']}] #{row['job']} {row['model']} {row['count']}개 ({row['elapsed']}초)"
+              + (f" - {row['error']}" if row["error"] else ""), file=sys.stderr)
+
+    defaults = {"formats": args.formats, "excel": args.excel, "resume": args.resume}
+    report = run_manifest(specs, args.output_dir, defaults, args.workers, log)
+    for row in report["jobs"]:
+        if row["status"] == "invalid":
+            log(dict(row, count=0, elapsed=0))
+    json_path, csv_path = write_summary(report, args.output_dir)
+    print(json.dumps({"ok": report["ok"], "failed": report["failed"], "elapsed": report["elapsed"],
+                      "summary": [os.path.abspath(json_path), os.path.abspath(csv_path)]}, ensure_ascii=False))
+    # 실패한 주문이 있으면 매니페스트에서 처음 실패한 주문의 종료 코드
+    codes = [row["exit_code"] for row in report["jobs"] if row["exit_code"]]
+    return codes[0] if codes else EXIT_OK
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
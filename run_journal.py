@@ -0,0 +1,130 @@
+import datetime
+import json
+import os
+
+JOURNAL_DIR = ".serial_journal"
+# 이 개수마다 완료 기록을 남긴다 (SerialRange 를 나누는 단위와 같음)
+CHUNK_SIZE = 10000
+
+def journal_key(serials):
+    # 같은 주문(시리얼 구간)이면 다시 실행해도 같은 이름이 된다
+    key = f"{serials.prefix}_{serials.seqs[0]}-{serials.seqs[-1]}"
+    return key + "_c" if serials.check else key
+
+def journal_path(serials, folder=JOURNAL_DIR):
+    return os.path.join(folder, journal_key(serials) + ".journal")
+
+def _read_lines(path):
+    entries = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 쓰다가 멈춘 마지막 줄은 없던 것으로 본다
+                    break
+    except FileNotFoundError:
+        pass
+    return entries
+
+class RunJournal:
+    # 생성 작업의 선행 기록(write-ahead journal). 한 줄에 JSON 하나씩, 끝난 단계를 쓰고 fsync 한다.
+    # 첫 줄(header)이 같은 주문(구간, 체크 문자, 출력 형식/경로, 라벨/프린터 옵션)이면 이어서 하고,
+    # 아니면 새로 시작한다. 새로 시작할 때 지난 기록의 header/기록은 stale/stale_entries 에 남겨서
+    # 남은 임시 파일을 지우거나 (장부까지 끝난 작업이면) 확정하게 한다.
+    # 작업이 끝까지 끝나면 close() 로 파일을 지운다.
+    def __init__(self, path, header):
+        self.path = path
+        self.stale = None
+        self.stale_entries = []
+        entries = _read_lines(path)
+        # JSON 으로 한 번 거친 값끼리 비교한다 (튜플/리스트 차이 없이)
+        header = json.loads(json.dumps(header, ensure_ascii=False))
+        if entries and all(entries[0].get(k) == v for k, v in header.items()):
+            self.header = entries[0]
+            self.entries = entries[1:]
+            self.resumed = True
+        else:
+            self.stale = entries[0] if entries else None
+            self.stale_entries = entries[1:]
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.header = dict(header, created=datetime.datetime.now().isoformat(timespec="seconds"))
+            self.entries = []
+            self.resumed = False
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self.header, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record(self, step, **data):
+        entry = dict(data, step=step)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries.append(entry)
+
+    def has(self, step, **match):
+        return any(e.get("step") == step and all(e.get(k) == v for k, v in match.items()) for e in self.entries)
+
+    def stale_has(self, step):
+        return any(e.get("step") == step for e in self.stale_entries)
+
+    def chunks(self, output):
+        return {e["index"] for e in self.entries if e.get("step") == "chunk" and e.get("output") == output}
+
+    def resume_index(self, output, total, exists=None):
+        # 처음부터 이어서 끝난 묶음 수. 그 뒤부터 다시 만들면 된다
+        done = self.chunks(output)
+        chunk_size = self.header["chunk_size"]
+        index = 0
+        while index * chunk_size < total and index in done and (exists is None or exists(index)):
+            index += 1
+        return index
+
+    def close(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+def open_journal(serials, outputs, folder=JOURNAL_DIR, chunk_size=CHUNK_SIZE, label_options=None, printer_options=None):
+    header = {
+        "key": journal_key(serials),
+        "prefix": serials.prefix,
+        "first": serials.seqs[0],
+        "last": serials.seqs[-1],
+        "check": serials.check,
+        "chunk_size": chunk_size,
+        "outputs": [list(pair) for pair in outputs],
+        "label_options": label_options or {},
+        "printer_options": printer_options or {},
+    }
+    return RunJournal(journal_path(serials, folder), header)
+
+def pending_outputs(serials, folder=JOURNAL_DIR):
+    # 이 구간의 끝나지 않은 작업이 쓰던 [(형식, 경로), ...] (없으면 None)
+    entries = _read_lines(journal_path(serials, folder))
+    if not entries:
+        return None
+    return [tuple(pair) for pair in entries[0].get("outputs", [])]
+
+def find_pending(prefix, count=None, check=False, folder=JOURNAL_DIR):
+    # 끝나지 않은 작업 중 같은 접두어(제조사~주문차수)인 것. 개수를 주면 개수도 같아야 한다
+    try:
+        names = sorted(os.listdir(folder))
+    except FileNotFoundError:
+        return None
+    for name in names:
+        if not (name.startswith(prefix + "_") and name.endswith(".journal")):
+            continue
+        entries = _read_lines(os.path.join(folder, name))
+        if not entries:
+            continue
+        header = entries[0]
+        if header.get("prefix") != prefix or header.get("check") != check:
+            continue
+        if count is None or header["last"] - header["first"] + 1 == count:
+            return header
+    return None
@@ -0,0 +1,147 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# 보고서/화면에 보여줄 단계 순서 (없는 단계는 건너뛴다)
+STAGE_ORDER = ["allocate", "check", "render", "zip", "svg", "sheet", "zpl", "epl", "ledger", "commit", "excel", "sheets"]
+# 메모리 캡처에서 보여줄 할당 위치 수
+MEMORY_TOP = 25
+
+class RunMetrics:
+    # 한 번의 생성 작업에서 단계별 시간, 개수, 쓴 바이트 수를 모은다.
+    # 같은 단계를 여러 번 재면 더한다 (렌더링처럼 다른 단계 안에서 조금씩 나눠 재는 경우).
+    # 시계는 perf_counter (단조 증가하고, Windows 의 monotonic 처럼 15ms 단위로 끊기지 않는다).
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.finished = None
+        self.stages = {}
+        self.counters = {}
+        self.bytes = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.add_time(name, self.clock() - started)
+
+    def add_time(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_bytes(self, name, n):
+        self.bytes[name] = self.bytes.get(name, 0) + n
+
+    def add_file(self, name, path):
+        try:
+            self.add_bytes(name, os.path.getsize(path))
+        except OSError:
+            pass
+
+    def finish(self):
+        self.finished = self.clock()
+        return self
+
+    @property
+    def total(self):
+        return (self.finished or self.clock()) - self.started
+
+    def report(self):
+        stages = sorted(self.stages.items(), key=lambda kv: (STAGE_ORDER.index(kv[0]) if kv[0] in STAGE_ORDER else len(STAGE_ORDER), kv[0]))
+        return {
+            "total": round(self.total, 4),
+            "stages": {name: round(seconds, 4) for name, seconds in stages},
+            "counters": dict(self.counters),
+            "bytes": dict(self.bytes),
+        }
+
+    def summary_lines(self):
+        return summary_lines(self.report())
+
+    def write_report(self, path, **extra):
+        return write_run_report(path, self.report(), **extra)
+
+def summary_lines(report):
+    # GUI 출력 창에 보여줄 줄들 (report() 결과. 작업 스레드에서 받은 dict 그대로 쓸 수 있다)
+    total = report["total"] or 1e-9
+    lines = [f"[소요 시간] 전체 {report['total']:.2f}초"]
+    for name, seconds in report["stages"].items():
+        lines.append(f"  {name:<8} {seconds:8.3f}초 ({seconds / total:5.1%})")
+    if report["counters"]:
+        lines.append("[개수] " + ", ".join(f"{k} {v:,}" for k, v in report["counters"].items()))
+    if report["bytes"]:
+        lines.append("[크기] " + ", ".join(f"{k} {v / 2**20:,.2f}MB" for k, v in report["bytes"].items()))
+    return lines
+
+def write_run_report(path, report, **extra):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(report, **extra), f, ensure_ascii=False, indent=2)
+    return os.path.abspath(path)
+
+def artifact_base(outputs, fallback="run"):
+    # 보고서/프로파일 파일을 둘 기준 경로: ZIP 이 있으면 ZIP 옆, 없으면 첫 결과 파일 옆, 그것도 없으면 fallback
+    for path in outputs:
+        if path.endswith(".zip"):
+            return path
+    return outputs[0] if outputs else fallback
+
+def report_path(base):
+    # 결과 파일(ZIP 등) 옆에 같은 이름으로 둔다: orders.zip -> orders.run.json
+    root, _ = os.path.splitext(base)
+    return root + ".run.json"
+
+class ProfileCapture:
+    # 필요할 때만 켜는 cProfile/tracemalloc 캡처. 켠 스레드에서 실행되는 코드만 cProfile 에 잡히므로
+    # 작업 스레드 안에서 with 로 감싼다. 바코드 렌더링 프로세스 안은 잡히지 않는다.
+    def __init__(self, profile=False, memory=False):
+        self.profile = cProfile.Profile() if profile else None
+        self.memory = memory
+        self.snapshot = None
+        self.peak = None
+
+    @property
+    def enabled(self):
+        return self.profile is not None or self.memory
+
+    def __enter__(self):
+        if self.memory:
+            tracemalloc.start()
+        if self.profile is not None:
+            self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profile is not None:
+            self.profile.disable()
+        if self.memory:
+            self.snapshot = tracemalloc.take_snapshot()
+            _, self.peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    def save(self, base):
+        # base 옆에 .prof (pstats/snakeviz 로 열 수 있음) 와 .prof.txt / .mem.txt 요약을 쓴다
+        root, _ = os.path.splitext(base)
+        paths = []
+        if self.profile is not None:
+            self.profile.dump_stats(root + ".prof")
+            text = io.StringIO()
+            pstats.Stats(self.profile, stream=text).sort_stats("cumulative").print_stats(40)
+            with open(root + ".prof.txt", "w", encoding="utf-8") as f:
+                f.write(text.getvalue())
+            paths += [root + ".prof", root + ".prof.txt"]
+        if self.snapshot is not None:
+            with open(root + ".mem.txt", "w", encoding="utf-8") as f:
+                f.write(f"peak {self.peak / 2**20:.2f} MB\n")
+                for stat in self.snapshot.statistics("lineno")[:MEMORY_TOP]:
+                    f.write(f"{stat}\n")
+            paths.append(root + ".mem.txt")
+        return [os.path.abspath(path) for path in paths]
@@ -0,0 +1,235 @@
+import atexit
+import json
+import os
+import socket
+import time
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+COUNTER_FILE = "seq_counter.json"
+LEGACY_FILE = "latest_serial.txt"
+# 주문(시리얼 접두어)별 카운터를 두는 폴더
+COUNTER_DIR = "seq_counters"
+BLOCK_SIZE = 1000
+# 생산순서 자릿수 (serial_batch.SEQ_WIDTH 와 같음). 이보다 큰 번호는 나눠주지 않는다
+SEQ_WIDTH = 5
+
+def _lock(f):
+    if os.name == "nt":
+        # msvcrt 는 10초 동안만 기다리므로 잠길 때까지 다시 시도한다
+        while True:
+            try:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.1)
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+def _unlock(f):
+    if os.name == "nt":
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _write_atomic(path, text):
+    # 임시 파일에 쓰고 fsync 한 뒤 교체해서, 중간에 죽어도 이전 내용 아니면 새 내용만 남는다
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+class SeqCounter:
+    # 생산순서 카운터. 파일 잠금 안에서 블록 단위로 번호를 빌려오고(lease),
+    # 빌린 블록 안에서는 잠금 없이 연속된 번호를 나눠준다. 남은 번호는 release() 로 반납한다.
+    #
+    # 상태 파일 (seq_counter.json):
+    #   next   - 한 번도 나간 적 없는 가장 작은 번호
+    #   free   - 반납되어 다시 나눠줄 수 있는 구간 [[시작, 끝], ...]
+    #   leases - 지금 빌려 간 구간. 프로세스가 반납 없이 죽으면 그대로 남고 다시 나가지 않는다
+    # seed_path 는 처음 만들 때 시작 번호를 이어받을 카운터 파일 (주문별 카운터가 예전 공용 카운터를 잇는다)
+    def __init__(self, path=COUNTER_FILE, legacy_path=LEGACY_FILE, block_size=BLOCK_SIZE, width=SEQ_WIDTH, seed_path=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.block_size = block_size
+        self.max_seq = 10 ** width - 1
+        self.seed_path = seed_path
+        self.lock_path = path + ".lock"
+        self.lease_id = None
+        self._first = None
+        self._pos = None
+        self._end = None
+        atexit.register(self.release)
+
+    def _transaction(self, update):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.lock_path, "a+") as lock:
+            _lock(lock)
+            try:
+                state = self._load()
+                result = update(state)
+                self._save(state)
+                return result
+            finally:
+                _unlock(lock)
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        # 처음이면 기존 latest_serial.txt 의 마지막 번호 다음부터 시작한다
+        latest = 0
+        if self.legacy_path and os.path.exists(self.legacy_path):
+            with open(self.legacy_path, "r") as f:
+                text = f.read().strip()
+            latest = int(text) if text else 0
+        if self.seed_path:
+            latest = max(latest, _seed_latest(self.seed_path))
+        return {"next": latest + 1, "free": [], "leases": {}}
+
+    def _save(self, state):
+        _write_atomic(self.path, json.dumps(state, ensure_ascii=False))
+        if self.legacy_path:
+            # 예전 스크립트가 보는 파일도 지금까지 나간 가장 큰 번호로 맞춰둔다
+            _write_atomic(self.legacy_path, str(state["next"] - 1))
+
+    def _lease(self, count):
+        size = max(count, self.block_size)
+
+        def update(state):
+            start = None
+            # 반납된 구간 중 요청 개수가 들어가는 가장 앞 구간을 먼저 쓴다
+            for i, (a, b) in enumerate(state["free"]):
+                if b - a + 1 >= count:
+                    start, end = a, min(b, a + size - 1)
+                    if end < b:
+                        state["free"][i] = [end + 1, b]
+                    else:
+                        del state["free"][i]
+                    break
+            if start is None:
+                start = state["next"]
+                if start + count - 1 > self.max_seq:
+                    raise ValueError(f"생산순서가 {self.max_seq} 를 넘습니다 (남은 번호 {max(0, self.max_seq - start + 1)}개). "
+                                     "주문차수를 바꿔주세요.")
+                end = min(start + size - 1, self.max_seq)
+                state["next"] = end + 1
+            lease_id = f"{socket.gethostname()}:{os.getpid()}:{time.time_ns()}"
+            state["leases"][lease_id] = [start, end]
+            return lease_id, start, end
+
+        self.lease_id, self._pos, self._end = self._transaction(update)
+        self._first = self._pos
+
+    def take(self, count):
+        # 연속된 생산순서 count 개를 (시작, 끝) 으로 돌려준다
+        if count < 1:
+            raise ValueError("생성할 개수는 1 이상이어야 합니다.")
+        if self.lease_id is None or self._end - self._pos + 1 < count:
+            self.release()
+            self._lease(count)
+        start = self._pos
+        self._pos += count
+        return start, start + count - 1
+
+    def release(self):
+        # 빌린 블록에서 쓰지 않은 번호를 반납한다
+        if self.lease_id is None:
+            return
+        lease_id, pos, end = self.lease_id, self._pos, self._end
+        self.lease_id = self._first = self._pos = self._end = None
+
+        def update(state):
+            state["leases"].pop(lease_id, None)
+            if pos <= end:
+                _add_free(state, pos, end)
+
+        self._transaction(update)
+
+    def release_range(self, start, end):
+        # take() 로 받았지만 쓰지 않은 구간을 돌려준다 (작업이 실패했을 때). 다음 take() 에서 다시 나간다
+        if start < 1 or end < start or end > self.max_seq:
+            raise ValueError(f"생산순서는 1~{self.max_seq} 사이여야 합니다: {start}~{end}")
+        if self.lease_id is not None and self._first <= start and end == self._pos - 1:
+            # 지금 블록에서 마지막으로 나눠준 구간이면 위치만 되돌린다
+            self._pos = start
+            return
+
+        def update(state):
+            if end >= state["next"]:
+                raise ValueError(f"나눠준 적 없는 생산순서입니다: {start}~{end}")
+            _add_free(state, start, end)
+
+        self._transaction(update)
+
+    def mark_used(self, start, end):
+        # 다른 곳(GUI 등)에서 직접 정한 구간을 썼다고 기록해서 다시 나가지 않게 한다.
+        # 건너뛴 번호(next ~ start-1)는 반납 구간으로 만들지 않는다 (예전에 손으로 쓴 번호일 수 있다)
+        if start < 1 or end < start or end > self.max_seq:
+            raise ValueError(f"생산순서는 1~{self.max_seq} 사이여야 합니다: {start}~{end}")
+        # 이 프로세스가 빌린 블록과 겹치면 남은 번호를 먼저 반납한다
+        if self.lease_id is not None and start <= self._end and end >= self._pos:
+            self.release()
+
+        own = self.lease_id
+
+        def update(state):
+            for lease_id, (a, b) in state["leases"].items():
+                # 이 프로세스의 블록에서 이미 나눠준 번호(_pos 앞)는 겹쳐도 된다
+                if lease_id != own and start <= b and end >= a:
+                    raise ValueError(f"생산순서 {max(a, start)}~{min(b, end)} 는 다른 작업({lease_id})이 빌려 간 번호입니다.")
+            state["next"] = max(state["next"], end + 1)
+            free = []
+            for a, b in state["free"]:
+                if a < start:
+                    free.append([a, min(b, start - 1)])
+                if b > end:
+                    free.append([max(a, end + 1), b])
+            state["free"] = free
+
+        self._transaction(update)
+
+def _seed_latest(path):
+    # 다른 카운터 파일에서 지금까지 나간 가장 큰 번호 (파일이 없으면 latest_serial.txt)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["next"] - 1
+    if os.path.exists(LEGACY_FILE):
+        with open(LEGACY_FILE, "r") as f:
+            text = f.read().strip()
+        return int(text) if text else 0
+    return 0
+
+def _add_free(state, start, end):
+    # 반납 구간을 정렬해서 넣고 이웃 구간과 합친다. 맨 끝 구간이면 next 를 되돌린다
+    ranges = sorted(state["free"] + [[start, end]])
+    merged = []
+    for a, b in ranges:
+        if merged and a <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], b)
+        else:
+            merged.append([a, b])
+    if merged and merged[-1][1] == state["next"] - 1:
+        state["next"] = merged.pop()[0]
+    state["free"] = merged
+
+_counters = {}
+
+def counter_path(prefix):
+    return os.path.join(COUNTER_DIR, f"{prefix}.json")
+
+def get_counter(prefix=None):
+    # prefix(제조사~주문차수) 마다 따로 센다. 처음 쓰는 주문은 예전 공용 카운터(없으면 latest_serial.txt)의
+    # 다음 번호부터 시작해서 이전 CLI 가 나눠준 번호와 겹치지 않는다. prefix 가 없으면 예전 공용 카운터
+    if prefix not in _counters:
+        if prefix is None:
+            _counters[prefix] = SeqCounter()
+        else:
+            _counters[prefix] = SeqCounter(counter_path(prefix), legacy_path=None, seed_path=COUNTER_FILE)
+    return _counters[prefix]
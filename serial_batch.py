@@ -0,0 +1,62 @@
+import numpy as np
+from serial_check import check_bytes
+
+# 시리얼 생성 관련 설정 (각 앱의 alpha_dict 와 동일)
+alpha_dict = {
+    '1': 'A', '2': 'C', '3': 'D', '4': 'E', '5': 'F',
+    '6': 'H', '7': 'J', '8': 'K', '9': 'L', '0': 'M',
+    '10': 'M', '11': 'N', '12': 'P'
+}
+
+SEQ_WIDTH = 5
+
+def num_to_alpha(num):
+    return ''.join(alpha_dict[digit] for digit in str(num))
+
+def serial_prefix(maker, category, model_code, year, month, order):
+    # 한 주문 안에서는 변하지 않는 앞부분 (제조사~주문차수)
+    year_alpha = num_to_alpha(year[-1])
+    month_alpha = alpha_dict[month]
+    order_number = str(order).zfill(2)
+    return f"{maker}{category}{model_code}{year_alpha}{month_alpha}{order_number}"
+
+def _fill_serials(prefix_bytes, start, end, width, check=False):
+    n = end - start + 1
+    plen = len(prefix_bytes)
+    buf = np.empty((n, plen + width + check), dtype=np.uint8)
+    buf[:, :plen] = np.frombuffer(prefix_bytes, dtype=np.uint8)
+    seqs = np.arange(start, end + 1, dtype=np.int64)
+    for k in range(width - 1, -1, -1):
+        buf[:, plen + k] = seqs % 10 + 48
+        seqs //= 10
+    if check:
+        buf[:, -1] = check_bytes(buf[:, :-1])
+    return buf.view(f'S{plen + width + check}').ravel()
+
+def generate_serial_batch(maker, category, model_code, year, month, order, start, end, width=SEQ_WIDTH, check=False):
+    # generate_serial 을 start~end 범위에 한 번에 적용한 결과 (numpy 바이트 문자열 배열, dtype S<길이>).
+    # 순번은 str(i).zfill(width) 와 같은 규칙으로 채운다. check 이면 끝에 체크 문자를 붙인다.
+    # 파이썬 문자열 리스트가 필요하면 batch_strings() 로 바꾼다 (유니코드 배열을 거치지 않는다)
+    if start < 0 or end < start - 1:
+        raise ValueError("시작/끝 번호를 다시 확인해주세요.")
+    prefix = serial_prefix(maker, category, model_code, year, month, order).encode('ascii')
+
+    # zfill 폭을 넘는 순번은 자릿수별로 나눠서 채운다
+    parts = [np.empty(0, dtype=f'S{len(prefix) + width + check}')]
+    lo = start
+    digits = max(width, len(str(start)))
+    while lo <= end:
+        hi = min(end, 10 ** digits - 1)
+        parts.append(_fill_serials(prefix, lo, hi, digits, check))
+        lo = hi + 1
+        digits += 1
+    return np.concatenate(parts)
+
+def batch_strings(batch):
+    # S 배열 -> str 리스트. 한 번에 디코드해서 시리얼 길이만큼 자른다
+    width = batch.dtype.itemsize
+    text = batch.tobytes().decode('ascii')
+    if '\0' in text:
+        # 순번 자릿수가 늘어나는 구간이 섞이면 짧은 시리얼 뒤가 0 바이트로 채워져 있다
+        return [serial.decode('ascii') for serial in batch.tolist()]
+    return [text[i:i + width] for i in range(0, len(text), width)]
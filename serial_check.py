@@ -0,0 +1,86 @@
+import numpy as np
+
+# 체크 문자: Damm 방식. 0~9 -> 0~9, A~Z -> 10~35 값을 차수 36 의 완전 반대칭 준군 표로 차례로 접는다.
+# 한 자리 오타와 이웃한 두 자리가 뒤바뀐 경우를 0-9/A-Z 전체에서 모두 잡는다
+# (예전의 23 나머지 방식은 값 차이가 23 인 0/N, 1/O ... C/Z 가 뒤바뀌면 놓쳤다).
+# 체크 문자도 0-9/A-Z 중 하나이므로, 기존 15자리 시리얼과는 길이(16자리)로 구분한다.
+SERIAL_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+CHECK_ALPHABET = SERIAL_CHARS
+CHAR_VALUES = {c: i for i, c in enumerate(SERIAL_CHARS)}
+SERIAL_LENGTH = 15
+
+def _gf4(x, y):
+    # GF(4) 에서 w*x + y (원소는 2비트 다항식, w^2 = w + 1)
+    hi, lo = x >> 1, x & 1
+    return (((hi ^ lo) << 1) | hi) ^ y
+
+def _gf9(x, y):
+    # GF(9) = F3[i]/(i^2 + 1) 에서 i*x + y (원소는 3*x1 + x0 = x1*i + x0)
+    x1, x0 = divmod(x, 3)
+    y1, y0 = divmod(y, 3)
+    return (x0 + y1) % 3 * 3 + (y0 - x1) % 3
+
+def _quasigroup():
+    # GF(4) 와 GF(9) 의 a*x + y (a != 0, 1) 는 완전 반대칭 준군이고, 그 직접곱(차수 36)도 그렇다
+    return [[_gf4(x // 9, y // 9) * 9 + _gf9(x % 9, y % 9) for y in range(36)] for x in range(36)]
+
+TABLE = _quasigroup()
+# 중간값 -> 마지막에 0 이 되게 하는 체크 값
+_CHECK_VALUES = [row.index(0) for row in TABLE]
+
+# 바이트 값 -> 자리 값 (시리얼에 못 쓰는 문자는 -1)
+_BYTE_VALUES = np.full(256, -1, dtype=np.int64)
+for _c, _v in CHAR_VALUES.items():
+    _BYTE_VALUES[ord(_c)] = _v
+_CHECK_BYTES = np.frombuffer(CHECK_ALPHABET.encode("ascii"), dtype=np.uint8)
+_TABLE = np.array(TABLE, dtype=np.int64)
+
+def _interim(text):
+    interim = 0
+    for c in text:
+        interim = TABLE[interim][CHAR_VALUES[c]]
+    return interim
+
+def check_char(base):
+    return CHECK_ALPHABET[_CHECK_VALUES[_interim(base)]]
+
+def add_check(base):
+    return base + check_char(base)
+
+def has_check(serial, length=SERIAL_LENGTH):
+    # 체크 문자가 붙은 시리얼은 기존 길이보다 한 자리 길다
+    return isinstance(serial, str) and len(serial) == length + 1
+
+def strip_check(serial, length=SERIAL_LENGTH):
+    # 체크 문자를 확인하고 떼어낸 시리얼을 돌려준다. 기존(체크 문자 없는) 시리얼은 모양만 확인한다.
+    # 앞뒤 공백과 소문자는 예전 해석처럼 받아들인다. 틀리면 ValueError.
+    # 파일/시트를 보기 전에 부르면 잘못 찍힌 시리얼을 바로 걸러낼 수 있다.
+    if not isinstance(serial, str):
+        raise ValueError("시리얼 넘버 길이가 맞지 않습니다.")
+    serial = serial.strip().upper()
+    if len(serial) not in (length, length + 1):
+        raise ValueError("시리얼 넘버 길이가 맞지 않습니다.")
+    if any(c not in CHAR_VALUES for c in serial):
+        raise ValueError("시리얼 넘버에 사용할 수 없는 문자가 있습니다.")
+    if not has_check(serial, length):
+        return serial
+    base = serial[:-1]
+    if _interim(serial) != 0:
+        raise ValueError("체크 문자가 맞지 않습니다. 잘못 입력되었거나 잘못 스캔된 시리얼 넘버입니다.")
+    return base
+
+def is_valid(serial, length=SERIAL_LENGTH):
+    try:
+        strip_check(serial, length)
+        return True
+    except ValueError:
+        return False
+
+def check_bytes(buf):
+    # (n, 길이) uint8 시리얼 배열의 체크 문자를 한 번에 계산한다 (자리마다 한 번씩 열 단위로).
+    # 시리얼에 못 쓰는 문자는 0 으로 보고 계산한다 (길이/문자 오류는 부르는 쪽에서 따로 거른다)
+    values = np.maximum(_BYTE_VALUES[buf], 0)
+    interim = np.zeros(buf.shape[0], dtype=np.int64)
+    for k in range(buf.shape[1]):
+        interim = _TABLE[interim, values[:, k]]
+    return _CHECK_BYTES[np.asarray(_CHECK_VALUES)[interim]]
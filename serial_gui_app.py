@@ -1,12 +1,10 @@
 import customtkinter as ctk
 import tkinter.messagebox
-import hashlib
 import os
-import barcode
-import pandas as pd
-import zipfile
 import datetime
 import subprocess
+# pandas/python-barcode/zipfile/hashlib 은 무거워서 창이 뜨기 전에 읽지 않고, 처음 쓰는 함수 안에서 import 한다
+# (PyInstaller one-file EXE 는 import 마다 압축을 풀기 때문에 시작 시간이 많이 늘어난다. startup_report.py 로 확인)
 
 # 시리얼 생성 관련 설정
 alpha_dict = {
@@ -24,6 +22,7 @@ def num_to_alpha(num):
     return ''.join(alpha_dict[digit] for digit in str(num))
 
 def model_to_number(model_name):
+    import hashlib
     model_name = model_name.upper()
     h = hashlib.sha256(model_name.encode()).hexdigest()
     return int(h, 16)
@@ -54,6 +53,8 @@ def generate_serial(maker, category, model_code, year, month, order, seq):
     return f"{maker}{category}{model_code}{year_alpha}{month_alpha}{order_number}{seq}"
 
 def generate_barcode(serial):
+    import barcode
+    import barcode.writer
     CODE128 = barcode.get_barcode_class('code128')
     writer = barcode.writer.SVGWriter()
     writer.set_options({
@@ -68,6 +69,7 @@ def generate_barcode(serial):
     return filename
 
 def save_to_excel(data):
+    import pandas as pd
     filename = "serial_numbers_gui.xlsx"
     if os.path.exists(filename):
         df_existing = pd.read_excel(filename)
@@ -78,6 +80,7 @@ def save_to_excel(data):
     return os.path.abspath(filename)
 
 def zip_svg_files(serial_list, model_name, year, month, order):
+    import zipfile
     short_date = datetime.datetime.now().strftime('%y%m%d')
     zip_filename = f"serial-number_{short_date}_{model_name}_{year}년_{month}월_{order}차.zip"
     with zipfile.ZipFile(zip_filename, 'w') as zipf:
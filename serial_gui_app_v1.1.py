@@ -1,13 +1,11 @@
 import customtkinter as ctk
 import tkinter.messagebox
-import hashlib
+import csv
 import os
-import barcode
-import pandas as pd
-import zipfile
 import datetime
 import subprocess
-from xml.etree import ElementTree as ET
+# pandas/python-barcode/zipfile/hashlib 은 무거워서 창이 뜨기 전에 읽지 않고, 처음 쓰는 함수 안에서 import 한다
+# (PyInstaller one-file EXE 는 import 마다 압축을 풀기 때문에 시작 시간이 많이 늘어난다. startup_report.py 로 확인)
 
 # 시리얼 생성 관련 설정
 alpha_dict = {
@@ -26,6 +24,7 @@ def num_to_alpha(num):
     return ''.join(alpha_dict[digit] for digit in str(num))
 
 def model_to_number(model_name):
+    import hashlib
     model_name = model_name.upper()
     h = hashlib.sha256(model_name.encode()).hexdigest()
     return int(h, 16)
@@ -56,6 +55,8 @@ def generate_serial(maker, category, model_code, year, month, order, seq):
     return f"{maker}{category}{model_code}{year_alpha}{month_alpha}{order_number}{seq}"
 
 def generate_barcode(serial):
+    import barcode
+    import barcode.writer
     CODE128 = barcode.get_barcode_class('code128')
     writer = barcode.writer.SVGWriter()
     writer.set_options({
@@ -71,6 +72,7 @@ def generate_barcode(serial):
     return filename
 
 def save_to_excel(data):
+    import pandas as pd
     filename = "serial_numbers_gui.xlsx"
     if os.path.exists(filename):
         df_existing = pd.read_excel(filename)
@@ -81,6 +83,7 @@ def save_to_excel(data):
     return os.path.abspath(filename)
 
 def zip_svg_files(serial_list, model_name, year, month, order):
+    import zipfile
     short_date = datetime.datetime.now().strftime('%y%m%d')
     zip_filename = f"serial-number_{short_date}_{model_name}_{year}년_{month}월_{order}차.zip"
     with zipfile.ZipFile(zip_filename, 'w') as zipf:
@@ -91,16 +94,22 @@ def zip_svg_files(serial_list, model_name, year, month, order):
                 os.remove(file)
     return os.path.abspath(zip_filename)
 
+def read_model_map():
+    # 작은 CSV 라서 pandas 없이 csv 모듈로 읽는다
+    with open(model_map_file, newline="", encoding="utf-8") as f:
+        return [(row.get("모델코드"), row.get("모델명")) for row in csv.DictReader(f)]
+
 def save_model_mapping(model_name, model_code):
     try:
         if os.path.exists(model_map_file):
-            df = pd.read_csv(model_map_file)
-            if not ((df['모델코드'] == model_code) & (df['모델명'] == model_name)).any():
-                df = pd.concat([df, pd.DataFrame([{"모델코드": model_code, "모델명": model_name}])], ignore_index=True)
-                df.to_csv(model_map_file, index=False)
+            if (model_code, model_name) not in read_model_map():
+                with open(model_map_file, "a", newline="", encoding="utf-8") as f:
+                    csv.writer(f, lineterminator="\n").writerow([model_code, model_name])
         else:
-            df = pd.DataFrame([{"모델코드": model_code, "모델명": model_name}])
-            df.to_csv(model_map_file, index=False)
+            with open(model_map_file, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerow(["모델코드", "모델명"])
+                writer.writerow([model_code, model_name])
     except Exception as e:
         print(f"[모델 매핑 저장 오류] {e}")
 
@@ -108,12 +117,10 @@ def lookup_model_name(code):
     if not os.path.exists(model_map_file):
         return "(매핑 없음)"
     try:
-        df = pd.read_csv(model_map_file)
-        row = df[df['모델코드'] == code]
-        if not row.empty:
-            return row.iloc[0]['모델명']
-        else:
-            return "(매핑 없음)"
+        for row_code, row_name in read_model_map():
+            if row_code == code:
+                return row_name
+        return "(매핑 없음)"
     except Exception as e:
         return f"(에러: {e})"
 
@@ -0,0 +1,141 @@
+import datetime
+import sqlite3
+from openpyxl import Workbook
+
+LEDGER_FILE = "serial_ledger.db"
+
+# 엑셀/시트에서 쓰는 열 이름 -> 장부 컬럼
+COLUMNS = [
+    ("시리얼넘버", "serial"),
+    ("제조사", "maker"),
+    ("제품 카테고리", "category"),
+    ("모델명", "model_name"),
+    ("모델 코드", "model_code"),
+    ("제조년도", "year"),
+    ("제조월", "month"),
+    ("주문차수", "order_no"),
+    ("생산순서", "seq"),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS serials (
+    serial TEXT NOT NULL,
+    maker TEXT,
+    category TEXT,
+    model_name TEXT,
+    model_code TEXT,
+    year TEXT,
+    month TEXT,
+    order_no TEXT,
+    seq TEXT,
+    source TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_serials_serial ON serials(serial);
+CREATE INDEX IF NOT EXISTS ix_serials_year_month ON serials(year, month);
+CREATE INDEX IF NOT EXISTS ix_serials_order ON serials(model_code, year, month, order_no);
+"""
+
+class DuplicateSerialError(ValueError):
+    def __init__(self, serial):
+        super().__init__(f"이미 발급된 시리얼 넘버입니다: {serial}")
+        self.serial = serial
+
+class SerialLedger:
+    # 발급된 시리얼의 기준 장부 (SQLite). 엑셀은 여기서 내보내는 사본이다.
+    def __init__(self, path=LEDGER_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def _rows(self, records, source, created_at, state):
+        for record in records:
+            serial = record["시리얼넘버"]
+            state["serial"] = serial
+            values = [record.get(key) for key, _ in COLUMNS]
+            if values[4] is None:
+                # 모델 코드가 없으면 시리얼의 5~6번째 자리에서 가져온다
+                values[4] = serial[4:6]
+            yield (*(None if v is None else str(v) for v in values), source, created_at)
+
+    def insert_order(self, records, source=""):
+        # 한 주문을 트랜잭션 하나로 넣는다. 중복이 하나라도 있으면 전체를 되돌리고 DuplicateSerialError.
+        created_at = datetime.datetime.now().isoformat(timespec="seconds")
+        state = {"serial": None}
+        columns = ", ".join(col for _, col in COLUMNS)
+        placeholders = ", ".join("?" * (len(COLUMNS) + 2))
+        try:
+            with self.conn:
+                cur = self.conn.executemany(
+                    f"INSERT INTO serials ({columns}, source, created_at) VALUES ({placeholders})",
+                    self._rows(records, source, created_at, state),
+                )
+                return cur.rowcount
+        except sqlite3.IntegrityError:
+            raise DuplicateSerialError(state["serial"]) from None
+
+    def first_existing(self, serials, batch=500):
+        # 이미 장부에 있는 시리얼 중 첫 번째 (없으면 None). 무거운 작업 전에 미리 확인할 때 쓴다
+        batch_serials = []
+        for serial in serials:
+            batch_serials.append(serial)
+            if len(batch_serials) == batch:
+                found = self._first_in(batch_serials)
+                if found:
+                    return found
+                batch_serials = []
+        return self._first_in(batch_serials) if batch_serials else None
+
+    def _first_in(self, serials):
+        placeholders = ", ".join("?" * len(serials))
+        row = self.conn.execute(
+            f"SELECT serial FROM serials WHERE serial IN ({placeholders}) LIMIT 1", serials).fetchone()
+        return row[0] if row else None
+
+    def exists(self, serial):
+        return self.conn.execute("SELECT 1 FROM serials WHERE serial = ?", (serial,)).fetchone() is not None
+
+    def lookup(self, serial):
+        cur = self.conn.execute(
+            f"SELECT {', '.join(col for _, col in COLUMNS)} FROM serials WHERE serial = ?", (serial,))
+        row = cur.fetchone()
+        if row is None:
+            return None
+        return {key: value for (key, _), value in zip(COLUMNS, row)}
+
+    def query(self, model_code=None, year=None, month=None, order=None):
+        conditions = []
+        params = []
+        for col, value in (("model_code", model_code), ("year", year), ("month", month), ("order_no", order)):
+            if value is not None:
+                conditions.append(f"{col} = ?")
+                params.append(str(value))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        cur = self.conn.execute(
+            f"SELECT {', '.join(col for _, col in COLUMNS)} FROM serials{where} ORDER BY rowid", params)
+        for row in cur:
+            yield {key: value for (key, _), value in zip(COLUMNS, row)}
+
+    def export_excel(self, filename, **filters):
+        # 장부 내용을 엑셀로 내보낸다 (write-only 로 스트리밍)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append([key for key, _ in COLUMNS])
+        count = 0
+        for record in self.query(**filters):
+            ws.append([record[key] for key, _ in COLUMNS])
+            count += 1
+        wb.save(filename)
+        return count
+
+    def close(self):
+        self.conn.close()
+
+_ledgers = {}
+
+def get_ledger(path=LEDGER_FILE):
+    if path not in _ledgers:
+        _ledgers[path] = SerialLedger(path)
+    return _ledgers[path]
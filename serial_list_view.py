@@ -0,0 +1,117 @@
+import customtkinter as ctk
+
+class SerialListView(ctk.CTkFrame):
+    # 시리얼 목록을 보여주는 가상 리스트. 전체를 텍스트 위젯에 넣지 않고
+    # 화면에 보이는 줄만 items[top:top + rows] 에서 잘라서 그린다 (SerialRange 처럼 인덱싱이 O(1) 인 목록 기준).
+    def __init__(self, master, rows=10, **kwargs):
+        super().__init__(master, **kwargs)
+        self.items = []
+        self.top = 0
+        self.rows = rows
+        self.selected = None
+
+        tool_frame = ctk.CTkFrame(self, fg_color="transparent")
+        tool_frame.pack(fill="x", pady=(0, 5))
+        self.find_entry = ctk.CTkEntry(tool_frame, width=200, placeholder_text="시리얼 넘버로 이동")
+        self.find_entry.pack(side="left")
+        self.find_entry.bind("<Return>", lambda e: self.jump_to(self.find_entry.get().strip()))
+        ctk.CTkButton(tool_frame, text="이동", width=60,
+                      command=lambda: self.jump_to(self.find_entry.get().strip())).pack(side="left", padx=5)
+        ctk.CTkButton(tool_frame, text="전체 복사", width=80, command=self.copy_all).pack(side="left")
+        self.count_label = ctk.CTkLabel(tool_frame, text="")
+        self.count_label.pack(side="right")
+
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="both", expand=True)
+        self.text = ctk.CTkTextbox(body, wrap="none", activate_scrollbars=False, height=rows * 20)
+        self.text.pack(side="left", fill="both", expand=True)
+        self.text.tag_config("selected", background="#009b77", foreground="white")
+        self.scrollbar = ctk.CTkScrollbar(body, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.text.bind("<MouseWheel>", self.on_wheel)
+        self.text.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.text.bind("<Button-5>", lambda e: self.scroll(3))
+        self.text.bind("<Up>", lambda e: self.scroll(-1))
+        self.text.bind("<Down>", lambda e: self.scroll(1))
+        self.text.bind("<Prior>", lambda e: self.scroll(-self.rows))
+        self.text.bind("<Next>", lambda e: self.scroll(self.rows))
+        self.text.bind("<Configure>", self.on_resize)
+        self.render()
+
+    def set_items(self, items):
+        self.items = items
+        self.top = 0
+        self.selected = None
+        self.render()
+
+    def clear(self):
+        self.set_items([])
+
+    def on_resize(self, event=None):
+        font = self.text.cget("font")
+        linespace = font.metrics("linespace") if hasattr(font, "metrics") else 20
+        rows = max(1, self.text.winfo_height() // linespace)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+    def on_wheel(self, event):
+        # Windows 는 120 단위, macOS 는 1 단위로 들어온다
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll(-step * 3)
+        return "break"
+
+    def on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.set_top(int(float(args[0]) * len(self.items)))
+        elif action == "scroll":
+            amount = int(args[0])
+            self.scroll(amount * self.rows if args[1] == "pages" else amount)
+
+    def scroll(self, lines):
+        self.set_top(self.top + lines)
+        return "break"
+
+    def set_top(self, top, force=False):
+        top = max(0, min(top, len(self.items) - self.rows))
+        if force or top != self.top:
+            self.top = top
+            self.render()
+
+    def render(self):
+        total = len(self.items)
+        visible = self.items[self.top:self.top + self.rows]
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(visible))
+        if self.selected is not None and self.top <= self.selected < self.top + self.rows:
+            line = self.selected - self.top + 1
+            self.text.tag_add("selected", f"{line}.0", f"{line}.end")
+        self.text.configure(state="disabled")
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.rows) / total))
+            self.count_label.configure(text=f"{self.top + 1}-{min(total, self.top + self.rows)} / {total}")
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.count_label.configure(text="")
+
+    def jump_to(self, serial):
+        # SerialRange.index 는 순번 계산만 하므로 목록 크기와 상관없이 바로 찾는다
+        if not serial:
+            return False
+        try:
+            index = self.items.index(serial)
+        except ValueError:
+            self.count_label.configure(text="목록에 없는 시리얼 넘버입니다")
+            return False
+        self.selected = index
+        self.set_top(index - self.rows // 2, force=True)
+        return True
+
+    def copy_all(self):
+        if not len(self.items):
+            return
+        self.clipboard_clear()
+        self.clipboard_append("\n".join(self.items))
+        self.count_label.configure(text=f"{len(self.items)}개 복사됨")
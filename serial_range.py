@@ -0,0 +1,103 @@
+import itertools
+from collections.abc import Sequence
+from serial_batch import SEQ_WIDTH, batch_strings, generate_serial_batch, serial_prefix
+from serial_check import add_check, has_check, strip_check
+
+CHUNK_SIZE = 10000
+
+class SerialRange(Sequence):
+    # 한 주문의 시리얼 넘버 범위. 리스트를 만들지 않고 순번에서 바로 계산한다.
+    # check 이면 시리얼 끝에 체크 문자(serial_check)를 붙인다.
+    def __init__(self, maker, category, model_code, year, month, order, start, end, width=SEQ_WIDTH, check=False):
+        self.fields = (maker, category, model_code, year, month, order)
+        self.prefix = serial_prefix(maker, category, model_code, year, month, order)
+        self.width = width
+        self.check = check
+        self.seqs = range(start, end + 1)
+
+    def _derive(self, seqs):
+        sub = object.__new__(SerialRange)
+        sub.fields = self.fields
+        sub.prefix = self.prefix
+        sub.width = self.width
+        sub.check = self.check
+        sub.seqs = seqs
+        return sub
+
+    def serial_at(self, seq):
+        serial = self.prefix + str(seq).zfill(self.width)
+        return add_check(serial) if self.check else serial
+
+    def seq_of(self, serial):
+        return serial[len(self.prefix):len(serial) - self.check]
+
+    def _parse(self, serial):
+        if not isinstance(serial, str) or not serial.startswith(self.prefix):
+            return None
+        if self.check:
+            length = len(self.prefix) + self.width
+            if not has_check(serial, length):
+                return None
+            try:
+                serial = strip_check(serial, length)
+            except ValueError:
+                return None
+        tail = serial[len(self.prefix):]
+        if not (tail.isascii() and tail.isdigit()):
+            return None
+        seq = int(tail)
+        if str(seq).zfill(self.width) != tail or seq not in self.seqs:
+            return None
+        return seq
+
+    def __len__(self):
+        return len(self.seqs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._derive(self.seqs[index])
+        return self.serial_at(self.seqs[index])
+
+    def __iter__(self):
+        # 묶음(chunks) 단위로 한 번에 만든다 (체크 문자도 묶음마다 한 번에 계산)
+        return itertools.chain.from_iterable(self.chunks())
+
+    def __reversed__(self):
+        return map(self.serial_at, reversed(self.seqs))
+
+    def __contains__(self, serial):
+        return self._parse(serial) is not None
+
+    def index(self, serial, start=0, stop=None):
+        seq = self._parse(serial)
+        if seq is not None:
+            i = self.seqs.index(seq)
+            if start <= i and (stop is None or i < stop):
+                return i
+        raise ValueError(f"{serial!r} 는 범위에 없습니다.")
+
+    def count(self, serial):
+        return 1 if serial in self else 0
+
+    def chunks(self, size=CHUNK_SIZE):
+        # 일정 크기씩 리스트로 끊어서 돌려준다 (연속 범위는 한 번에 생성)
+        for i in range(0, len(self.seqs), size):
+            seqs = self.seqs[i:i + size]
+            if seqs.step == 1:
+                yield batch_strings(generate_serial_batch(*self.fields, seqs.start, seqs.stop - 1, self.width, self.check))
+            else:
+                yield [self.serial_at(seq) for seq in seqs]
+
+    def __eq__(self, other):
+        if isinstance(other, SerialRange):
+            return (self.prefix == other.prefix and self.width == other.width
+                    and self.check == other.check and self.seqs == other.seqs)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.prefix, self.width, self.check, self.seqs))
+
+    def __repr__(self):
+        if not self.seqs:
+            return f"SerialRange({self.prefix!r}, empty)"
+        return f"SerialRange({self[0]!r} ~ {self[-1]!r}, {len(self)}개)"
@@ -1,15 +1,19 @@
 import streamlit as st
-import hashlib
-import pandas as pd
-import os
-import barcode
-from barcode.writer import SVGWriter
+import io
 from datetime import datetime
-import zipfile
 import streamlit.components.v1 as components
 from google.oauth2 import service_account
 import json
 import gspread
+from serial_range import SerialRange
+from serial_check import add_check, strip_check
+from zip_stream import ParallelZipWriter
+from barcode_render import LABEL_OPTIONS, barcode_filename, render_barcode_svg, render_barcodes, write_barcodes_zip
+from model_registry import ModelRegistry
+from serial_ledger import SerialLedger
+from sheets_writer import BufferedSheetWriter
+from sheets_index import SheetSerialIndex
+from run_metrics import RunMetrics
 
 # --------------------------
 # 기본 설정
@@ -20,9 +24,9 @@ alpha_dict = {
     '10': 'M', '11': 'N', '12': 'P'
 }
 
-used_codes = set()
-model_code_cache = {}
 model_map_file = "model_map.csv"
+# 시리얼 끝에 체크 문자(mod 23)를 붙인다. 체크 문자가 없는 기존 시리얼도 계속 해석된다
+serial_check = False
 
 maker_dict = {
     "닝보 타이웨이": "NB", "리앤텍": "HL", "마라타": "MT", "웨이슬라": "VS",
@@ -35,6 +39,12 @@ category_dict = {
     "블렌더": "MB", "헤어 드라이기": "MS", "음식물 처리기": "FP"
 }
 
+# 시리얼 해석용 역방향 사전 (호출마다 만들지 않고 한 번만 만든다)
+rev_maker = {v: k for k, v in maker_dict.items()}
+rev_category = {v: k for k, v in category_dict.items()}
+rev_alpha = {v: k for k, v in alpha_dict.items() if len(k) == 1}
+rev_month = {v: k.zfill(2) for k, v in alpha_dict.items() if k != '0'}
+
 # --------------------------
 # Google Sheets 연결 설정
 # --------------------------
@@ -49,70 +59,44 @@ sheet = client.open_by_key(SPREADSHEET_ID).sheet1
 # 유틸 함수
 # --------------------------
 def num_to_alpha(num): return ''.join(alpha_dict[d] for d in str(num))
-def model_to_number(name): return int(hashlib.sha256(name.upper().encode()).hexdigest(), 16)
-def number_to_code(num): return chr(ord('A') + num % 676 // 26) + chr(ord('A') + num % 26)
-
-def get_unique_code(name):
-    name = name.upper()
-    if name in model_code_cache:
-        return model_code_cache[name]
-    base = model_to_number(name)
-    for offset in range(676):
-        code = number_to_code(base + offset)
-        if code not in used_codes:
-            used_codes.add(code)
-            model_code_cache[name] = code
-            return code
-    raise Exception("모든 코드가 소진되었습니다!")
-
-def generate_serial(maker, category, model_code, year, month, order, seq):
-    return f"{maker}{category}{model_code}{num_to_alpha(year[-1])}{alpha_dict[month]}{str(order).zfill(2)}{seq}"
-
-def generate_barcode_svg(serial):
-    CODE128 = barcode.get_barcode_class('code128')
-    writer = SVGWriter()
-    writer.set_options({
-        "module_width": 0.6,
-        "module_height": 80.0,
-        "font_size": 20,
-        "text_distance": 5.0,
-        "quiet_zone": 2.0,
-        "write_text": True
-    })
-    barcode_obj = CODE128(serial, writer=writer)
-    filename = barcode_obj.save(f"barcode_{serial}")
-    return filename
+
+@st.cache_resource
+def get_model_allocator():
+    return ModelRegistry(model_map_file)
+
+def get_unique_code(name): return get_model_allocator().allocate(name)
+
+@st.cache_resource
+def get_ledger():
+    return SerialLedger()
+
+def generate_serial(maker, category, model_code, year, month, order, seq, check=False):
+    serial = f"{maker}{category}{model_code}{num_to_alpha(year[-1])}{alpha_dict[month]}{str(order).zfill(2)}{seq}"
+    return add_check(serial) if check else serial
 
 def save_model_mapping(name, code):
     try:
-        if os.path.exists(model_map_file):
-            df = pd.read_csv(model_map_file)
-            if not ((df['모델코드'] == code) & (df['모델명'] == name)).any():
-                df = pd.concat([df, pd.DataFrame([{"모델코드": code, "모델명": name}])], ignore_index=True)
-        else:
-            df = pd.DataFrame([{"모델코드": code, "모델명": name}])
-        df.to_csv(model_map_file, index=False)
+        get_model_allocator().save(name, code)
     except Exception as e:
         print(f"[모델 매핑 저장 오류] {e}")
 
-def append_serial_to_sheet(serial_data: dict):
-    try:
-        row = [
-            serial_data.get("시리얼넘버"), serial_data.get("제조사"), serial_data.get("제품 카테고리"),
-            serial_data.get("모델명"), serial_data.get("제조년도"), serial_data.get("제조월"),
-            serial_data.get("주문차수"), serial_data.get("생산순서")
-        ]
-        sheet.append_row(row)
-    except Exception as e:
-        st.error(f"[❌ Google Sheets 저장 실패] {e}")
+def append_serials_to_sheet(records):
+    # 행마다 append_row 하지 않고 묶어서 append_rows 로 올린다 (속도 제한/재시도 포함).
+    # 시트에 이미 있는 시리얼은 건너뛰므로 다시 올려도 중복되지 않는다
+    writer = BufferedSheetWriter(sheet, skip=get_sheet_index())
+    writer.extend(records)
+    result = writer.close()
+    for rows, e in writer.failures:
+        st.error(f"[❌ Google Sheets 저장 실패] {rows[0][0]} ~ {rows[-1][0]} ({len(rows)}개): {e}")
+    return result
+
+@st.cache_resource
+def get_sheet_index():
+    return SheetSerialIndex(sheet, ttl=60)
 
 def search_serial_from_sheet(serial_number: str):
     try:
-        records = sheet.get_all_records()
-        for row in records:
-            if row.get("시리얼넘버") == serial_number:
-                return row
-        return None
+        return get_sheet_index().lookup(serial_number)
     except Exception as e:
         st.error(f"[❌ Google Sheets 조회 실패] {e}")
         return None
@@ -125,13 +109,12 @@ def guess_full_year(d):
 
 def lookup_model_name(code):
     try:
-        if not os.path.exists(model_map_file): return "(매핑 없음)"
-        df = pd.read_csv(model_map_file)
-        return df[df['모델코드'] == code].iloc[0]['모델명'] if not df[df['모델코드'] == code].empty else "(매핑 없음)"
+        return get_model_allocator().name_of(code) or "(매핑 없음)"
     except Exception as e: return f"(에러: {e})"
 
 def decode_serial(serial):
     try:
+        serial = strip_check(serial)
         maker_code = serial[0:2]
         category_code = serial[2:4]
         model_code = serial[4:6]
@@ -140,18 +123,10 @@ def decode_serial(serial):
         order = serial[8:10]
         sequence = serial[10:]
 
-        rev_maker = {v: k for k, v in maker_dict.items()}
-        rev_category = {v: k for k, v in category_dict.items()}
-        rev_alpha = {v: k for k, v in alpha_dict.items()}
-
         year_digit = rev_alpha.get(year_alpha, None)
         full_year = guess_full_year(year_digit) if year_digit else "Unknown"
 
-        month_digit = rev_alpha.get(month_alpha, None)
-        if month_digit and month_digit.isdigit():
-            month = month_digit.zfill(2)
-        else:
-            month = "Unknown"
+        month = rev_month.get(month_alpha, "Unknown")
 
         model_name = lookup_model_name(model_code)
 
@@ -211,40 +186,43 @@ if st.button("✅ 시리얼 넘버 생성"):
                 maker_code = maker_dict[maker_name]
                 category_code = category_dict[category_name]
 
-                results, records, serial_list = [], [], []
-                for i in range(start, end + 1):
-                    seq = str(i).zfill(5)
-                    serial = generate_serial(maker_code, category_code, model_code, year, month.lstrip("0"), order, seq)
-                    svg_path = generate_barcode_svg(serial)
-                    results.append((serial, svg_path))
-                    serial_list.append(serial)
-
-                    # ✅ Google Sheets에 실시간 저장
-                    append_serial_to_sheet({
-                        "시리얼넘버": serial,
-                        "제조사": maker_name,
-                        "제품 카테고리": category_name,
-                        "모델명": model,
-                        "제조년도": year,
-                        "제조월": month,
-                        "주문차수": order,
-                        "생산순서": seq
-                    })
+                serial_list = SerialRange(maker_code, category_code, model_code, year, month.lstrip("0"), order, start, end, check=serial_check)
+                records = [{
+                    "시리얼넘버": serial,
+                    "제조사": maker_name,
+                    "제품 카테고리": category_name,
+                    "모델명": model,
+                    "제조년도": year,
+                    "제조월": month,
+                    "주문차수": order,
+                    "생산순서": serial_list.seq_of(serial)
+                } for serial in serial_list]
+                metrics = RunMetrics()
+                # 장부(SQLite)에 먼저 기록하고, 시트는 장부의 사본으로 저장한다
+                with metrics.stage("ledger"):
+                    get_ledger().insert_order(records, source="streamlit")
+                # ✅ Google Sheets에 저장
+                with metrics.stage("sheets"):
+                    sheet_result = append_serials_to_sheet(records)
+                metrics.count("sheet_rows", sheet_result["written"])
 
                 st.session_state["serial_list"] = serial_list
-                st.success(f"총 {len(results)}개의 시리얼 넘버를 생성했습니다.")
+                st.success(f"총 {len(serial_list)}개의 시리얼 넘버를 생성했습니다.")
 
-                if len(results) > 1:
+                # 바코드는 디스크에 남기지 않고 메모리에서 바로 내려받게 한다
+                if len(serial_list) > 1:
                     zip_name = "barcodes_download.zip"
-                    with zipfile.ZipFile(zip_name, 'w') as zipf:
-                        for _, path in results:
-                            zipf.write(path)
-                    with open(zip_name, "rb") as zf:
-                        st.download_button("ZIP 파일 다운로드", data=zf, file_name=zip_name, mime="application/zip")
+                    zip_buffer = io.BytesIO()
+                    with metrics.stage("zip"), ParallelZipWriter(zip_buffer) as zipf:
+                        write_barcodes_zip(zipf, render_barcodes(serial_list, LABEL_OPTIONS))
+                    metrics.add_bytes("output", zip_buffer.getbuffer().nbytes)
+                    st.download_button("ZIP 파일 다운로드", data=zip_buffer.getvalue(), file_name=zip_name, mime="application/zip")
                 else:
-                    serial, path = results[0]
-                    with open(path, "rb") as f:
-                        st.download_button(f"{serial} 바코드 다운로드", data=f, file_name=os.path.basename(path), mime="image/svg+xml")
+                    serial = serial_list[0]
+                    svg = render_barcode_svg(serial, LABEL_OPTIONS)
+                    st.download_button(f"{serial} 바코드 다운로드", data=svg, file_name=barcode_filename(serial), mime="image/svg+xml")
+                with st.expander("⏱ 단계별 소요 시간"):
+                    st.code("\n".join(metrics.finish().summary_lines()))
             except Exception as e:
                 st.error(f"에러 발생: {e}")
 
@@ -259,16 +237,26 @@ if "serial_list" in st.session_state:
     """, height=60)
 
 st.subheader("🔍 시리얼 넘버 조회")
-decode_input = st.text_input("시리얼 넘버 입력 (최대 15자리)", max_chars=15, key="decode_input")
+decode_input = st.text_input("시리얼 넘버 입력 (최대 16자리)", max_chars=16, key="decode_input")
 if st.button("조회"):
     if decode_input:
         serial = decode_input.strip()
-        record = search_serial_from_sheet(serial)
-        if record:
-            st.success("📄 등록된 시리얼 넘버입니다.")
-            for k, v in record.items():
-                st.write(f"{k}: {v}")
+        # 체크 문자가 틀리거나 모양이 잘못된 시리얼은 시트를 조회하지 않고 바로 알려준다
+        try:
+            strip_check(serial)
+        except ValueError as e:
+            st.error(f"❌ {e}")
         else:
-            st.error("❌ 조회하신 시리얼 넘버는 존재하지 않는 시리얼 넘버입니다.")
+            record = search_serial_from_sheet(serial)
+            if record:
+                st.success("📄 등록된 시리얼 넘버입니다.")
+                for k, v in record.items():
+                    st.write(f"{k}: {v}")
+            else:
+                st.error("❌ 조회하신 시리얼 넘버는 존재하지 않는 시리얼 넘버입니다.")
     else:
-        st.warning("시리얼 넘버를 입력해주세요.")
\ No newline at end of file
+        st.warning("시리얼 넘버를 입력해주세요.")
+if st.button("시트 다시 읽기"):
+    # 시트에서 행을 지우거나 고쳤을 때 인덱스를 처음부터 다시 만든다
+    get_sheet_index().invalidate()
+    st.info("다음 조회 때 시트를 처음부터 다시 읽습니다.")
@@ -0,0 +1,76 @@
+import threading
+import time
+
+SERIAL_KEY = "시리얼넘버"
+
+def _col_letter(n):
+    # 1 -> A, 27 -> AA
+    letters = ""
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+class SheetSerialIndex:
+    # 시트 전체를 매번 내려받지 않고, 시리얼넘버 -> 행 dict 인덱스를 메모리에 들고 있는다.
+    # 새로 고칠 때는 마지막으로 읽은 행 다음부터만 가져온다 (시트는 뒤에 붙이기만 한다고 가정).
+    # ttl 초가 지나면 조회 전에 새로 고치고, 없는 시리얼은 한 번 더 새로 고쳐 본 뒤 None 을 돌려준다.
+    # 행을 지우거나 고친 경우에는 invalidate() 로 처음부터 다시 읽게 한다.
+    def __init__(self, worksheet, ttl=60, key=SERIAL_KEY, min_interval=1.0, clock=time.monotonic):
+        self.worksheet = worksheet
+        self.ttl = ttl
+        self.key = key
+        self.min_interval = min_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.invalidate()
+
+    def invalidate(self):
+        self.header = None
+        self.index = {}
+        self.rows_read = 0
+        self.refreshed_at = None
+
+    def refresh(self):
+        with self._lock:
+            if self.header is None:
+                self.header = [h for h in self.worksheet.row_values(1) if h != ""]
+                self.rows_read = 1
+            if not self.header:
+                self.header = None
+                self.refreshed_at = self.clock()
+                return 0
+            start = self.rows_read + 1
+            values = self.worksheet.get_values(f"A{start}:{_col_letter(len(self.header))}")
+            header = self.header
+            width = len(header)
+            key_col = header.index(self.key)
+            for row in values:
+                row = list(row) + [""] * (width - len(row))
+                if row[key_col]:
+                    self.index[row[key_col]] = dict(zip(header, row))
+            self.rows_read += len(values)
+            self.refreshed_at = self.clock()
+            return len(values)
+
+    def _stale(self):
+        return self.refreshed_at is None or self.clock() - self.refreshed_at >= self.ttl
+
+    def lookup(self, serial):
+        if self._stale():
+            self.refresh()
+        record = self.index.get(serial)
+        if record is None and self.clock() - self.refreshed_at >= self.min_interval:
+            # 방금 다른 곳에서 추가됐을 수 있으니 새 행만 한 번 더 읽어 본다
+            self.refresh()
+            record = self.index.get(serial)
+        return record
+
+    def __contains__(self, serial):
+        # lookup 과 달리 없는 시리얼이라고 새로 고치지는 않는다 (많은 시리얼을 한꺼번에 확인할 때)
+        if self._stale():
+            self.refresh()
+        return serial in self.index
+
+    def __len__(self):
+        return len(self.index)
@@ -0,0 +1,149 @@
+import threading
+import time
+
+# 시트 열 순서 (Google Sheets 첫 행과 같다)
+SHEET_COLUMNS = ["시리얼넘버", "제조사", "제품 카테고리", "모델명", "제조년도", "제조월", "주문차수", "생산순서"]
+
+# Google Sheets 쓰기 한도는 사용자당 분당 60회 정도라 기본값은 그보다 조금 낮게 잡는다
+WRITER_OPTIONS = {
+    "chunk_size": 500,
+    "rate": 0.9,
+    "burst": 5,
+    "retries": 5,
+    "backoff": 1.0,
+    "max_backoff": 32.0,
+}
+
+# 요청이 처리되지 않은 것이 확실한 응답 (그대로 다시 보내도 된다)
+RETRY_STATUS = {408, 429}
+# 서버 오류/연결 끊김은 시트에 이미 붙었을 수 있다. append 는 두 번 보내면 두 번 붙으므로
+# 시트 끝을 다시 읽어서 이미 올라간 행을 뺀 뒤에만 다시 보낸다
+UNCERTAIN_STATUS = {500, 502, 503, 504}
+
+def sheet_row(record, columns=SHEET_COLUMNS):
+    return [record.get(col) for col in columns]
+
+def _status(exc):
+    # gspread.exceptions.APIError 는 response.status_code 를 가진다
+    return getattr(getattr(exc, "response", None), "status_code", None)
+
+def is_retryable(exc):
+    return _status(exc) in RETRY_STATUS
+
+def is_uncertain(exc):
+    status = _status(exc)
+    if status is not None:
+        return status in UNCERTAIN_STATUS
+    return isinstance(exc, (ConnectionError, TimeoutError))
+
+class TokenBucket:
+    # 초당 rate 개씩 토큰이 차고 최대 burst 개까지 쌓인다. acquire() 는 토큰이 생길 때까지 기다린다.
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, n=1):
+        with self._lock:
+            while True:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n - 1e-9:
+                    self.tokens -= n
+                    return
+                self.sleep((n - self.tokens) / self.rate)
+
+class BufferedSheetWriter:
+    # 행을 모아두었다가 append_rows 한 번에 chunk_size 개씩 올린다.
+    # 호출 전에는 토큰 버킷으로 속도를 맞추고, 408/429 는 지수 백오프로 다시 시도한다.
+    # 5xx/연결 오류는 skip 인덱스로 시트 끝을 다시 읽어 이미 붙은 행을 뺀 뒤에만 다시 보내고,
+    # 인덱스가 없으면 다시 보내지 않는다. 끝까지 실패한 묶음은 failures 에 (행 목록, 예외) 로 남긴다.
+    # skip 에 SheetSerialIndex 를 주면 시트에 이미 있는 시리얼은 다시 올리지 않는다 (다시 실행해도 중복 없음).
+    def __init__(self, worksheet, options=None, sleep=time.sleep, clock=time.monotonic, skip=None):
+        opts = dict(WRITER_OPTIONS, **(options or {}))
+        self.worksheet = worksheet
+        self.chunk_size = opts["chunk_size"]
+        self.retries = opts["retries"]
+        self.backoff = opts["backoff"]
+        self.max_backoff = opts["max_backoff"]
+        self.sleep = sleep
+        self.bucket = TokenBucket(opts["rate"], opts["burst"], clock=clock, sleep=sleep)
+        self.skip = skip
+        self.buffer = []
+        self.written = 0
+        self.skipped = 0
+        self.requests = 0
+        self.failures = []
+
+    @property
+    def failed(self):
+        return sum(len(rows) for rows, _ in self.failures)
+
+    def add(self, row):
+        if isinstance(row, dict):
+            row = sheet_row(row)
+        if self.skip is not None and row[0] in self.skip:
+            self.skipped += 1
+            return
+        self.buffer.append(row)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def flush(self):
+        while self.buffer:
+            chunk = self.buffer[:self.chunk_size]
+            del self.buffer[:self.chunk_size]
+            self._send(chunk)
+
+    def _send(self, rows):
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            self.requests += 1
+            try:
+                self.worksheet.append_rows(rows, value_input_option="RAW")
+                self.written += len(rows)
+                return True
+            except Exception as e:
+                uncertain = is_uncertain(e) and hasattr(self.skip, "refresh")
+                if attempt == self.retries or not (is_retryable(e) or uncertain):
+                    self.failures.append((rows, e))
+                    return False
+                self.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+                if uncertain:
+                    try:
+                        rows = self._unsent(rows)
+                    except Exception:
+                        # 확인할 수 없으면 두 번 붙을 수 있으므로 보내지 않는다
+                        self.failures.append((rows, e))
+                        return False
+                    if not rows:
+                        return True
+
+    def _unsent(self, rows):
+        # 실패한 것처럼 보였지만 시트에 붙은 행은 올린 것으로 세고, 안 붙은 행만 돌려준다
+        self.skip.refresh()
+        remaining = [row for row in rows if row[0] not in self.skip]
+        self.written += len(rows) - len(remaining)
+        return remaining
+
+    def close(self):
+        # 남은 행을 올리고 {"written": 성공 행 수, "failed": 실패 행 수, "skipped": 이미 있던 행 수} 를 돌려준다
+        self.flush()
+        return {"written": self.written, "failed": self.failed, "skipped": self.skipped}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
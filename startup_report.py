@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# GUI 모듈을 읽는 데 (창을 만들기 전까지) 걸려도 되는 시간. 공장 PC 에서 1초 안에 창이 떠야 한다
+STARTUP_BUDGET = 0.5
+# 시작할 때 읽으면 안 되는 모듈 (저장/바코드 생성 때 처음 읽는다)
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl", "barcode"]
+DEFAULT_TARGETS = ["serial_gui_app.py", "serial_gui_app_v1.1.py"]
+
+# 대상 파일을 __main__ 이 아닌 모듈로 읽어서 (창은 띄우지 않음) 걸린 시간과 읽힌 무거운 모듈을 출력한다
+MARKER = "startup-report: target"
+LOADER = """
+import importlib.util, json, sys, time
+MARKER = %r
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location("startup_target", sys.argv[1])
+sys.stderr.write(MARKER + "\\n")
+sys.stderr.flush()
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in sys.argv[2:] if m in sys.modules]}))
+""" % MARKER
+
+def parse_importtime(text):
+    # 대상 파일을 읽기 시작한 뒤의 "import time: self [us] | cumulative | imported package" 줄만 모은다
+    modules = []
+    if MARKER in text:
+        text = text.split(MARKER, 1)[1]
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        modules.append({"module": name.strip(), "self": int(parts[0]) / 1e6,
+                        "cumulative": int(parts[1]) / 1e6, "depth": depth})
+    return modules
+
+def measure(path, runs=3, heavy=HEAVY_MODULES):
+    # 여러 번 실행해서 가장 빠른 값을 쓴다 (처음 한 번은 디스크 캐시 때문에 느리다)
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", LOADER, path, *heavy],
+                              capture_output=True, text=True, encoding="utf-8", errors="replace")
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+            return {"target": path, "error": error}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result["elapsed"] < best["elapsed"]:
+            best = dict(result, imports=parse_importtime(proc.stderr))
+    return {"target": path, **best}
+
+def top_imports(report, count=10):
+    # 대상 파일이 직접 읽은 (depth 0) 모듈 중 오래 걸린 순서
+    top = [m for m in report["imports"] if m["depth"] == 0]
+    return sorted(top, key=lambda m: m["cumulative"], reverse=True)[:count]
+
+def check(report, budget=STARTUP_BUDGET):
+    problems = []
+    if "error" in report:
+        return [f"읽을 수 없습니다: {report['error']}"]
+    if report["elapsed"] > budget:
+        problems.append(f"시작 시간 {report['elapsed']:.3f}초가 예산 {budget:.3f}초를 넘었습니다")
+    if report["loaded"]:
+        problems.append(f"시작할 때 무거운 모듈을 읽습니다: {', '.join(report['loaded'])}")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GUI 시작 시간(import 시간) 보고서. 예산을 넘거나 무거운 모듈을 미리 읽으면 실패합니다.")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS, help="검사할 GUI 파일")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET, help="허용하는 import 시간 (초)")
+    parser.add_argument("--runs", type=int, default=3, help="측정 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--top", type=int, default=10, help="오래 걸린 import 몇 개를 보여줄지")
+    parser.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    failed = False
+    reports = []
+    for target in args.targets:
+        report = measure(os.path.abspath(target), args.runs)
+        problems = check(report, args.budget)
+        failed = failed or bool(problems)
+        reports.append({"target": target, "elapsed": report.get("elapsed"), "budget": args.budget,
+                        "loaded": report.get("loaded", []), "problems": problems,
+                        "top": top_imports(report, args.top) if "imports" in report else []})
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        for r in reports:
+            status = "실패" if r["problems"] else "통과"
+            elapsed = f"{r['elapsed']:.3f}초" if r["elapsed"] is not None else "-"
+            print(f"[{status}] {r['target']}: {elapsed} (예산 {r['budget']:.3f}초)")
+            for m in r["top"]:
+                print(f"    {m['cumulative'] * 1000:8.1f} ms  {m['module']}")
+            for problem in r["problems"]:
+                print(f"    ! {problem}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
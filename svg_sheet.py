@@ -0,0 +1,133 @@
+from code128_svg import CODE_RUNS, STOP_RUNS, encode
+
+# 라벨 용지 규격 (mm). 기본값은 A4 3열 x 7행 (63.5 x 38.1mm) 라벨지
+LABEL_STOCK = {
+    "page_width": 210.0,
+    "page_height": 297.0,
+    "label_width": 63.5,
+    "label_height": 38.1,
+    "columns": 3,
+    "rows": 7,
+    "margin_left": 7.2,
+    "margin_top": 15.1,
+    "gap_x": 2.5,
+    "gap_y": 0.0,
+    "padding": 2.0,
+}
+
+# 라벨 안 바코드 옵션 (라벨보다 크면 라벨에 맞게 줄인다)
+SHEET_OPTIONS = {
+    "module_width": 0.3,
+    "module_height": 20.0,
+    "font_size": 9,
+    "text_distance": 1.5,
+}
+
+PT_TO_MM = 0.352777778
+
+def _num(value):
+    return f"{value:.3f}".rstrip("0").rstrip(".")
+
+def _runs_def(def_id, runs):
+    rects = []
+    x = 0
+    for run in runs:
+        if run > 0:
+            rects.append(f'<rect x="{x}" width="{run}" height="1"/>')
+        x += abs(run)
+    return f'<g id="{def_id}">{"".join(rects)}</g>'
+
+def _symbol_uses(values, start=0):
+    # 심볼 하나는 항상 11 모듈 폭
+    return "".join(f'<use xlink:href="#c{v}" x="{start + i * 11}"/>' for i, v in enumerate(values))
+
+def _common_prefix(lists):
+    first = lists[0]
+    n = len(first)
+    for other in lists[1:]:
+        n = min(n, len(other))
+        for i in range(n):
+            if first[i] != other[i]:
+                n = i
+                break
+    return first[:n]
+
+def labels_per_page(stock=None):
+    stock = stock or LABEL_STOCK
+    return stock["columns"] * stock["rows"]
+
+def render_sheet(serials, stock=None, options=None):
+    # 라벨 한 페이지 분량의 시리얼을 SVG 한 장으로 그린다.
+    # 바 패턴은 <defs> 에 한 번만 정의하고 라벨마다 <use> 로 배치한다.
+    stock = dict(LABEL_STOCK, **(stock or {}))
+    opts = dict(SHEET_OPTIONS, **(options or {}))
+    encoded = [encode(serial) for serial in serials]
+
+    pad = stock["padding"]
+    inner_w = stock["label_width"] - 2 * pad
+    inner_h = stock["label_height"] - 2 * pad
+    font_mm = opts["font_size"] * PT_TO_MM
+    text_h = font_mm + opts["text_distance"] if opts["font_size"] else 0
+
+    used = set()
+    for values in encoded:
+        used.update(values)
+
+    # 한 페이지 안에서 공통인 앞부분(제조사~주문차수)은 통째로 한 번만 정의한다
+    prefix = _common_prefix(encoded) if len(encoded) > 1 else []
+    defs = [_runs_def(f"c{v}", CODE_RUNS[v]) for v in sorted(used)]
+    defs.append(_runs_def("stop", STOP_RUNS))
+    if prefix:
+        defs.append(f'<g id="p">{_symbol_uses(prefix)}</g>')
+
+    labels = []
+    for i, (serial, values) in enumerate(zip(serials, encoded)):
+        col = i % stock["columns"]
+        row = i // stock["columns"]
+        lx = stock["margin_left"] + col * (stock["label_width"] + stock["gap_x"])
+        ly = stock["margin_top"] + row * (stock["label_height"] + stock["gap_y"])
+
+        n_modules = len(values) * 11 + 13
+        module_width = min(opts["module_width"], inner_w / n_modules)
+        bar_height = max(0.0, min(opts["module_height"], inner_h - text_h))
+        bar_x = (stock["label_width"] - n_modules * module_width) / 2
+        bar_y = pad + (inner_h - bar_height - text_h) / 2
+
+        uses = _symbol_uses(values[len(prefix):], len(prefix) * 11)
+        if prefix:
+            uses = '<use xlink:href="#p"/>' + uses
+        uses += f'<use xlink:href="#stop" x="{len(values) * 11}"/>'
+        label = (
+            f'<g transform="translate({_num(lx)},{_num(ly)})">'
+            f'<g transform="translate({_num(bar_x)},{_num(bar_y)}) scale({_num(module_width)},{_num(bar_height)})">'
+            f'{uses}</g>'
+        )
+        if opts["font_size"]:
+            tx = stock["label_width"] / 2
+            ty = bar_y + bar_height + opts["text_distance"] + font_mm
+            label += f'<text x="{_num(tx)}" y="{_num(ty)}">{serial}</text>'
+        labels.append(label + "</g>")
+
+    w = _num(stock["page_width"])
+    h = _num(stock["page_height"])
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{w}mm" height="{h}mm" viewBox="0 0 {w} {h}">\n'
+        f'<style>text{{font-family:monospace;font-size:{_num(font_mm)}px;text-anchor:middle;fill:black}}</style>\n'
+        '<defs>\n' + "\n".join(defs) + '\n</defs>\n'
+        '<rect width="100%" height="100%" fill="white"/>\n'
+        + "\n".join(labels) + '\n</svg>\n'
+    ).encode("utf-8")
+
+def render_sheets(serials, stock=None, options=None):
+    # 라벨지 한 장 분량씩 끊어서 페이지별 SVG 를 돌려준다
+    per_page = labels_per_page(dict(LABEL_STOCK, **(stock or {})))
+    page = []
+    for serial in serials:
+        page.append(serial)
+        if len(page) == per_page:
+            yield render_sheet(page, stock, options)
+            page = []
+    if page:
+        yield render_sheet(page, stock, options)
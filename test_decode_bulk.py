@@ -0,0 +1,22 @@
+from decode_bulk import decode_many
+from serial_check import add_check
+
+GOOD = "LAMHOLFN0100001"
+
+def _errors(serials):
+    return decode_many(serials, model_names={})["오류"].tolist()
+
+def test_valid_serials_have_no_error():
+    assert _errors([GOOD, add_check(GOOD)]) == ["", ""]
+
+def test_garbage_of_right_length_is_flagged():
+    assert _errors(["XXXXXXXXXXXXXXX"]) == [
+        "제조사 코드 오류, 카테고리 코드 오류, 제조년도 오류, 제조월 오류, 주문차수 오류, 생산순서 오류"]
+
+def test_each_field_is_checked():
+    assert _errors(["ZZMHOLFN0100001", "LAZZOLFN0100001", "LAMHOLQN0100001", "LAMHOLFQ0100001",
+                    "LAMHOLFNA100001", "LAMHOLFN01000X1"]) == [
+        "제조사 코드 오류", "카테고리 코드 오류", "제조년도 오류", "제조월 오류", "주문차수 오류", "생산순서 오류"]
+
+def test_length_and_check_errors():
+    assert _errors(["SHORT", "", add_check(GOOD)[:-1] + "0"]) == ["길이 오류", "길이 오류", "체크 문자 오류"]
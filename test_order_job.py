@@ -0,0 +1,139 @@
+import os
+import zipfile
+import pytest
+from openpyxl import load_workbook
+import order_job
+import serial_ledger
+import seq_counter
+from order_job import RecoveredOrderError, run_order
+from serial_range import SerialRange
+
+COUNT = 35
+CHUNK = 10
+CRASH_AT = 25
+
+class Crash(Exception):
+    # 프로그램이 죽은 것처럼 멈춘다 (JobCancelled/DuplicateSerialError 가 아니므로 진행 기록이 남는다)
+    pass
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # 장부/카운터/진행 기록은 현재 폴더 기준이므로 시험마다 빈 폴더에서 새로 연다
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(serial_ledger, "_ledgers", {})
+    monkeypatch.setattr(seq_counter, "_counters", {})
+    monkeypatch.setattr(order_job, "PROGRESS_EVERY", 1)
+    return tmp_path
+
+def _serials():
+    return SerialRange("LA", "MH", "OL", "2025", "11", "1", 1, COUNT)
+
+def _job(serials, output, path, **extra):
+    def records():
+        return ({"시리얼넘버": serial, "생산순서": serials.seq_of(serial)} for serial in serials)
+    return dict({"serials": serials, "records": records, "output": output, "output_path": path,
+                 "render_workers": 1, "chunk_size": CHUNK}, **extra)
+
+def _crash_at(count):
+    def progress(stage, done, total):
+        if stage in ("바코드", "라벨") and done >= count:
+            raise Crash()
+    return progress
+
+def _zip_contents(path):
+    with zipfile.ZipFile(path) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+def _svg_contents(folder):
+    return {name: open(os.path.join(folder, name), "rb").read() for name in sorted(os.listdir(folder))}
+
+def _ledger_count(serials):
+    return sum(serial_ledger.get_ledger().exists(serial) for serial in serials)
+
+def _leftovers(folder="."):
+    return [name for name in os.listdir(folder) if name.endswith(".part") or name.endswith(".chunks")]
+
+def _resume_after_crash(output, path):
+    serials = _serials()
+    with pytest.raises(Crash):
+        run_order(_job(serials, output, path), progress=_crash_at(CRASH_AT))
+    assert _ledger_count(serials) == 0
+    result = run_order(_job(serials, output, path))
+    assert result["resumed"]
+    assert _ledger_count(serials) == COUNT
+    return result
+
+def _fresh(monkeypatch, output, path):
+    # 같은 작업을 중단 없이 한 번에 만든 결과 (다른 폴더, 빈 장부에서)
+    os.makedirs("fresh")
+    monkeypatch.chdir("fresh")
+    monkeypatch.setattr(serial_ledger, "_ledgers", {})
+    result = run_order(_job(_serials(), output, path, journal=None))
+    monkeypatch.chdir("..")
+    return os.path.join("fresh", path), result
+
+def test_zip_resumes_from_last_chunk(monkeypatch):
+    result = _resume_after_crash("zip", "order.zip")
+    # 기록된 두 묶음(20개)은 다시 그리지 않는다
+    assert result["metrics"]["counters"]["barcodes"] == COUNT - 2 * CHUNK
+    names = sorted(_zip_contents("order.zip"))
+    assert names == sorted(f"barcode_{serial}.svg" for serial in _serials())
+    assert _zip_contents("order.zip") == _zip_contents(_fresh(monkeypatch, "zip", "order.zip")[0])
+    assert _leftovers() == [] and not os.listdir(".serial_journal")
+
+def test_svg_resumes_from_last_chunk(monkeypatch):
+    result = _resume_after_crash("svg", "svgs")
+    assert result["metrics"]["counters"]["barcodes"] == COUNT - 2 * CHUNK
+    resumed = _svg_contents("svgs")
+    assert sorted(resumed) == sorted(f"barcode_{serial}.svg" for serial in _serials())
+    assert resumed == _svg_contents(_fresh(monkeypatch, "svg", "svgs")[0])
+    assert _leftovers("svgs") == []
+
+def test_zpl_resume_is_byte_identical(monkeypatch):
+    result = _resume_after_crash("zpl", "labels.zpl")
+    assert result["metrics"]["counters"]["labels"] == COUNT - 2 * CHUNK
+    fresh, _ = _fresh(monkeypatch, "zpl", "labels.zpl")
+    assert open("labels.zpl", "rb").read() == open(fresh, "rb").read()
+    assert _leftovers() == []
+
+def _crash_after_ledger(monkeypatch, serials, output, path, excel=None):
+    def crash(self):
+        raise Crash()
+    with monkeypatch.context() as m:
+        m.setattr(order_job._Staging, "commit", crash)
+        with pytest.raises(Crash):
+            run_order(_job(serials, output, path, excel_file=excel))
+    assert _ledger_count(serials) == COUNT
+    assert os.path.exists(path + ".part")
+
+def test_crash_after_ledger_same_job_finishes(monkeypatch):
+    serials = _serials()
+    _crash_after_ledger(monkeypatch, serials, "zip", "order.zip", "orders.xlsx")
+    result = run_order(_job(serials, "zip", "order.zip", excel_file="orders.xlsx"))
+    assert result["resumed"] and result["outputs"] == [os.path.abspath("order.zip")]
+    assert len(_zip_contents("order.zip")) == COUNT
+    assert result["metrics"]["counters"].get("barcodes", 0) == 0
+    assert load_workbook("orders.xlsx").active.max_row == COUNT + 1
+
+def test_crash_after_ledger_rerun_with_new_name_keeps_files(monkeypatch):
+    # GUI 는 날짜가 들어간 파일 이름을 쓰므로 다음 날 다시 실행하면 이름이 달라진다
+    serials = _serials()
+    _crash_after_ledger(monkeypatch, serials, "zip", "o_261017.zip")
+    with pytest.raises(RecoveredOrderError) as error:
+        run_order(_job(serials, "zip", "o_261018.zip"))
+    assert error.value.paths == [os.path.abspath("o_261017.zip")]
+    assert len(_zip_contents("o_261017.zip")) == COUNT
+    assert not os.path.exists("o_261018.zip") and _leftovers() == []
+    assert not os.listdir(".serial_journal")
+
+def test_rerun_with_different_outputs_starts_fresh():
+    serials = _serials()
+    with pytest.raises(Crash):
+        run_order(_job(serials, "zip", "order.zip"), progress=_crash_at(CRASH_AT))
+    assert os.path.isdir("order.zip.chunks")
+    result = run_order(_job(serials, "zpl", "labels.zpl"))
+    assert not result["resumed"]
+    assert result["metrics"]["counters"]["labels"] == COUNT
+    assert not os.path.exists("order.zip") and _leftovers() == []
+    assert open("labels.zpl", "rb").read().count(b"^XA") == COUNT
+    assert _ledger_count(serials) == COUNT
@@ -0,0 +1,41 @@
+import json
+import pytest
+from seq_counter import SeqCounter
+
+@pytest.fixture
+def counter(tmp_path):
+    counter = SeqCounter(str(tmp_path / "counter.json"), legacy_path=None, block_size=100)
+    yield counter
+    counter.release()
+
+def _state(counter):
+    with open(counter.path, encoding="utf-8") as f:
+        return json.load(f)
+
+def test_release_last_taken_range_is_taken_again(counter):
+    assert counter.take(10) == (1, 10)
+    assert counter.take(5) == (11, 15)
+    counter.release_range(11, 15)
+    assert counter.take(5) == (11, 15)
+
+def test_release_earlier_range_goes_to_free_list(counter):
+    counter.take(10)
+    counter.take(10)
+    counter.release_range(1, 10)
+    assert _state(counter)["free"] == [[1, 10]]
+    counter.release()
+    # 블록을 반납하면 남은 번호와 합쳐져서 처음부터 다시 나간다
+    assert counter.take(10) == (1, 10)
+
+def test_release_after_lease_is_returned(counter):
+    counter.take(10)
+    counter.release()
+    counter.release_range(1, 10)
+    assert _state(counter)["next"] == 1
+    assert counter.take(3) == (1, 3)
+
+def test_release_refuses_numbers_never_issued(counter):
+    counter.take(10)
+    counter.release()
+    with pytest.raises(ValueError):
+        counter.release_range(50, 60)
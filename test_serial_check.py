@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from serial_check import SERIAL_CHARS, add_check, check_bytes, check_char, strip_check
+
+BASES = ["LAMHBNFN0100001", "LAMHBNF0N100001", "HLMCAAMP1299999", "ZZ0123456789ABC"]
+
+def _swaps(serial):
+    for i in range(len(serial) - 1):
+        if serial[i] != serial[i + 1]:
+            yield serial[:i] + serial[i + 1] + serial[i] + serial[i + 2:]
+
+def test_november_order_swap():
+    # 11월(N) 다음 주문차수 0 이 뒤바뀐 경우 (예전 23 나머지 방식이 놓치던 경우)
+    serial = add_check("LAMHBNFN0100001")
+    swapped = serial[:7] + serial[8] + serial[7] + serial[9:]
+    with pytest.raises(ValueError):
+        strip_check(swapped)
+
+@pytest.mark.parametrize("base", BASES)
+def test_every_adjacent_swap_of_check_serial(base):
+    # 체크 문자를 포함한 모든 이웃 자리 맞바꿈
+    serial = add_check(base)
+    for swapped in _swaps(serial):
+        with pytest.raises(ValueError):
+            strip_check(swapped)
+
+def test_every_adjacent_pair_of_alphabet():
+    # 모든 자리에서 0-9/A-Z 의 모든 두 문자 쌍 (a, b) 를 (b, a) 로 바꿔도 체크 문자가 달라진다
+    base = "LAMHBNFN0100001"
+    for i in range(len(base) - 1):
+        for a in SERIAL_CHARS:
+            for b in SERIAL_CHARS:
+                if a == b:
+                    continue
+                left = base[:i] + a + b + base[i + 2:]
+                right = base[:i] + b + a + base[i + 2:]
+                assert check_char(left) != check_char(right), (i, a, b)
+
+def test_every_single_substitution():
+    base = "LAMHBNFN0100001"
+    check = check_char(base)
+    for i in range(len(base)):
+        for c in SERIAL_CHARS:
+            if c != base[i]:
+                assert check_char(base[:i] + c + base[i + 1:]) != check
+
+def test_strip_check_normalizes_input():
+    serial = add_check("LAMHBNFN0100001")
+    assert strip_check(f"  {serial.lower()}\n") == "LAMHBNFN0100001"
+    assert strip_check(" lamhbnfn0100001 ") == "LAMHBNFN0100001"
+
+def test_check_bytes_matches_check_char():
+    buf = np.frombuffer("".join(BASES).encode("ascii"), dtype=np.uint8).reshape(len(BASES), -1)
+    assert [chr(b) for b in check_bytes(buf)] == [check_char(base) for base in BASES]
@@ -0,0 +1,18 @@
+import pytest
+from serial_range import SerialRange
+
+RANGES = [(1, 25000), (99990, 100012), (5, 5), (7, 6)]
+
+@pytest.mark.parametrize("check", [False, True])
+@pytest.mark.parametrize("start, end", RANGES)
+def test_iteration_matches_serial_at(start, end, check):
+    # 묶음으로 만든 시리얼이 한 개씩 만든 것과 같다 (자릿수가 늘어나는 구간, 빈 구간 포함)
+    serials = SerialRange("LA", "MH", "OL", "2025", "11", "1", start, end, check=check)
+    assert list(serials) == [serials.serial_at(seq) for seq in serials.seqs]
+    assert list(serials[3:]) == [serials.serial_at(seq) for seq in serials.seqs[3:]]
+
+def test_chunks_are_plain_strings():
+    serials = SerialRange("LA", "MH", "OL", "2025", "11", "1", 1, 12)
+    chunks = list(serials.chunks(5))
+    assert [len(chunk) for chunk in chunks] == [5, 5, 2]
+    assert all(type(serial) is str for chunk in chunks for serial in chunk)
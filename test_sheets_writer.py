@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+from memory_sheet import InMemoryWorksheet
+from sheets_index import SheetSerialIndex
+from sheets_writer import SHEET_COLUMNS, BufferedSheetWriter
+
+OPTIONS = {"chunk_size": 4, "rate": 1000, "burst": 1000, "retries": 3}
+
+class APIError(Exception):
+    # gspread.exceptions.APIError 처럼 response.status_code 를 가진 예외
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.response = SimpleNamespace(status_code=status)
+
+def _rows(start, end):
+    return [[f"LAMHOLFN01{seq:05d}", "리앤텍", "가습기", "S", "2025", "11", "1", seq] for seq in range(start, end + 1)]
+
+def _writer(sheet, index=None):
+    return BufferedSheetWriter(sheet, OPTIONS, sleep=lambda seconds: None, skip=index)
+
+def _serials(sheet):
+    return [row[0] for row in sheet.rows[1:]]
+
+def test_429_is_retried_without_duplicates():
+    sheet = InMemoryWorksheet(SHEET_COLUMNS)
+    sheet.errors = [APIError(429), APIError(408)]
+    writer = _writer(sheet)
+    writer.extend(_rows(1, 10))
+    assert writer.close() == {"written": 10, "failed": 0, "skipped": 0}
+    assert _serials(sheet) == [row[0] for row in _rows(1, 10)]
+
+def test_429_gives_up_after_retries():
+    sheet = InMemoryWorksheet(SHEET_COLUMNS)
+    sheet.errors = [APIError(429)] * (OPTIONS["retries"] + 1)
+    writer = _writer(sheet)
+    writer.extend(_rows(1, 4))
+    assert writer.close() == {"written": 0, "failed": 4, "skipped": 0}
+    assert _serials(sheet) == []
+
+def test_503_after_append_is_not_sent_twice():
+    # 시트에는 붙었지만 응답이 503 인 경우: 다시 읽어서 이미 붙은 것으로 센다
+    sheet = InMemoryWorksheet(SHEET_COLUMNS)
+    sheet.errors = [(APIError(503), True)]
+    writer = _writer(sheet, SheetSerialIndex(sheet, ttl=0))
+    writer.extend(_rows(1, 10))
+    assert writer.close() == {"written": 10, "failed": 0, "skipped": 0}
+    assert _serials(sheet) == [row[0] for row in _rows(1, 10)]
+
+def test_503_before_append_resends_the_rest():
+    sheet = InMemoryWorksheet(SHEET_COLUMNS)
+    sheet.errors = [None, APIError(503), ConnectionError("reset")]
+    writer = _writer(sheet, SheetSerialIndex(sheet, ttl=0))
+    writer.extend(_rows(1, 10))
+    assert writer.close() == {"written": 10, "failed": 0, "skipped": 0}
+    assert _serials(sheet) == [row[0] for row in _rows(1, 10)]
+
+def test_503_without_index_is_not_resent():
+    # 이미 붙었는지 확인할 방법이 없으면 그 묶음은 실패로 남기고 다시 보내지 않는다
+    sheet = InMemoryWorksheet(SHEET_COLUMNS)
+    sheet.errors = [(APIError(503), True)]
+    writer = _writer(sheet)
+    writer.extend(_rows(1, 10))
+    assert writer.close() == {"written": 6, "failed": 4, "skipped": 0}
+    assert _serials(sheet) == [row[0] for row in _rows(1, 10)]
+
+def test_rows_already_in_sheet_are_skipped():
+    sheet = InMemoryWorksheet(SHEET_COLUMNS, _rows(1, 3))
+    sheet.errors = [(APIError(502), True)]
+    writer = _writer(sheet, SheetSerialIndex(sheet, ttl=0))
+    writer.extend(_rows(1, 10))
+    assert writer.close() == {"written": 7, "failed": 0, "skipped": 3}
+    assert _serials(sheet) == [row[0] for row in _rows(1, 10)]
@@ -0,0 +1,14 @@
+import os
+import pytest
+from startup_report import DEFAULT_TARGETS, HEAVY_MODULES, measure
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.mark.parametrize("target", DEFAULT_TARGETS)
+def test_gui_startup_does_not_load_heavy_modules(target):
+    # 패키징하는 GUI 는 창을 띄우기 전에 pandas/numpy/openpyxl/barcode 를 읽지 않아야 한다
+    pytest.importorskip("customtkinter")
+    report = measure(os.path.join(HERE, target), runs=1)
+    assert "error" not in report, report.get("error")
+    # 시간 예산은 측정하는 PC 마다 달라서 여기서는 무거운 모듈만 본다 (시간은 startup_report.py 로 확인)
+    assert not set(report["loaded"]) & set(HEAVY_MODULES), report["loaded"]
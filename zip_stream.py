@@ -0,0 +1,170 @@
+import bz2
+import io
+import lzma
+import os
+import struct
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+COMPRESSION_TYPES = {
+    "stored": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+DEFAULT_COMPRESSION = "deflate"
+DEFAULT_LEVEL = 6
+
+def _lzma_compress(data, level):
+    # zipfile.LZMACompressor 와 같은 헤더 형식에 압축 레벨(preset)만 추가
+    filter_spec = {"id": lzma.FILTER_LZMA1}
+    if level is not None:
+        filter_spec["preset"] = level
+    # 라벨 SVG 는 작으므로 사전 크기를 데이터 크기에 맞춰 높은 레벨에서도 메모리 할당을 줄인다
+    filter_spec["dict_size"] = max(1 << 16, min(len(data), 1 << 26))
+    props = lzma._encode_filter_properties(filter_spec)
+    comp = lzma.LZMACompressor(lzma.FORMAT_RAW, filters=[filter_spec])
+    return struct.pack("<BBH", 9, 4, len(props)) + props + comp.compress(data) + comp.flush()
+
+def _raw_write_supported():
+    # 압축한 데이터를 직접 쓰는 경로는 CPython zipfile/lzma 의 내부 함수에 기대므로
+    # 시작할 때 한 번 작은 ZIP 을 써 보고 다시 읽어서 확인한다. 안 되면 ZipFile.writestr 로 쓴다.
+    # CPython 3.9 ~ 3.13 에서 확인함 (직접 쓰기 경로, 모든 압축 방식)
+    if not (hasattr(lzma, "_encode_filter_properties") and hasattr(zipfile.ZipFile, "_writecheck")):
+        return False
+    try:
+        buffer = io.BytesIO()
+        data = b"<svg/>" * 10
+        writer = ParallelZipWriter(buffer, "stored", workers=1, raw=True)
+        try:
+            for name, compression in COMPRESSION_TYPES.items():
+                raw, crc, size = compress_member(data, compression, None)
+                writer._write_raw(name, (2020, 1, 1, 0, 0, 0), raw, crc, size, compression)
+        finally:
+            writer.close()
+        with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as check:
+            return check.testzip() is None and all(check.read(name) == data for name in COMPRESSION_TYPES)
+    except Exception:
+        return False
+
+def compress_member(data, compress_type, level=None):
+    # (압축 데이터, CRC, 원본 크기). 스레드에서 돌아가며 zlib/bz2/lzma 는 GIL 을 놓는다
+    crc = zlib.crc32(data)
+    if compress_type == zipfile.ZIP_STORED:
+        raw = data
+    elif compress_type == zipfile.ZIP_DEFLATED:
+        comp = zlib.compressobj(-1 if level is None else level, zlib.DEFLATED, -15)
+        raw = comp.compress(data) + comp.flush()
+    elif compress_type == zipfile.ZIP_BZIP2:
+        raw = bz2.compress(data, 9 if level is None else level)
+    elif compress_type == zipfile.ZIP_LZMA:
+        raw = _lzma_compress(data, level)
+    else:
+        raise ValueError(f"지원하지 않는 압축 방식입니다: {compress_type}")
+    return raw, crc, len(data)
+
+class ParallelZipWriter:
+    # ZIP 항목을 워커 스레드에서 압축하고, 끝난 순서가 아니라 추가한 순서대로 파일에 이어 쓴다.
+    # 압축 대기 중인 항목은 window 개까지만 들고 있으므로 주문 크기와 상관없이 메모리가 일정하다.
+    # 직접 쓰기가 안 되는 파이썬이면 (RAW_WRITE 가 False) 순서대로 ZipFile.writestr 로 쓴다.
+    def __init__(self, file, compression=DEFAULT_COMPRESSION, level=DEFAULT_LEVEL, workers=None, window=None, raw=None):
+        if isinstance(compression, str):
+            if compression not in COMPRESSION_TYPES:
+                raise ValueError(f"지원하지 않는 압축 방식입니다: {compression}")
+            compression = COMPRESSION_TYPES[compression]
+        self.compress_type = compression
+        self.level = level
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.window = window or self.workers * 4
+        self.raw = RAW_WRITE if raw is None else raw
+        self.zipf = zipfile.ZipFile(file, 'w', compression=compression)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending = deque()
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def writestr(self, name, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not self.raw:
+            self._writestr(name, time.localtime(time.time())[:6], data, self.compress_type)
+            return
+        future = self._pool.submit(compress_member, data, self.compress_type, self.level)
+        self._pending.append((name, time.localtime(time.time())[:6], future))
+        while len(self._pending) >= self.window:
+            self._write_next()
+
+    def _write_next(self):
+        name, date_time, future = self._pending.popleft()
+        raw, crc, size = future.result()
+        self._write_raw(name, date_time, raw, crc, size)
+
+    def _writestr(self, name, date_time, data, compress_type):
+        zinfo = zipfile.ZipInfo(name, date_time=date_time)
+        zinfo.compress_type = compress_type
+        zinfo.external_attr = 0o600 << 16
+        self.zipf.writestr(zinfo, data, compress_type, self.level)
+        self.bytes_in += zinfo.file_size
+        self.bytes_out += zinfo.compress_size
+
+    def _write_raw(self, name, date_time, raw, crc, size, compress_type=None):
+        # ZipFile.writestr 과 같은 헤더를 쓰되, 압축은 이미 끝난 데이터를 그대로 쓴다
+        zipf = self.zipf
+        if compress_type is None:
+            compress_type = self.compress_type
+        zinfo = zipfile.ZipInfo(name, date_time=date_time)
+        zinfo.compress_type = compress_type
+        zinfo.external_attr = 0o600 << 16
+        zinfo.file_size = size
+        zinfo.compress_size = len(raw)
+        zinfo.CRC = crc
+        if compress_type == zipfile.ZIP_LZMA:
+            zinfo.flag_bits |= 0x02
+        zip64 = size > zipfile.ZIP64_LIMIT or len(raw) > zipfile.ZIP64_LIMIT
+
+        zinfo.header_offset = zipf.fp.tell()
+        zipf._writecheck(zinfo)
+        zipf._didModify = True
+        zipf.fp.write(zinfo.FileHeader(zip64))
+        zipf.fp.write(raw)
+        zipf.filelist.append(zinfo)
+        zipf.NameToInfo[zinfo.filename] = zinfo
+        zipf.start_dir = zipf.fp.tell()
+        self.bytes_in += size
+        self.bytes_out += len(raw)
+
+    def copy_members(self, path):
+        # 다른 ZIP 의 항목을 압축을 풀지 않고 그대로 옮겨 쓴다 (묶음별로 만든 ZIP 을 하나로 합칠 때)
+        while self._pending:
+            self._write_next()
+        with zipfile.ZipFile(path) as src, open(path, "rb") as f:
+            for info in src.infolist():
+                if not self.raw:
+                    self._writestr(info.filename, info.date_time, src.read(info), info.compress_type)
+                    continue
+                f.seek(info.header_offset)
+                header = f.read(30)
+                name_len, extra_len = struct.unpack("<HH", header[26:30])
+                f.seek(name_len + extra_len, os.SEEK_CUR)
+                raw = f.read(info.compress_size)
+                self._write_raw(info.filename, info.date_time, raw, info.CRC, info.file_size, info.compress_type)
+
+    def close(self):
+        try:
+            while self._pending:
+                self._write_next()
+        finally:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self.zipf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+RAW_WRITE = _raw_write_supported()